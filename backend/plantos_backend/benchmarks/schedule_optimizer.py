@@ -0,0 +1,141 @@
+"""Benchmark ``optimize_tasks`` against plain date bucketing on synthetic nurseries.
+
+A nursery is one big schedule in which every day is already busy: the optimizer
+can only cap each day at ``capacity`` while moving as little as possible. Homes
+are many small schedules planned one owner at a time, where grouping shows up
+as fewer care days per owner.
+
+Run from ``backend/plantos_backend``::
+
+    uv run python benchmarks/schedule_optimizer.py --plants 1000 10000 50000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as day_time
+from typing import List
+
+from plantos_backend.models import CareSignal, CareTask
+from plantos_backend.services.scheduler import merge_tasks, optimize_tasks
+
+CADENCES = (1, 2, 3, 5, 7, 7, 10, 14, 14, 21, 30)
+TODAY = date(2024, 5, 1)
+
+
+def synthetic_nursery(plants: int, horizon_days: int, seed: int) -> List[CareTask]:
+    """Watering and feeding tasks for ``plants`` plants with staggered due dates."""
+    return _tasks(random.Random(seed), range(plants), horizon_days)
+
+
+def synthetic_homes(plants: int, horizon_days: int, seed: int) -> List[List[CareTask]]:
+    """The same kind of tasks, split across owners with 3 to 20 plants each."""
+    rng = random.Random(seed)
+    homes = []
+    index = 0
+    while index < plants:
+        size = min(rng.randint(3, 20), plants - index)
+        homes.append(_tasks(rng, range(index, index + size), horizon_days))
+        index += size
+    return homes
+
+
+def _tasks(rng: random.Random, plants: range, horizon_days: int) -> List[CareTask]:
+    start = datetime.combine(TODAY, day_time(9), tzinfo=timezone.utc)
+    tasks = []
+    for index in plants:
+        for signal, cadence in (
+            (CareSignal.watering, rng.choice(CADENCES)),
+            (CareSignal.feeding, rng.choice((14, 30, 30, 60))),
+        ):
+            tasks.append(
+                CareTask(
+                    plant_id=f"plant_{index}",
+                    signal=signal,
+                    cadence_days=cadence,
+                    next_due_at=start + timedelta(days=rng.randrange(horizon_days)),
+                    duration_minutes=rng.choice((2, 3, 5, 5, 10, 15)),
+                )
+            )
+    return tasks
+
+
+def nursery(args: argparse.Namespace) -> None:
+    header = f"{'plants':>8} {'tasks':>8} {'capacity':>9} {'seconds':>8} {'days':>9} "
+    print("nursery: one schedule, capacity per day")
+    print(header + f"{'peak min':>15} {'moved':>7} {'over':>5}")
+    for plants in args.plants:
+        tasks = synthetic_nursery(plants, args.horizon_days, args.seed)
+        baseline = merge_tasks(tasks)
+        baseline_peak = max(
+            sum(task.duration_minutes for task in day) for day in baseline.values()
+        )
+        average_day = sum(task.duration_minutes for task in tasks) / args.horizon_days
+        for slack in args.slack:
+            capacity = int(average_day * slack)
+            started = time.perf_counter()
+            plan = optimize_tasks(tasks, capacity, args.max_shift_days, today=TODAY)
+            elapsed = time.perf_counter() - started
+
+            peak = max(plan.load(day) for day in plan.days)
+            print(
+                f"{plants:>8} {len(tasks):>8} {capacity:>9} {elapsed:>8.3f} "
+                f"{len(baseline):>4}->{len(plan.days):<4} {baseline_peak:>7}->{peak:<7} "
+                f"{plan.moved:>7} {plan.overloaded:>5}"
+            )
+
+
+def homes(args: argparse.Namespace) -> None:
+    header = f"{'plants':>8} {'homes':>7} {'tasks':>8} {'seconds':>8} {'care days':>15} "
+    print(f"homes: one schedule per owner, {args.home_capacity} minutes per day")
+    print(header + f"{'peak min':>11} {'moved':>7} {'over':>5}")
+    for plants in args.plants:
+        schedules = synthetic_homes(plants, args.horizon_days, args.seed)
+        baseline_days = baseline_peak = optimized_days = peak = moved = overloaded = 0
+        elapsed = 0.0
+        for tasks in schedules:
+            baseline = merge_tasks(tasks)
+            baseline_days += len(baseline)
+            baseline_peak = max(
+                baseline_peak,
+                *(sum(task.duration_minutes for task in day) for day in baseline.values()),
+            )
+            started = time.perf_counter()
+            plan = optimize_tasks(tasks, args.home_capacity, args.max_shift_days, today=TODAY)
+            elapsed += time.perf_counter() - started
+            optimized_days += len(plan.days)
+            peak = max(peak, *(plan.load(day) for day in plan.days))
+            moved += plan.moved
+            overloaded += plan.overloaded
+        tasks = sum(len(tasks) for tasks in schedules)
+        print(
+            f"{plants:>8} {len(schedules):>7} {tasks:>8} {elapsed:>8.3f} "
+            f"{baseline_days:>7}->{optimized_days:<7} {baseline_peak:>4}->{peak:<6} "
+            f"{moved:>7} {overloaded:>5}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plants", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--horizon-days", type=int, default=14)
+    parser.add_argument("--max-shift-days", type=int, default=2)
+    parser.add_argument(
+        "--slack",
+        type=float,
+        nargs="+",
+        default=[1.1, 3.0],
+        help="Nursery capacity as a multiple of the average day's minutes",
+    )
+    parser.add_argument("--home-capacity", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    nursery(args)
+    print()
+    homes(args)
+
+if __name__ == "__main__":
+    main()
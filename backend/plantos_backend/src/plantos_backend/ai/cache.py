@@ -0,0 +1,188 @@
+"""Response cache for LangGraph invocations.
+
+Results are keyed on the graph name, ``PROMPT_VERSION`` and the normalized
+graph inputs, so repeated questions (same species notes, same symptom text)
+skip the model entirely. Entries live in a bounded in-memory LRU with a TTL,
+optionally backed by a SQLite file that survives restarts and is shared by
+every worker on the host.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
+
+from plantos_backend.settings import get_settings
+
+# Bump whenever graph prompts or output shapes change so stale answers are ignored.
+PROMPT_VERSION = "1"
+
+
+def normalize_inputs(value: Any) -> Any:
+    """Case-fold and collapse whitespace in strings so trivial variants share a key."""
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {key: normalize_inputs(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_inputs(item) for item in value]
+    return value
+
+
+def cache_key(namespace: str, inputs: Dict[str, Any]) -> str:
+    payload = json.dumps(normalize_inputs(inputs), sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{namespace}:v{PROMPT_VERSION}:{digest}"
+
+
+class CacheBackend(Protocol):
+    """Second-level store consulted on in-memory misses."""
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        ...
+
+    def set(self, key: str, expires_at: float, value: str) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class SqliteCacheBackend:
+    """On-disk cache tier; one connection per thread, WAL so workers can share it."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_expiry ON responses (expires_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        row = self._connection().execute(
+            "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, expires_at: float, value: str) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, expires_at, value),
+            )
+
+    def clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class ResponseCache:
+    """Bounded LRU with per-entry TTL; values are JSON so callers get fresh copies."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        backend: CacheBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return json.loads(entry[1])
+                del self._entries[key]
+                self.stats.expirations += 1
+        if self.backend is not None:
+            stored = self.backend.get(key)
+            if stored is not None and stored[0] > now:
+                with self._lock:
+                    self._store(key, stored)
+                    self.stats.hits += 1
+                return json.loads(stored[1])
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        entry = (self.clock() + self.ttl_seconds, json.dumps(value, default=str))
+        with self._lock:
+            self._store(key, entry)
+        if self.backend is not None:
+            self.backend.set(key, *entry)
+
+    def metrics(self) -> Dict[str, float]:
+        return {**self.stats.as_dict(), "size": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def _store(self, key: str, entry: Tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    settings = get_settings()
+    backend = SqliteCacheBackend(settings.ai_cache_path) if settings.ai_cache_path else None
+    return ResponseCache(
+        max_entries=settings.ai_cache_max_entries,
+        ttl_seconds=settings.ai_cache_ttl_seconds,
+        backend=backend,
+    )
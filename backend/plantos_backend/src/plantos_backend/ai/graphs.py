@@ -1,12 +1,37 @@
 """LangGraph workflows for PlantOS prototypes."""
 from __future__ import annotations
 
+import asyncio
+import logging
 from typing import TypedDict
 
 from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 
 from plantos_backend.ai.providers import get_provider
+from plantos_backend.ai.species import get_species_profiles
+from plantos_backend.ai.structured import (
+    CareProfile,
+    Diagnosis,
+    StructuredOutputError,
+    ainvoke_structured,
+)
+from plantos_backend.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Score assigned to a variant whose model call fails, times out or is unparseable.
+DEFAULT_VARIANT_SCORE = 0.5
+
+
+def streams_tokens(config: RunnableConfig) -> bool:
+    """Whether the caller streams model tokens (``configurable.stream_tokens``).
+
+    Native structured output replies with a tool call and no text, so streamed
+    runs ask for JSON text instead.
+    """
+    return bool(config.get("configurable", {}).get("stream_tokens"))
 
 
 class PlantOnboardState(TypedDict, total=False):
@@ -17,7 +42,7 @@ class PlantOnboardState(TypedDict, total=False):
     care_profile: dict
 
 
-def identify_species(state: PlantOnboardState) -> PlantOnboardState:
+async def identify_species(state: PlantOnboardState) -> PlantOnboardState:
     """Identify plant species from notes (and eventually photo)."""
     notes = state.get("notes") or ""
     
@@ -33,7 +58,7 @@ def identify_species(state: PlantOnboardState) -> PlantOnboardState:
     Return ONLY the species name. If you are unsure, return "Unknown".
     """
     
-    response = model.invoke([HumanMessage(content=prompt)])
+    response = await model.ainvoke([HumanMessage(content=prompt)])
     species = response.content.strip()
     
     # Mock confidence for now as most chat models don't return it easily without logprobs
@@ -43,18 +68,29 @@ def identify_species(state: PlantOnboardState) -> PlantOnboardState:
     return state
 
 
-def build_care_profile(state: PlantOnboardState) -> PlantOnboardState:
-    """Generate a care profile for the identified species."""
+async def build_care_profile(
+    state: PlantOnboardState, config: RunnableConfig
+) -> PlantOnboardState:
+    """Generate a care profile for the identified species.
+
+    Known species are answered from the shared species profile store; newly
+    generated profiles are recorded there for the next onboarding.
+    """
     species = state.get("species_guess", "Unknown")
     
     if species == "Unknown":
         return state
 
+    profiles = get_species_profiles()
+    known_profile = profiles.get(species)
+    if known_profile is not None:
+        state["care_profile"] = {**known_profile, "species": species}
+        return state
+
     provider = get_provider()
     model = provider.get_chat_model()
     
-    # We want structured output, but for simplicity we'll parse JSON or just ask for specific fields.
-    # Let's ask for a JSON string.
+    # Parsed into a CareProfile; providers with a structured-output mode use it.
     prompt = f"""
     Generate a care profile for "{species}" in JSON format with the following keys:
     - light: (e.g., "bright indirect", "low")
@@ -64,24 +100,20 @@ def build_care_profile(state: PlantOnboardState) -> PlantOnboardState:
     Return ONLY the JSON.
     """
     
-    response = model.invoke([HumanMessage(content=prompt)])
-    content = response.content.strip()
-    
-    # Basic cleanup to handle markdown code blocks if present
-    if content.startswith("```json"):
-        content = content[7:-3]
-    elif content.startswith("```"):
-        content = content[3:-3]
-        
-    import json
     try:
-        care_profile = json.loads(content)
-        care_profile["species"] = species
-        state["care_profile"] = care_profile
-    except json.JSONDecodeError:
-        # Fallback or error handling
-        pass
-        
+        profile = await ainvoke_structured(
+            model,
+            [HumanMessage(content=prompt)],
+            CareProfile,
+            native=False if streams_tokens(config) else None,
+        )
+    except StructuredOutputError:
+        logger.warning("No valid care profile for %s", species)
+        return state
+
+    care_profile = {**profile.model_dump(exclude_none=True), "species": species}
+    state["care_profile"] = care_profile
+    profiles.put(species, care_profile)
     return state
 
 
@@ -101,7 +133,9 @@ class HealthCheckState(TypedDict, total=False):
     recommendations: list[str]
 
 
-def run_diagnostics(state: HealthCheckState) -> HealthCheckState:
+async def run_diagnostics(
+    state: HealthCheckState, config: RunnableConfig
+) -> HealthCheckState:
     description = state.get("description") or ""
     
     provider = get_provider()
@@ -119,23 +153,15 @@ def run_diagnostics(state: HealthCheckState) -> HealthCheckState:
     Return ONLY the JSON.
     """
     
-    response = model.invoke([HumanMessage(content=prompt)])
-    content = response.content.strip()
-    
-    if content.startswith("```json"):
-        content = content[7:-3]
-    elif content.startswith("```"):
-        content = content[3:-3]
-        
-    import json
     try:
-        result = json.loads(content)
-        state.update({
-            "diagnosis": result.get("diagnosis", "Unknown"),
-            "severity": result.get("severity", "low"),
-            "recommendations": result.get("recommendations", [])
-        })
-    except json.JSONDecodeError:
+        result = await ainvoke_structured(
+            model,
+            [HumanMessage(content=prompt)],
+            Diagnosis,
+            native=False if streams_tokens(config) else None,
+        )
+        state.update(result.model_dump())
+    except StructuredOutputError:
         state.update({
             "diagnosis": "Error parsing diagnosis",
             "severity": "unknown",
@@ -158,35 +184,57 @@ class ExperimentState(TypedDict, total=False):
     variants: list[dict]
 
 
-def evaluate_variants(state: ExperimentState) -> ExperimentState:
-    """Mock evaluation of experiment variants using AI to simulate outcomes."""
+async def score_variant(model, hypothesis: str | None, metric: str | None, variant: dict) -> float:
+    """Ask the model for a single variant's predicted score."""
+    variant_desc = variant.get("description", "")
+    prompt = f"""
+    Simulate an experiment for plant growth.
+    Hypothesis: {hypothesis}
+    Metric: {metric}
+    Variant: {variant_desc}
+    
+    Predict a likely score for this metric on a scale of 0.0 to 1.0 (float).
+    Return ONLY the number.
+    """
+
+    response = await model.ainvoke([HumanMessage(content=prompt)])
+    try:
+        return float(response.content.strip())
+    except ValueError:
+        return DEFAULT_VARIANT_SCORE
+
+
+async def evaluate_variants(state: ExperimentState) -> ExperimentState:
+    """Mock evaluation of experiment variants using AI to simulate outcomes.
+
+    Variants are scored concurrently, at most ``ai_max_concurrency`` at a time.
+    A variant whose call fails or exceeds ``ai_variant_timeout_seconds`` falls
+    back to ``DEFAULT_VARIANT_SCORE`` without holding up the others.
+    """
     hypothesis = state.get("hypothesis")
     variants = state.get("variants", [])
     metric = state.get("metric")
-    
+    settings = get_settings()
+
     provider = get_provider()
     model = provider.get_chat_model()
-    
-    for variant in variants:
-        variant_desc = variant.get("description", "")
-        prompt = f"""
-        Simulate an experiment for plant growth.
-        Hypothesis: {hypothesis}
-        Metric: {metric}
-        Variant: {variant_desc}
-        
-        Predict a likely score for this metric on a scale of 0.0 to 1.0 (float).
-        Return ONLY the number.
-        """
-        
-        response = model.invoke([HumanMessage(content=prompt)])
-        try:
-            score = float(response.content.strip())
-        except ValueError:
-            score = 0.5
-            
+    semaphore = asyncio.Semaphore(settings.ai_max_concurrency)
+
+    async def bounded_score(variant: dict) -> float:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    score_variant(model, hypothesis, metric, variant),
+                    timeout=settings.ai_variant_timeout_seconds,
+                )
+            except Exception:
+                logger.warning("Scoring variant %s failed; using default", variant.get("id"))
+                return DEFAULT_VARIANT_SCORE
+
+    scores = await asyncio.gather(*(bounded_score(variant) for variant in variants))
+    for variant, score in zip(variants, scores, strict=True):
         variant["metric"] = score
-        
+
     return state
 
 
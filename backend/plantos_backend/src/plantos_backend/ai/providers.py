@@ -1,35 +1,98 @@
-"""AI Provider abstractions."""
+"""AI Provider abstractions.
+
+Providers and the chat models they hand out are cached per process, so each
+request reuses one client (and its pooled keep-alive connections) per
+``(provider, model_name, temperature)`` instead of building a new one.
+
+The ``router`` provider spreads calls over every configured provider; see
+``plantos_backend.ai.routing``.
+"""
 from __future__ import annotations
 
-from typing import Protocol
+import logging
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Protocol, Tuple
 
+import httpx
 from langchain_core.language_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 
+from plantos_backend.ai.routing import ProviderHealth, RoutedChatModel, get_provider_health
 from plantos_backend.settings import get_settings
 
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, float]
+
 
 class AIProvider(Protocol):
     """Protocol for AI providers."""
 
-    def get_chat_model(self, model_name: str | None = None) -> BaseChatModel:
+    def get_chat_model(
+        self, model_name: str | None = None, temperature: float = 0
+    ) -> BaseChatModel:
         """Get a chat model instance."""
         ...
 
 
+class _ModelCache:
+    """Thread-safe memo of chat models keyed by ``(model_name, temperature)``."""
+
+    def __init__(self) -> None:
+        self._models: Dict[ModelKey, BaseChatModel] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: ModelKey, factory: Callable[[], BaseChatModel]) -> BaseChatModel:
+        model = self._models.get(key)
+        if model is None:
+            with self._lock:
+                model = self._models.get(key)
+                if model is None:
+                    model = self._models[key] = factory()
+        return model
+
+
+@lru_cache
+def get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Shared HTTP clients whose connection pools back every HTTP-based chat model."""
+    settings = get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.ai_http_max_connections,
+        max_keepalive_connections=settings.ai_http_max_keepalive_connections,
+        keepalive_expiry=settings.ai_http_keepalive_expiry_seconds,
+    )
+    timeout = httpx.Timeout(settings.ai_http_timeout_seconds)
+    return (
+        httpx.Client(limits=limits, timeout=timeout),
+        httpx.AsyncClient(limits=limits, timeout=timeout),
+    )
+
+
 class OpenAIProvider:
     """OpenAI provider implementation."""
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self._models = _ModelCache()
 
-    def get_chat_model(self, model_name: str | None = None) -> BaseChatModel:
-        return ChatOpenAI(
-            api_key=self.api_key,
-            model=model_name or "gpt-4o",
-            temperature=0,
-        )
+    def get_chat_model(
+        self, model_name: str | None = None, temperature: float = 0
+    ) -> BaseChatModel:
+        name = model_name or "gpt-4o"
+
+        def build() -> BaseChatModel:
+            http_client, http_async_client = get_http_clients()
+            return ChatOpenAI(
+                api_key=self.api_key,
+                model=name,
+                temperature=temperature,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+
+        return self._models.get((name, temperature), build)
 
 
 class GeminiProvider:
@@ -37,28 +100,101 @@ class GeminiProvider:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-
-    def get_chat_model(self, model_name: str | None = None) -> BaseChatModel:
-        return ChatGoogleGenerativeAI(
-            google_api_key=self.api_key,
-            model=model_name or "gemini-1.5-flash",
-            temperature=0,
+        self._models = _ModelCache()
+
+    def get_chat_model(
+        self, model_name: str | None = None, temperature: float = 0
+    ) -> BaseChatModel:
+        # The Gemini client manages its own gRPC channel; caching the model
+        # instance is what keeps that channel alive between requests.
+        name = model_name or "gemini-1.5-flash"
+        return self._models.get(
+            (name, temperature),
+            lambda: ChatGoogleGenerativeAI(
+                google_api_key=self.api_key,
+                model=name,
+                temperature=temperature,
+            ),
         )
 
 
-def get_provider(name: str | None = None) -> AIProvider:
-    """Factory to get the configured AI provider."""
+def _route_name(provider_name: str, model: BaseChatModel) -> str:
+    model_name = getattr(model, "model_name", None) or getattr(model, "model", "")
+    return f"{provider_name}:{model_name}"
+
+
+class RouterProvider:
+    """Routes each call to the fastest healthy provider, with failover and hedging.
+
+    ``model_name`` is a provider-specific name, so routed models always use each
+    provider's default model.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, AIProvider],
+        health: ProviderHealth,
+        hedge_after: float | None = None,
+    ):
+        self.providers = providers
+        self.health = health
+        self.hedge_after = hedge_after
+        self._models = _ModelCache()
+
+    def get_chat_model(
+        self, model_name: str | None = None, temperature: float = 0
+    ) -> BaseChatModel:
+        def build() -> BaseChatModel:
+            routes = []
+            for name, provider in self.providers.items():
+                model = provider.get_chat_model(temperature=temperature)
+                routes.append((_route_name(name, model), model))
+            return RoutedChatModel(routes=routes, health=self.health, hedge_after=self.hedge_after)
+
+        return self._models.get(("router", temperature), build)
+
+
+@lru_cache
+def _build_provider(provider_name: str) -> AIProvider:
     settings = get_settings()
-    provider_name = (name or settings.default_ai_provider).lower()
+
+    if provider_name == "router":
+        routed: Dict[str, AIProvider] = {}
+        for name in settings.ai_router_providers:
+            try:
+                routed[name] = _build_provider(name.lower())
+            except ValueError as exc:
+                logger.info("Skipping %s in the provider router: %s", name, exc)
+        if not routed:
+            raise ValueError("No provider in PLANTOS_AI_ROUTER_PROVIDERS is configured")
+        return RouterProvider(
+            routed, get_provider_health(), hedge_after=settings.ai_hedge_after_seconds
+        )
 
     if provider_name == "openai":
         if not settings.openai_api_key:
             raise ValueError("PLANTOS_OPENAI_API_KEY is not set")
         return OpenAIProvider(settings.openai_api_key)
-    
+
     if provider_name == "gemini":
         if not settings.gemini_api_key:
             raise ValueError("PLANTOS_GEMINI_API_KEY is not set")
         return GeminiProvider(settings.gemini_api_key)
 
     raise ValueError(f"Unknown AI provider: {provider_name}")
+
+
+def get_provider(name: str | None = None) -> AIProvider:
+    """Factory to get the configured AI provider (one cached instance per name)."""
+    settings = get_settings()
+    return _build_provider((name or settings.default_ai_provider).lower())
+
+
+async def close_clients() -> None:
+    """Close the shared HTTP pools and forget cached providers."""
+    if get_http_clients.cache_info().currsize:
+        http_client, http_async_client = get_http_clients()
+        http_client.close()
+        await http_async_client.aclose()
+    get_http_clients.cache_clear()
+    _build_provider.cache_clear()
@@ -0,0 +1,334 @@
+"""Latency-aware routing across AI providers.
+
+``RouterProvider`` hands out a ``RoutedChatModel`` that fronts one chat model
+per configured provider. Every call is timed per route (``provider:model``);
+each request goes to the healthy route with the lowest rolling p50 latency,
+fails over to the next route on error, and can be hedged: if the first route
+has not answered after ``hedge_after`` seconds the next one is raced against it.
+A route that fails ``failure_threshold`` times in a row trips its circuit
+breaker and is skipped until ``cooldown_seconds`` have passed, after which a
+single trial call decides whether it closes again.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from plantos_backend.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+Route = Tuple[str, BaseChatModel]
+
+
+@dataclass(eq=False)
+class Permit:
+    """Leave to call a route; ``trial`` marks the single half-open probe.
+
+    Compared by identity, so only the call holding the trial permit can end it.
+    """
+
+    trial: bool = False
+
+
+@dataclass
+class CircuitBreaker:
+    """Closed → open after ``failure_threshold`` consecutive failures → half-open trial."""
+
+    failure_threshold: int = 5
+    cooldown_seconds: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    failures: int = 0
+    opened_at: Optional[float] = None
+    trial: Optional[Permit] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.cooldown_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> Optional[Permit]:
+        state = self.state
+        if state == "closed":
+            return Permit()
+        if state == "half_open" and self.trial is None:
+            self.trial = Permit(trial=True)
+            return self.trial
+        return None
+
+    def release(self, permit: Optional[Permit]) -> None:
+        """Give up ``permit`` without an outcome (its call was cancelled).
+
+        Only the half-open trial's own permit frees the trial slot; a cancelled
+        call that was let through earlier must not admit a second trial.
+        """
+        if permit is not None and permit is self.trial:
+            self.trial = None
+
+    def record(self, ok: bool, permit: Optional[Permit] = None) -> None:
+        if permit is not None and permit is self.trial:
+            self.trial = None
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+
+
+@dataclass
+class RouteStats:
+    """Rolling latency and outcome window for one route."""
+
+    window: int = 100
+    samples: Deque[Tuple[float, bool]] = field(default_factory=deque)
+    hedges: int = 0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.samples.append((latency, ok))
+        while len(self.samples) > self.window:
+            self.samples.popleft()
+
+    def _latencies(self) -> List[float]:
+        return [latency for latency, ok in self.samples if ok]
+
+    @property
+    def p50(self) -> Optional[float]:
+        latencies = self._latencies()
+        return statistics.median(latencies) if latencies else None
+
+    @property
+    def p95(self) -> Optional[float]:
+        latencies = sorted(self._latencies())
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+
+class ProviderHealth:
+    """Per-route latency stats and circuit breakers shared by every routed model."""
+
+    def __init__(
+        self,
+        window: int = 100,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        max_error_rate: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_error_rate = max_error_rate
+        self.clock = clock
+        self._stats: Dict[str, RouteStats] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _route(self, name: str) -> Tuple[RouteStats, CircuitBreaker]:
+        if name not in self._stats:
+            self._stats[name] = RouteStats(window=self.window)
+            self._breakers[name] = CircuitBreaker(
+                self.failure_threshold, self.cooldown_seconds, clock=self.clock
+            )
+        return self._stats[name], self._breakers[name]
+
+    def rank(self, names: Sequence[str]) -> List[str]:
+        """Order routes fastest-healthy first; tripped routes are left out.
+
+        Routes without samples sort first so they get measured. If every breaker
+        is open the routes are returned as given, as a last resort.
+        """
+        with self._lock:
+            healthy, degraded = [], []
+            for name in names:
+                stats, breaker = self._route(name)
+                if breaker.state == "open":
+                    continue
+                bucket = healthy if stats.error_rate <= self.max_error_rate else degraded
+                bucket.append((stats.p50 or 0.0, name))
+            ranked = [name for _, name in sorted(healthy)] + [name for _, name in sorted(degraded)]
+            return ranked or list(names)
+
+    def allow(self, name: str) -> Optional[Permit]:
+        """A permit to call ``name``, or ``None`` while its breaker keeps calls out."""
+        with self._lock:
+            return self._route(name)[1].allow()
+
+    def record(
+        self, name: str, latency: float, ok: bool, permit: Optional[Permit] = None
+    ) -> None:
+        with self._lock:
+            stats, breaker = self._route(name)
+            stats.record(latency, ok)
+            breaker.record(ok, permit)
+
+    def release(self, name: str, permit: Optional[Permit]) -> None:
+        with self._lock:
+            self._route(name)[1].release(permit)
+
+    def record_hedge(self, name: str) -> None:
+        with self._lock:
+            self._route(name)[0].hedges += 1
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "p50": stats.p50,
+                    "p95": stats.p95,
+                    "error_rate": stats.error_rate,
+                    "samples": len(stats.samples),
+                    "hedges": stats.hedges,
+                    "circuit": self._breakers[name].state,
+                }
+                for name, stats in self._stats.items()
+            }
+
+
+@lru_cache
+def get_provider_health() -> ProviderHealth:
+    settings = get_settings()
+    return ProviderHealth(
+        window=settings.ai_router_window,
+        failure_threshold=settings.ai_breaker_failures,
+        cooldown_seconds=settings.ai_breaker_cooldown_seconds,
+        max_error_rate=settings.ai_router_max_error_rate,
+    )
+
+
+class RoutedChatModel(BaseChatModel):
+    """Chat model that sends each call to the best of several underlying models."""
+
+    routes: List[Route]
+    health: Any
+    hedge_after: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "plantos-router"
+
+    def _ordered(self) -> List[Route]:
+        models = dict(self.routes)
+        return [(name, models[name]) for name in self.health.rank(list(models))]
+
+    async def _call(
+        self, name: str, model: BaseChatModel, permit: Optional[Permit], messages, stop, **kwargs
+    ):
+        started = time.perf_counter()
+        try:
+            message = await model.ainvoke(messages, stop=stop, **kwargs)
+        except asyncio.CancelledError:
+            # A cancelled call (hedge loser, caller timeout) says nothing about the
+            # route, but it may have been the half-open trial: let another through.
+            self.health.release(name, permit)
+            raise
+        except Exception:
+            self.health.record(name, time.perf_counter() - started, ok=False, permit=permit)
+            raise
+        self.health.record(name, time.perf_counter() - started, ok=True, permit=permit)
+        return message
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        remaining = self._ordered()
+        pending: Dict[asyncio.Task, str] = {}
+        error: Optional[BaseException] = None
+        hedged = False
+
+        def launch() -> None:
+            while remaining:
+                name, model = remaining.pop(0)
+                permit = self.health.allow(name)
+                if permit is not None or not (pending or remaining):
+                    task = asyncio.ensure_future(
+                        self._call(name, model, permit, messages, stop, **kwargs)
+                    )
+                    pending[task] = name
+                    return
+
+        launch()
+        try:
+            while pending:
+                hedge = self.hedge_after is not None and not hedged and remaining
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after if hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedged = True
+                    self.health.record_hedge(next(iter(pending.values())))
+                    launch()
+                    continue
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is None:
+                        return ChatResult(generations=[ChatGeneration(message=task.result())])
+                    error = task.exception()
+                    logger.warning("Route %s failed: %s", name, error)
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error or RuntimeError("No AI provider routes available")
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Synchronous callers get failover but no hedging; breakers gate each route
+        # as in ``_agenerate``, with the last route tried as a last resort.
+        error: Optional[Exception] = None
+        routes = self._ordered()
+        for index, (name, model) in enumerate(routes):
+            permit = self.health.allow(name)
+            if permit is None and index < len(routes) - 1:
+                continue
+            started = time.perf_counter()
+            try:
+                message = model.invoke(messages, stop=stop, **kwargs)
+            except Exception as exc:
+                self.health.record(name, time.perf_counter() - started, ok=False, permit=permit)
+                error = exc
+                continue
+            except BaseException:
+                self.health.release(name, permit)
+                raise
+            self.health.record(name, time.perf_counter() - started, ok=True, permit=permit)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        raise error or RuntimeError("No AI provider routes available")
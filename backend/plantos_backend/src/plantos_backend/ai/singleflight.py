@@ -0,0 +1,42 @@
+"""Single-flight de-duplication for concurrent identical AI requests."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result.
+
+    The shared call runs as its own task, so a caller that is cancelled (for
+    example when its client disconnects) does not cancel the work for the others.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
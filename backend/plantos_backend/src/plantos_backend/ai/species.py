@@ -0,0 +1,116 @@
+"""Species → care profile knowledge store shared across onboarding runs.
+
+``build_care_profile`` consults this store before asking the model and records
+every profile it generates, so a species only costs one LLM call per
+deployment. Names are canonicalized (case, whitespace, cultivar quotes,
+authorities in parentheses, common-name aliases) so variants share an entry.
+"""
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Dict, Optional
+
+from plantos_backend.settings import get_settings
+
+# Common names and outdated synonyms mapped to the accepted botanical name.
+SPECIES_ALIASES: Dict[str, str] = {
+    "swiss cheese plant": "monstera deliciosa",
+    "split-leaf philodendron": "monstera deliciosa",
+    "zz plant": "zamioculcas zamiifolia",
+    "pothos": "epipremnum aureum",
+    "golden pothos": "epipremnum aureum",
+    "devil's ivy": "epipremnum aureum",
+    "snake plant": "dracaena trifasciata",
+    "sansevieria trifasciata": "dracaena trifasciata",
+    "fiddle leaf fig": "ficus lyrata",
+    "rubber plant": "ficus elastica",
+    "peace lily": "spathiphyllum wallisii",
+    "spider plant": "chlorophytum comosum",
+    "chinese money plant": "pilea peperomioides",
+    "aloe": "aloe vera",
+    "aloe barbadensis": "aloe vera",
+}
+
+_CULTIVAR = re.compile(r"""(?:^|\s)['"‘“][^'"’”]*(?:['"’”]|$)""")
+_PARENTHETICAL = re.compile(r"\(.*?\)")
+
+
+def canonical_species(name: str) -> str:
+    """Reduce a species name to the key used for lookups."""
+    text = _PARENTHETICAL.sub(" ", _CULTIVAR.sub(" ", name))
+    text = " ".join(text.replace("×", "x").split()).casefold().rstrip(".")
+    text = re.sub(r"\b(cv|var|subsp|ssp)\.?\s.*$", "", text).strip()
+    return SPECIES_ALIASES.get(text, text)
+
+
+class SpeciesProfileStore:
+    """Canonical species name → care profile, optionally persisted to SQLite."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._profiles: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path:
+            with self._connection() as connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS species_profiles "
+                    "(species TEXT PRIMARY KEY, profile TEXT NOT NULL)"
+                )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, species: str) -> Optional[dict]:
+        key = canonical_species(species)
+        profile = self._profiles.get(key)
+        if profile is None and self.path:
+            row = self._connection().execute(
+                "SELECT profile FROM species_profiles WHERE species = ?", (key,)
+            ).fetchone()
+            if row:
+                profile = self._profiles[key] = json.loads(row[0])
+        with self._lock:
+            if profile is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return dict(profile)
+
+    def put(self, species: str, profile: dict) -> None:
+        key = canonical_species(species)
+        stored = {field: value for field, value in profile.items() if field != "species"}
+        self._profiles[key] = stored
+        if self.path:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO species_profiles (species, profile) VALUES (?, ?)",
+                    (key, json.dumps(stored)),
+                )
+
+    def metrics(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._profiles)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+            self.hits = self.misses = 0
+        if self.path:
+            with self._connection() as connection:
+                connection.execute("DELETE FROM species_profiles")
+
+
+@lru_cache
+def get_species_profiles() -> SpeciesProfileStore:
+    return SpeciesProfileStore(get_settings().species_profile_path)
@@ -0,0 +1,193 @@
+"""Schema-validated model output for graph nodes.
+
+Nodes describe the answer they expect as a Pydantic model. Chat models with a
+native structured-output mode (tool calling / JSON schema) are asked to use it,
+except while the reply is streamed as tokens: a tool-call reply has no text
+content to stream. Otherwise the model is prompted for JSON, which is parsed
+tolerantly (code fences, stray prose). A reply that still fails validation gets
+a bounded number of repair turns that show the model its reply (for tool calls,
+the call's arguments) and the validation error, instead of silently falling
+back after a wasted round-trip.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Literal, Optional, Sequence, Type, TypeVar
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.utils.json import parse_json_markdown
+from pydantic import BaseModel, Field, field_validator
+
+from plantos_backend.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+class CareProfile(BaseModel):
+    """Care profile for a species."""
+
+    light: str = Field(description='Light requirement, e.g. "bright indirect" or "low"')
+    watering_days: int = Field(gt=0, description="Days between waterings")
+    feeding_days: Optional[int] = Field(default=None, gt=0, description="Days between feedings")
+
+
+class Diagnosis(BaseModel):
+    """Plant health diagnosis."""
+
+    diagnosis: str = Field(description="Short diagnosis title")
+    severity: Literal["low", "medium", "high"]
+    recommendations: List[str] = Field(default_factory=list, description="Actions to take")
+
+    @field_validator("severity", mode="before")
+    @classmethod
+    def _lower(cls, value: object) -> object:
+        return value.strip().lower() if isinstance(value, str) else value
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a reply still does not match its schema after every repair turn."""
+
+
+@dataclass
+class StructuredOutputStats:
+    calls: int = 0
+    parse_failures: int = 0
+    repairs: int = 0
+    repaired: int = 0
+    exhausted: int = 0
+    repair_seconds: float = 0.0
+
+    @property
+    def parse_failure_rate(self) -> float:
+        return self.parse_failures / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "parse_failure_rate": self.parse_failure_rate}
+
+
+_stats: Dict[str, StructuredOutputStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(schema: Type[BaseModel], **increments: float) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(schema.__name__, StructuredOutputStats())
+        for field, amount in increments.items():
+            setattr(stats, field, getattr(stats, field) + amount)
+
+
+def metrics() -> Dict[str, Dict[str, float]]:
+    """Per-schema call, parse-failure and repair counters."""
+    with _stats_lock:
+        return {name: stats.as_dict() for name, stats in _stats.items()}
+
+
+def reset_metrics() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def format_instructions(schema: Type[BaseModel]) -> str:
+    """Prompt text asking for JSON that matches ``schema``."""
+    return (
+        "Return ONLY a JSON object matching this JSON schema:\n"
+        f"{json.dumps(schema.model_json_schema())}"
+    )
+
+
+def _parse(schema: Type[SchemaT], content: str) -> SchemaT:
+    try:
+        return schema.model_validate(parse_json_markdown(content))
+    except (ValueError, TypeError) as exc:
+        raise StructuredOutputError(str(exc)) from exc
+
+
+def _raw_text(message: BaseMessage) -> str:
+    """What the model actually answered: its text, or the arguments of its tool call."""
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        return json.dumps(tool_calls[0]["args"])
+    invalid_tool_calls = getattr(message, "invalid_tool_calls", None)
+    if invalid_tool_calls:
+        return invalid_tool_calls[0].get("args") or ""
+    return message.content if isinstance(message.content, str) else json.dumps(message.content)
+
+
+async def _ask(
+    model: BaseChatModel, messages: Sequence[BaseMessage], schema: Type[SchemaT], native: bool
+) -> tuple[Optional[SchemaT], str, str]:
+    """One model call; returns ``(parsed or None, raw reply, error)``."""
+    if native:
+        try:
+            runnable = model.with_structured_output(schema, include_raw=True)
+        except NotImplementedError:
+            pass
+        else:
+            reply = await runnable.ainvoke(list(messages))
+            raw_text = _raw_text(reply["raw"])
+            if reply["parsed"] is not None:
+                return reply["parsed"], raw_text, ""
+            return None, raw_text, str(reply.get("parsing_error") or "No structured output")
+
+    response = await model.ainvoke(list(messages))
+    try:
+        return _parse(schema, response.content), response.content, ""
+    except StructuredOutputError as exc:
+        return None, response.content, str(exc)
+
+
+async def ainvoke_structured(
+    model: BaseChatModel,
+    messages: Sequence[BaseMessage],
+    schema: Type[SchemaT],
+    max_repairs: int | None = None,
+    native: bool | None = None,
+) -> SchemaT:
+    """Call ``model`` and validate its reply as ``schema``, repairing bad replies.
+
+    At most ``max_repairs`` (default ``ai_structured_max_repairs``) follow-up calls
+    are made; if none yields a valid reply ``StructuredOutputError`` is raised.
+    ``native`` (default ``ai_native_structured_output``) selects the model's own
+    structured-output mode; pass ``False`` when the reply is streamed as tokens.
+    """
+    settings = get_settings()
+    if max_repairs is None:
+        max_repairs = settings.ai_structured_max_repairs
+    if native is None:
+        native = settings.ai_native_structured_output
+    _record(schema, calls=1)
+
+    conversation: List[BaseMessage] = list(messages)
+    parsed, raw, error = await _ask(model, conversation, schema, native)
+    if parsed is not None:
+        return parsed
+    _record(schema, parse_failures=1)
+
+    started = time.perf_counter()
+    try:
+        for attempt in range(1, max_repairs + 1):
+            logger.info("Repairing %s output (attempt %d): %s", schema.__name__, attempt, error)
+            _record(schema, repairs=1)
+            conversation += [
+                AIMessage(content=raw),
+                HumanMessage(
+                    content=f"That reply was not valid: {error}\n{format_instructions(schema)}"
+                ),
+            ]
+            parsed, raw, error = await _ask(model, conversation, schema, native)
+            if parsed is not None:
+                _record(schema, repaired=1)
+                return parsed
+    finally:
+        _record(schema, repair_seconds=time.perf_counter() - started)
+
+    _record(schema, exhausted=1)
+    raise StructuredOutputError(f"{schema.__name__} output invalid after repairs: {error}")
+
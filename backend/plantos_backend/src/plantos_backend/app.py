@@ -1,13 +1,44 @@
 """FastAPI application factory for PlantOS."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from plantos_backend.routers import experiments, plants, schedules
+from plantos_backend.ai import providers
+from plantos_backend.routers import ALL_ROUTERS
+from plantos_backend.services import diagnostics, images, jobs, reminder_scheduler, storage
 from plantos_backend.settings import AppSettings, get_settings
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    storage.set_storage_service(storage.create_storage_service(settings))
+    runner = jobs.JobRunner(
+        jobs.get_job_queue(),
+        diagnostics.JOB_HANDLERS,
+        concurrency=settings.job_workers,
+        heartbeat_seconds=settings.job_heartbeat_seconds,
+        stale_seconds=settings.job_stale_seconds,
+        max_attempts=settings.job_max_attempts,
+    )
+    runner.start()
+    scheduler = None
+    if settings.reminder_scheduler_enabled:
+        scheduler = reminder_scheduler.create_reminder_scheduler(settings)
+        scheduler.start()
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+    await runner.stop()
+    storage.get_storage_service().close()
+    storage.set_storage_service(None)
+    images.shutdown_image_pool()
+    await providers.close_clients()
+
+
 def create_app(settings: AppSettings | None = None) -> FastAPI:
     current_settings = settings or get_settings()
     app = FastAPI(
@@ -16,6 +47,7 @@ def create_app(settings: AppSettings | None = None) -> FastAPI:
         summary="PlantOS API surface",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -26,9 +58,8 @@ def create_app(settings: AppSettings | None = None) -> FastAPI:
         allow_headers=["*"],
     )
 
-    app.include_router(plants.router)
-    app.include_router(schedules.router)
-    app.include_router(experiments.router)
+    for router in ALL_ROUTERS:
+        app.include_router(router)
 
     return app
 
@@ -1,6 +1,7 @@
 """Aggregate exports for models."""
 from .common import CareSignal, CollectionNames, Environment, ReminderChannel, TimestampedModel
 from .experiments import Experiment, ExperimentVariant
+from .jobs import Job, JobStatus
 from .marketplace import Listing, ListingStatus, Order, OrderStatus
 from .plants import CareTask, LightLevel, Plant, Reminder, TimelineEvent
 from .propagation import PropagationBatch, PropagationStage
@@ -13,6 +14,8 @@ __all__ = [
     "TimestampedModel",
     "Experiment",
     "ExperimentVariant",
+    "Job",
+    "JobStatus",
     "Listing",
     "ListingStatus",
     "Order",
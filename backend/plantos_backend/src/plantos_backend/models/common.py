@@ -53,4 +53,8 @@ class CollectionNames(str, Enum):
     reminders = "reminders"
     events = "events"
     experiments = "experiments"
+    propagations = "propagations"
+    listings = "listings"
+    orders = "orders"
+    jobs = "jobs"
 
@@ -0,0 +1,32 @@
+"""Background job models."""
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, ClassVar, Dict, Optional
+
+from pydantic import Field
+
+from plantos_backend.models.common import CollectionNames, TimestampedModel, generate_id
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class Job(TimestampedModel):
+    id: str = Field(default_factory=lambda: generate_id("job"))
+    kind: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    status: JobStatus = JobStatus.queued
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+    collection_name: ClassVar[str] = CollectionNames.jobs
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.succeeded, JobStatus.failed)
@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Optional
+from typing import ClassVar, Optional
 
 from pydantic import Field
 
-from plantos_backend.models.common import TimestampedModel
+from plantos_backend.models.common import CollectionNames, TimestampedModel
 
 
 class ListingStatus(str, Enum):
@@ -33,6 +33,8 @@ class Listing(TimestampedModel):
     provenance: list[str] = Field(default_factory=list)
     photo_url: Optional[str] = None
 
+    collection_name: ClassVar[str] = CollectionNames.listings
+
 
 class Order(TimestampedModel):
     listing_id: str
@@ -41,3 +43,5 @@ class Order(TimestampedModel):
     currency: str = "USD"
     status: OrderStatus = OrderStatus.pending
     stripe_payment_intent: Optional[str] = None
+
+    collection_name: ClassVar[str] = CollectionNames.orders
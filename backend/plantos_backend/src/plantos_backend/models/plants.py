@@ -8,7 +8,14 @@ from typing import ClassVar, List, Optional
 
 from pydantic import Field
 
-from plantos_backend.models.common import CareSignal, CollectionNames, Priority, TimestampedModel, generate_id
+from plantos_backend.models.common import (
+    CareSignal,
+    CollectionNames,
+    Priority,
+    ReminderChannel,
+    TimestampedModel,
+    generate_id,
+)
 
 
 class LightLevel(str, Enum):
@@ -25,6 +32,7 @@ class Plant(TimestampedModel):
     watering_interval_days: int = 7
     feeding_interval_days: int = 30
     reminders_enabled: bool = True
+    owner_id: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
 
     collection_name: ClassVar[str] = CollectionNames.plants
@@ -79,9 +87,13 @@ class TimelineEvent(TimestampedModel):
 class Reminder(TimestampedModel):
     id: str = Field(default_factory=lambda: generate_id("reminder"))
     task_id: str
+    plant_id: Optional[str] = None
+    user_id: Optional[str] = None
     send_at: datetime
-    channel: str = "push"
+    channel: ReminderChannel = ReminderChannel.push
     delivered_at: Optional[datetime] = None
+    attempts: int = 0
+    error: Optional[str] = None
 
     collection_name: ClassVar[str] = CollectionNames.reminders
 
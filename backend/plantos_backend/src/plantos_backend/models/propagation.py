@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Optional
+from typing import ClassVar, Optional
 
-from plantos_backend.models.common import TimestampedModel
+from plantos_backend.models.common import CollectionNames, TimestampedModel
 
 
 class PropagationStage(str, Enum):
@@ -21,5 +21,7 @@ class PropagationBatch(TimestampedModel):
     humidity: Optional[float] = None
     temperature: Optional[float] = None
 
+    collection_name: ClassVar[str] = CollectionNames.propagations
+
     def mark_ready(self) -> None:
         self.stage = PropagationStage.sale_ready
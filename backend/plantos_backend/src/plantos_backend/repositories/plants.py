@@ -1,71 +1,107 @@
 """Repository utilities for plants and related records."""
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional
 
-from plantos_backend.models import CareSignal, CareTask, Plant, TimelineEvent
+from plantos_backend.models import CareTask, Plant, TimelineEvent
 from plantos_backend.schemas.plants import PlantCreate, PlantUpdate, TimelineEventCreate
-from plantos_backend.storage.memory import memory_store
+from plantos_backend.services.calendar import built_care_calendar
+from plantos_backend.services.reminder_scheduler import notify_task_changes
+from plantos_backend.services.scheduler import plant_cadence
+from plantos_backend.storage import DataStore, get_store
+from plantos_backend.storage.indexes import IndexKey
 
 
 class PlantRepository:
-    def list(self) -> List[Plant]:
-        return sorted(memory_store.plants.values(), key=lambda plant: plant.created_at)
+    @property
+    def store(self) -> DataStore:
+        return get_store()
+
+    def list(self, after: Optional[IndexKey] = None, limit: Optional[int] = None) -> List[Plant]:
+        """Plants ordered by ``(created_at, id)``, starting after the ``after`` key."""
+        return self.store.list_plants(after=after, limit=limit)
 
     def get(self, plant_id: str) -> Optional[Plant]:
-        return memory_store.plants.get(plant_id)
+        return self.store.get_plant(plant_id)
 
     def create(self, payload: PlantCreate) -> Plant:
         plant = Plant(**payload.model_dump())
-        memory_store.plants[plant.id] = plant
-        return plant
+        return self.store.put_plant(plant)
 
     def update(self, plant_id: str, payload: PlantUpdate) -> Optional[Plant]:
-        existing = memory_store.plants.get(plant_id)
+        existing = self.store.get_plant(plant_id)
         if not existing:
             return None
         update_data = payload.model_dump(exclude_unset=True)
         updated = existing.model_copy(update=update_data)
-        memory_store.plants[plant_id] = updated
+        self.store.put_plant(updated)
+        self._sync_cadences(updated)
         return updated
 
+    def _sync_cadences(self, plant: Plant) -> None:
+        """Carry changed plant intervals over to its tasks and the care calendar."""
+        changed = []
+        for task in self.store.tasks_for_plant(plant.id):
+            cadence = plant_cadence(plant, task.signal)
+            if cadence is not None and cadence != task.cadence_days:
+                changed.append(task.model_copy(update={"cadence_days": cadence}))
+        if changed:
+            stored = self.store.put_tasks(changed)
+            if (calendar := built_care_calendar()) is not None:
+                calendar.put_many(stored)
+
     def delete(self, plant_id: str) -> bool:
-        removed = memory_store.plants.pop(plant_id, None)
-        if removed:
-            tasks = [
-                task_id
-                for task_id, task in memory_store.care_tasks.items()
-                if task.plant_id == plant_id
-            ]
-            for task_id in tasks:
-                memory_store.care_tasks.pop(task_id, None)
-            memory_store.timeline.pop(plant_id, None)
-        return removed is not None
+        removed = self.store.remove_plant(plant_id) is not None
+        if removed and (calendar := built_care_calendar()) is not None:
+            calendar.discard_plant(plant_id)
+        return removed
 
     def add_timeline_event(self, plant_id: str, payload: TimelineEventCreate) -> TimelineEvent:
         event = TimelineEvent(plant_id=plant_id, **payload.model_dump())
-        memory_store.timeline.setdefault(plant_id, []).append(event)
-        return event
+        return self.store.add_event(event)
 
-    def list_timeline(self, plant_id: str) -> List[TimelineEvent]:
-        return memory_store.timeline.get(plant_id, [])
+    def list_timeline(
+        self,
+        plant_id: str,
+        after: Optional[IndexKey] = None,
+        limit: Optional[int] = None,
+    ) -> List[TimelineEvent]:
+        return self.store.list_events(plant_id, after=after, limit=limit)
 
     def list_tasks(self, plant_id: Optional[str] = None) -> List[CareTask]:
-        tasks = list(memory_store.care_tasks.values())
         if plant_id:
-            tasks = [task for task in tasks if task.plant_id == plant_id]
-        return sorted(tasks, key=lambda task: task.next_due_at)
+            return self.store.tasks_for_plant(plant_id)
+        return self.store.tasks_due()
+
+    def list_due_tasks(
+        self,
+        until: datetime,
+        after: Optional[IndexKey] = None,
+        limit: Optional[int] = None,
+    ) -> List[CareTask]:
+        """Tasks due at or before ``until``, ordered by ``(next_due_at, id)``."""
+        return self.store.tasks_due(until=until, after=after, limit=limit)
 
     def add_task(self, task: CareTask) -> CareTask:
-        memory_store.care_tasks[task.id] = task
-        return task
+        return self.update_task(task)
+
+    def add_tasks(self, tasks: Iterable[CareTask]) -> List[CareTask]:
+        stored = self.store.put_tasks(tasks)
+        if (calendar := built_care_calendar()) is not None:
+            calendar.put_many(stored)
+        notify_task_changes(stored)
+        return stored
 
     def get_task(self, task_id: str) -> Optional[CareTask]:
-        return memory_store.care_tasks.get(task_id)
+        return self.store.get_task(task_id)
 
     def update_task(self, task: CareTask) -> CareTask:
-        memory_store.care_tasks[task.id] = task
-        return task
+        stored = self.store.put_task(task)
+        if (calendar := built_care_calendar()) is not None:
+            calendar.put(stored)
+        notify_task_changes([stored])
+        return stored
 
 
 plant_repository = PlantRepository()
@@ -1,6 +1,7 @@
 """Router exports for centralized registration."""
 from plantos_backend.routers.ai import router as ai_router
 from plantos_backend.routers.experiments import router as experiments_router
+from plantos_backend.routers.jobs import router as jobs_router
 from plantos_backend.routers.marketplace import router as marketplace_router
 from plantos_backend.routers.meta import router as meta_router
 from plantos_backend.routers.plants import router as plants_router
@@ -15,6 +16,7 @@ ALL_ROUTERS = [
     experiments_router,
     propagation_router,
     marketplace_router,
+    jobs_router,
 ]
 
 __all__ = ["ALL_ROUTERS"]
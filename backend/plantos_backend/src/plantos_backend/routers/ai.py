@@ -1,13 +1,22 @@
 """AI endpoints backed by LangGraph workflows."""
 from __future__ import annotations
 
+from typing import Any, List, Type
+
 from fastapi import APIRouter
+from pydantic import BaseModel, ValidationError
 
+from plantos_backend.routers.events import EventStream, event_stream
 from plantos_backend.schemas.ai import (
+    BatchItemResult,
     ExperimentReviewRequest,
     ExperimentReviewResponse,
+    HealthCheckBatchRequest,
+    HealthCheckBatchResponse,
     HealthCheckRequest,
     HealthCheckResponse,
+    PlantIdentifyBatchRequest,
+    PlantIdentifyBatchResponse,
     PlantIdentifyRequest,
     PlantIdentifyResponse,
 )
@@ -16,19 +25,64 @@ from plantos_backend.services import ai
 router = APIRouter(prefix="/ai", tags=["ai"])
 
 
+def _batch_results(results: List[Any], model: Type[BaseModel]) -> List[BatchItemResult]:
+    items = []
+    for result in results:
+        if isinstance(result, Exception):
+            items.append(BatchItemResult(error=str(result) or type(result).__name__))
+            continue
+        try:
+            items.append(BatchItemResult(result=model(**result)))
+        except ValidationError as exc:
+            items.append(BatchItemResult(error=f"Incomplete result: {exc.error_count()} errors"))
+    return items
+
+
+def _shaped(model: Type[BaseModel]):
+    return lambda result: model(**result).model_dump()
+
+
 @router.post("/identify", response_model=PlantIdentifyResponse)
-def identify_plant(payload: PlantIdentifyRequest) -> PlantIdentifyResponse:
-    result = ai.run_onboarding(payload.photo_url, payload.notes)
+async def identify_plant(payload: PlantIdentifyRequest, stream: EventStream):
+    """Identify a plant; with ``Accept: text/event-stream`` progress is streamed as SSE."""
+    if stream:
+        events = ai.stream_onboarding(payload.photo_url, payload.notes)
+        return event_stream(events, _shaped(PlantIdentifyResponse))
+    result = await ai.run_onboarding(payload.photo_url, payload.notes)
     return PlantIdentifyResponse(**result)
 
 
 @router.post("/health", response_model=HealthCheckResponse)
-def diagnose(payload: HealthCheckRequest) -> HealthCheckResponse:
-    result = ai.run_health_check(payload.description)
+async def diagnose(payload: HealthCheckRequest, stream: EventStream):
+    """Diagnose a plant; with ``Accept: text/event-stream`` progress is streamed as SSE."""
+    if stream:
+        events = ai.stream_health_check(payload.description)
+        return event_stream(events, _shaped(HealthCheckResponse))
+    result = await ai.run_health_check(payload.description)
     return HealthCheckResponse(**result)
 
 
+@router.post("/identify:batch", response_model=PlantIdentifyBatchResponse)
+async def identify_plants(payload: PlantIdentifyBatchRequest) -> PlantIdentifyBatchResponse:
+    """Identify many plants at once; results are in request order with per-item errors."""
+    results = await ai.run_batch(ai.run_onboarding, [item.model_dump() for item in payload.items])
+    return PlantIdentifyBatchResponse(results=_batch_results(results, PlantIdentifyResponse))
+
+
+@router.post("/health:batch", response_model=HealthCheckBatchResponse)
+async def diagnose_many(payload: HealthCheckBatchRequest) -> HealthCheckBatchResponse:
+    """Run several health checks at once; results are in request order with per-item errors."""
+    results = await ai.run_batch(ai.run_health_check, [item.model_dump() for item in payload.items])
+    return HealthCheckBatchResponse(results=_batch_results(results, HealthCheckResponse))
+
+
 @router.post("/experiments/review", response_model=ExperimentReviewResponse)
-def review_experiments(payload: ExperimentReviewRequest) -> ExperimentReviewResponse:
-    result = ai.run_experiment_review(payload.model_dump())
+async def review_experiments(payload: ExperimentReviewRequest) -> ExperimentReviewResponse:
+    result = await ai.run_experiment_review(payload.model_dump())
     return ExperimentReviewResponse(**result)
+
+
+@router.get("/metrics")
+def read_metrics() -> dict[str, dict[str, Any]]:
+    """Cache, coalescing and structured-output counters for the AI workflows."""
+    return ai.metrics()
@@ -0,0 +1,55 @@
+"""Server-Sent Events helpers for endpoints that can stream their progress."""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Annotated, Any, AsyncIterator, Callable, Tuple
+
+from fastapi import Depends, Request
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+Event = Tuple[str, Any]
+
+
+def wants_event_stream(request: Request) -> bool:
+    """True when the client sent ``Accept: text/event-stream``."""
+    return EVENT_STREAM_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+EventStream = Annotated[bool, Depends(wants_event_stream)]
+
+
+def format_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _frames(
+    events: AsyncIterator[Event], on_result: Callable[[Any], Any]
+) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            if event == "result":
+                data = on_result(data)
+            yield format_event(event, data)
+    except Exception as exc:
+        logger.exception("Event stream failed")
+        yield format_event("error", {"detail": str(exc) or type(exc).__name__})
+
+
+def event_stream(
+    events: AsyncIterator[Event], on_result: Callable[[Any], Any] = lambda data: data
+) -> StreamingResponse:
+    """Send ``(event, data)`` pairs as SSE; ``on_result`` shapes the final ``result``.
+
+    Failures after the response has started are reported as an ``error`` event.
+    """
+    return StreamingResponse(
+        _frames(events, on_result),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        # Keep proxies from buffering the stream and clients from caching it.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
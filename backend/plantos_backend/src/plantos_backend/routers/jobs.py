@@ -0,0 +1,32 @@
+"""Background job status endpoints."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from plantos_backend.schemas.jobs import JobResponse
+from plantos_backend.services.jobs import get_job_queue
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# How often a long-poll re-reads the job while waiting for it to finish.
+POLL_INTERVAL_SECONDS = 0.1
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for completion"),
+) -> JobResponse:
+    """Return a job's status and, once finished, its result or error."""
+    queue = get_job_queue()
+    deadline = time.monotonic() + wait
+    job = await queue.get(job_id)
+    while job is not None and not job.finished and time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        job = await queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
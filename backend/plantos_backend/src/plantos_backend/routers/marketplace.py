@@ -1,9 +1,10 @@
 """Marketplace endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
 from plantos_backend.models.marketplace import ListingStatus
+from plantos_backend.routers.pagination import Page, paginate
 from plantos_backend.schemas.marketplace import (
     ListingCreate,
     ListingResponse,
@@ -24,8 +25,15 @@ def create_listing(payload: ListingCreate) -> ListingResponse:
 
 
 @router.get("/listings", response_model=list[ListingResponse])
-def list_listings(status: ListingStatus | None = None) -> list[ListingResponse]:
-    return marketplace_service.list_listings(status)
+def list_listings(
+    response: Response,
+    page: Page,
+    status: ListingStatus | None = None,
+) -> list[ListingResponse]:
+    def fetch(after, limit):
+        return marketplace_service.list_listings(status, after=after, limit=limit)
+
+    return paginate(fetch, page, response)
 
 
 @router.patch("/listings/{listing_id}", response_model=ListingResponse)
@@ -44,6 +52,11 @@ def create_order(payload: OrderCreate) -> OrderResponse:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
 
 
+@router.get("/listings/{listing_id}/orders", response_model=list[OrderResponse])
+def list_orders(listing_id: str) -> list[OrderResponse]:
+    return marketplace_service.list_orders(listing_id)
+
+
 @router.patch("/orders/{order_id}", response_model=OrderResponse)
 def update_order(order_id: str, payload: OrderUpdate) -> OrderResponse:
     try:
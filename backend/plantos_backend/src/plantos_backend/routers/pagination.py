@@ -0,0 +1,106 @@
+"""Keyset pagination and NDJSON streaming helpers shared by list endpoints."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Callable, Iterator, Optional, Sequence
+
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from plantos_backend.storage.indexes import IndexKey
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 500
+
+PageFetcher = Callable[[Optional[IndexKey], Optional[int]], Sequence[BaseModel]]
+KeyFunc = Callable[[BaseModel], IndexKey]
+
+
+def parse_cursor(value: str | None) -> IndexKey | None:
+    """Decode an ``<iso-timestamp>,<id>`` cursor into an index key.
+
+    Index keys are timezone-aware, so a timestamp without an offset is rejected.
+    """
+    if not value:
+        return None
+    timestamp, _, item_id = value.rpartition(",")
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from exc
+    if parsed.tzinfo is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor timestamp needs a UTC offset"
+        )
+    return parsed, item_id
+
+
+def format_cursor(timestamp: datetime, item_id: str) -> str:
+    return f"{timestamp.isoformat()},{item_id}"
+
+
+def set_next_cursor(response: Response, cursor: str | None) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def created_key(item: BaseModel) -> IndexKey:
+    return item.created_at, item.id
+
+
+@dataclass
+class PageParams:
+    after: IndexKey | None
+    limit: int | None
+    stream: bool
+
+
+def page_params(
+    request: Request,
+    after: str | None = Query(default=None, description="Cursor from X-Next-Cursor"),
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+) -> PageParams:
+    """Parse ``after``/``limit`` and detect ``Accept: application/x-ndjson``."""
+    stream = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    return PageParams(after=parse_cursor(after), limit=limit, stream=stream)
+
+
+Page = Annotated[PageParams, Depends(page_params)]
+
+
+def _ndjson_lines(
+    fetch: PageFetcher, after: IndexKey | None, limit: int | None, key: KeyFunc
+) -> Iterator[str]:
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = STREAM_CHUNK_SIZE if remaining is None else min(STREAM_CHUNK_SIZE, remaining)
+        chunk = fetch(after, size)
+        for item in chunk:
+            yield item.model_dump_json() + "\n"
+        if len(chunk) < size:
+            return
+        if remaining is not None:
+            remaining -= len(chunk)
+        after = key(chunk[-1])
+
+
+def paginate(
+    fetch: PageFetcher,
+    params: PageParams,
+    response: Response,
+    key: KeyFunc = created_key,
+) -> Sequence[BaseModel] | StreamingResponse:
+    """Serve one keyset page, or stream the collection as NDJSON in fixed-size chunks."""
+    if params.stream:
+        lines = _ndjson_lines(fetch, params.after, params.limit, key)
+        return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+    items = fetch(params.after, params.limit)
+    if params.limit is not None and len(items) == params.limit:
+        set_next_cursor(response, format_cursor(*key(items[-1])))
+    return items
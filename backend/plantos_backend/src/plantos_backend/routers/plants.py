@@ -1,9 +1,10 @@
 """Plant and schedule APIs."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
 from plantos_backend.repositories.plants import plant_repository
+from plantos_backend.routers.pagination import Page, paginate
 from plantos_backend.schemas.plants import (
     CareTaskResponse,
     DueTask,
@@ -13,26 +14,26 @@ from plantos_backend.schemas.plants import (
     TimelineEventCreate,
     TimelineEventResponse,
 )
-from plantos_backend.services import reminders, scheduler
-from plantos_backend.services.storage import get_storage_service
-from plantos_backend.ai.graphs import HEALTH_CHECK_GRAPH
+from plantos_backend.services import diagnostics, images, reminders, scheduler
+from plantos_backend.services.jobs import get_job_queue
+from plantos_backend.services.storage import Storage, UploadTooLargeError
 from fastapi import UploadFile, File
 
 router = APIRouter(prefix="/plants", tags=["plants"])
 
 
 @router.get("", response_model=list[PlantResponse])
-def list_plants() -> list[PlantResponse]:
-    return plant_repository.list()
+def list_plants(
+    response: Response, page: Page
+) -> list[PlantResponse]:
+    return paginate(plant_repository.list, page, response)
 
 
 @router.post("", response_model=PlantResponse, status_code=status.HTTP_201_CREATED)
 def create_plant(payload: PlantCreate) -> PlantResponse:
     plant = plant_repository.create(payload)
     # Generate initial tasks
-    tasks = scheduler.generate_initial_tasks(plant)
-    for task in tasks:
-        plant_repository.add_task(task)
+    plant_repository.add_tasks(scheduler.generate_initial_tasks(plant))
     return plant
 
 
@@ -102,48 +103,48 @@ def add_timeline_event(plant_id: str, payload: TimelineEventCreate) -> TimelineE
 
 
 @router.get("/{plant_id}/timeline", response_model=list[TimelineEventResponse])
-def list_timeline(plant_id: str) -> list[TimelineEventResponse]:
+def list_timeline(
+    plant_id: str, response: Response, page: Page
+) -> list[TimelineEventResponse]:
     if not plant_repository.get(plant_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plant not found")
-    return plant_repository.list_timeline(plant_id)
+
+    def fetch(after, limit):
+        return plant_repository.list_timeline(plant_id, after=after, limit=limit)
+
+    return paginate(fetch, page, response)
 
 
 @router.post("/{plant_id}/diagnose")
 async def diagnose_plant(
     plant_id: str,
+    storage: Storage,
+    response: Response,
     file: UploadFile = File(...),
+    background: bool = False,
 ) -> dict:
+    """Diagnose a plant photo; ``background=true`` returns a job id to poll instead."""
     plant = plant_repository.get(plant_id)
     if not plant:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plant not found")
 
-    # 1. Upload image
-    storage = get_storage_service()
-    image_path = storage.upload_image(file)
-
-    # 2. Run diagnostics
-    # We pass the description as "Diagnose this plant from the photo" + any user notes if we had them.
-    # For now, we assume the AI can look at the photo (or we just use a placeholder description).
-    # Since our current graph only takes text description, we'll simulate it or update the graph later to take image path.
-    # TODO: Update HealthCheckState to accept image_url/path
-    
-    inputs = {
-        "description": f"Visual diagnosis requested. Image available at: {image_path}",
-        # In a real multimodal setup, we'd pass the image to the model.
-    }
-    
-    result = await HEALTH_CHECK_GRAPH.ainvoke(inputs)
-    
-    # 3. Save to timeline
-    diagnosis = result.get("diagnosis", "Unknown")
-    recommendations = result.get("recommendations", [])
-    
-    note = f"Diagnosis: {diagnosis}\nRecommendations: {', '.join(recommendations)}"
-    
-    plant_repository.add_timeline_event(plant_id, TimelineEventCreate(
-        event_type="health_check",
-        note=note,
-        photo_url=image_path if "http" in image_path else None # Only save URL if it's public, otherwise local path might be tricky for frontend
-    ))
-
-    return result
+    # 1. Downscale the photo, make a timeline thumbnail and upload both
+    try:
+        photo = await images.store_photo(storage, file)
+    except UploadTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(exc)
+        ) from exc
+    except images.InvalidImageError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc)
+        ) from exc
+
+    # 2. Diagnose and record on the timeline, now or on a background worker
+    if background:
+        job = await get_job_queue().enqueue(diagnostics.diagnose_job(plant_id, photo))
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = f"/jobs/{job.id}"
+        return {"job_id": job.id, "status": job.status}
+
+    return await diagnostics.diagnose_photo(plant_id, photo)
@@ -1,8 +1,9 @@
 """Propagation routes."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
+from plantos_backend.routers.pagination import Page, paginate
 from plantos_backend.schemas.propagation import (
     PropagationCreate,
     PropagationResponse,
@@ -19,8 +20,15 @@ def create_batch(payload: PropagationCreate) -> PropagationResponse:
 
 
 @router.get("", response_model=list[PropagationResponse])
-def list_batches(mother_plant_id: str | None = None) -> list[PropagationResponse]:
-    return propagation_service.list_batches(mother_plant_id)
+def list_batches(
+    response: Response,
+    page: Page,
+    mother_plant_id: str | None = None,
+) -> list[PropagationResponse]:
+    def fetch(after, limit):
+        return propagation_service.list_batches(mother_plant_id, after=after, limit=limit)
+
+    return paginate(fetch, page, response)
 
 
 @router.patch("/{batch_id}", response_model=PropagationResponse)
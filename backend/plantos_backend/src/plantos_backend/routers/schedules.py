@@ -1,25 +1,77 @@
 """Schedule and task feed APIs."""
 from __future__ import annotations
 
-from fastapi import APIRouter
+from datetime import date, datetime, timedelta, timezone
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response, status
 
 from plantos_backend.repositories.plants import plant_repository
-from plantos_backend.schemas.plants import DueTask
+from plantos_backend.routers.pagination import Page, paginate
+from plantos_backend.schemas.plants import CalendarDay, CalendarEntry, DueTask
 from plantos_backend.services import reminders
+from plantos_backend.services.calendar import get_care_calendar
+from plantos_backend.settings import get_settings
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
 
 @router.get("/due", response_model=list[DueTask])
-def due_tasks(minutes: int = 120) -> list[DueTask]:
-    """Get tasks due within the next N minutes."""
-    tasks = reminders.due_within(plant_repository.list_tasks(), minutes=minutes)
+def due_tasks(
+    response: Response,
+    page: Page,
+    minutes: int = 120,
+) -> list[DueTask]:
+    """Get tasks due within the next N minutes, ordered by due time."""
+    cutoff = reminders.due_cutoff(minutes)
+
+    def fetch(after, limit) -> List[DueTask]:
+        return [
+            DueTask(
+                task_id=task.id,
+                plant_id=task.plant_id,
+                signal=task.signal.value,
+                next_due_at=task.next_due_at,
+            )
+            for task in plant_repository.list_due_tasks(cutoff, after=after, limit=limit)
+        ]
+
+    return paginate(fetch, page, response, key=lambda due: (due.next_due_at, due.task_id))
+
+
+@router.get("/calendar", response_model=list[CalendarDay])
+def calendar(
+    start: Annotated[Optional[date], Query(alias="from")] = None,
+    end: Annotated[Optional[date], Query(alias="to")] = None,
+) -> list[CalendarDay]:
+    """Care occurrences per day between ``from`` and ``to`` (inclusive), recurring tasks expanded.
+
+    Defaults to the coming week; days without tasks are omitted.
+    """
+    start = start or datetime.now(timezone.utc).date()
+    end = end or start + timedelta(days=6)
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="'to' must not be before 'from'"
+        )
+    max_days = get_settings().calendar_max_days
+    if (end - start).days + 1 > max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Calendar range is limited to {max_days} days",
+        )
     return [
-        DueTask(
-            task_id=task.id,
-            plant_id=task.plant_id,
-            signal=task.signal.value,
-            next_due_at=task.next_due_at,
+        CalendarDay(
+            day=day,
+            tasks=[
+                CalendarEntry(
+                    task_id=occurrence.task_id,
+                    plant_id=occurrence.plant_id,
+                    signal=occurrence.signal.value,
+                    due_at=occurrence.due_at,
+                )
+                for occurrence in occurrences
+            ],
         )
-        for task in tasks
+        for day, occurrences in get_care_calendar().range(start, end)
     ]
@@ -1,9 +1,14 @@
 """Schemas for AI endpoints."""
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Generic, List, Optional, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# Upper bound on items accepted by the ``:batch`` endpoints.
+MAX_BATCH_ITEMS = 100
+
+ResultT = TypeVar("ResultT")
 
 
 class PlantIdentifyRequest(BaseModel):
@@ -27,6 +32,29 @@ class HealthCheckResponse(BaseModel):
     recommendations: List[str]
 
 
+class PlantIdentifyBatchRequest(BaseModel):
+    items: List[PlantIdentifyRequest] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class HealthCheckBatchRequest(BaseModel):
+    items: List[HealthCheckRequest] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class BatchItemResult(BaseModel, Generic[ResultT]):
+    """Outcome of one batch item: ``result`` on success, ``error`` otherwise."""
+
+    result: Optional[ResultT] = None
+    error: Optional[str] = None
+
+
+class PlantIdentifyBatchResponse(BaseModel):
+    results: List[BatchItemResult[PlantIdentifyResponse]]
+
+
+class HealthCheckBatchResponse(BaseModel):
+    results: List[BatchItemResult[HealthCheckResponse]]
+
+
 class ExperimentReviewRequest(BaseModel):
     hypothesis: str
     variants: List[dict]
@@ -0,0 +1,8 @@
+"""Schemas for background job endpoints."""
+from __future__ import annotations
+
+from plantos_backend.models import Job
+
+
+class JobResponse(Job):
+    pass
@@ -1,7 +1,7 @@
 """Request/response schemas for plant endpoints."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
@@ -16,6 +16,7 @@ class PlantCreate(BaseModel):
     watering_interval_days: int = 7
     feeding_interval_days: int = 30
     reminders_enabled: bool = True
+    owner_id: Optional[str] = None
     notes: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
 
@@ -27,6 +28,7 @@ class PlantUpdate(BaseModel):
     watering_interval_days: Optional[int] = None
     feeding_interval_days: Optional[int] = None
     reminders_enabled: Optional[bool] = None
+    owner_id: Optional[str] = None
     notes: Optional[str] = None
     tags: Optional[List[str]] = None
 
@@ -54,3 +56,15 @@ class DueTask(BaseModel):
     plant_id: str
     signal: str
     next_due_at: datetime
+
+
+class CalendarEntry(BaseModel):
+    task_id: str
+    plant_id: str
+    signal: str
+    due_at: datetime
+
+
+class CalendarDay(BaseModel):
+    day: date
+    tasks: List[CalendarEntry]
@@ -1,21 +1,166 @@
 """AI orchestration helpers."""
 from __future__ import annotations
 
+import asyncio
+import copy
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from plantos_backend.ai import structured
+from plantos_backend.ai.cache import cache_key, get_response_cache
 from plantos_backend.ai.graphs import (
     EXPERIMENT_GRAPH,
     HEALTH_CHECK_GRAPH,
     PLANT_ONBOARD_GRAPH,
 )
+from plantos_backend.ai.routing import get_provider_health
+from plantos_backend.ai.singleflight import SingleFlight
+from plantos_backend.ai.species import get_species_profiles
+from plantos_backend.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Identical requests that arrive while one is already running share its result.
+_single_flight = SingleFlight()
+
+Cacheable = Callable[[dict], bool]
+
+
+def _has_diagnosis(result: dict) -> bool:
+    # run_diagnostics reports "unknown" severity when the model gave no usable answer.
+    return result.get("severity") != "unknown"
+
+
+def _has_care_profile(result: dict) -> bool:
+    return bool(result.get("care_profile"))
+
+
+async def _invoke_cached(
+    namespace: str,
+    graph: Any,
+    state: Dict[str, Any],
+    key_inputs: Dict[str, Any] | None = None,
+    cacheable: Cacheable = lambda result: True,
+) -> dict:
+    """Run ``graph`` unless an equivalent request was answered recently or is running.
+
+    Requests are equivalent when their ``key_inputs`` (default: ``state``) match.
+    Results failing ``cacheable`` (fallbacks after a provider error) are returned
+    but not cached, so the next request asks the model again.
+    """
+    cache = get_response_cache()
+    key = cache_key(namespace, state if key_inputs is None else key_inputs)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    async def invoke() -> dict:
+        result = await graph.ainvoke(state)
+        if cacheable(result):
+            cache.set(key, result)
+        return result
+
+    # Coalesced callers receive the same object, so hand each one its own copy.
+    return copy.deepcopy(await _single_flight.do(key, invoke))
+
+
+async def _stream_cached(
+    namespace: str, graph: Any, state: Dict[str, Any], cacheable: Cacheable = lambda result: True
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Stream a graph run as ``(event, data)`` pairs for Server-Sent Events.
+
+    Yields ``token`` events with model output as it is generated, a ``node``
+    event as each graph node finishes and finally the ``result``. Cached
+    answers are sent as the result straight away.
+    """
+    cache = get_response_cache()
+    key = cache_key(namespace, state)
+    cached = cache.get(key)
+    if cached is not None:
+        yield "result", cached
+        return
 
+    result = None
+    config = {"configurable": {"stream_tokens": True}}
+    async for event in graph.astream_events(state, config, version="v2"):
+        kind = event["event"]
+        node = event.get("metadata", {}).get("langgraph_node")
+        if kind == "on_chat_model_stream":
+            text = event["data"]["chunk"].content
+            if text:
+                yield "token", {"node": node, "text": text}
+        elif kind == "on_chain_end":
+            if not event.get("parent_ids"):
+                result = event["data"]["output"]
+            elif event["name"] == node:
+                yield "node", {"node": node}
+    if result is not None and cacheable(result):
+        cache.set(key, result)
+    yield "result", result
 
-def run_onboarding(photo_url: str | None, notes: str | None) -> dict:
+
+async def run_onboarding(photo_url: str | None, notes: str | None) -> dict:
+    state = {"photo_url": photo_url, "notes": notes}
+    return await _invoke_cached("onboard", PLANT_ONBOARD_GRAPH, state, cacheable=_has_care_profile)
+
+
+async def run_health_check(description: str) -> dict:
+    state = {"description": description}
+    return await _invoke_cached("health", HEALTH_CHECK_GRAPH, state, cacheable=_has_diagnosis)
+
+
+def stream_onboarding(photo_url: str | None, notes: str | None) -> AsyncIterator[Tuple[str, Any]]:
     state = {"photo_url": photo_url, "notes": notes}
-    return PLANT_ONBOARD_GRAPH.invoke(state)
+    return _stream_cached("onboard", PLANT_ONBOARD_GRAPH, state, cacheable=_has_care_profile)
+
+
+def stream_health_check(description: str) -> AsyncIterator[Tuple[str, Any]]:
+    state = {"description": description}
+    return _stream_cached("health", HEALTH_CHECK_GRAPH, state, cacheable=_has_diagnosis)
+
+
+async def run_photo_diagnosis(photo_sha256: str, description: str) -> dict:
+    """Health check for an uploaded photo, answered once per distinct image."""
+    return await _invoke_cached(
+        "photo-health",
+        HEALTH_CHECK_GRAPH,
+        {"description": description},
+        key_inputs={"sha256": photo_sha256},
+        cacheable=_has_diagnosis,
+    )
+
+
+async def run_batch(
+    run: Callable[..., Awaitable[dict]], items: Sequence[Dict[str, Any]]
+) -> List[dict | Exception]:
+    """Call ``run(**item)`` for every item, at most ``ai_max_concurrency`` at a time.
+
+    Results come back in input order; a failing item yields its exception in
+    place of a result instead of failing the whole batch. Repeated items are
+    answered by the response cache or coalesced with the in-flight call.
+    """
+    semaphore = asyncio.Semaphore(get_settings().ai_max_concurrency)
+
+    async def bounded(item: Dict[str, Any]) -> dict:
+        async with semaphore:
+            return await run(**item)
+
+    results = await asyncio.gather(*(bounded(item) for item in items), return_exceptions=True)
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            logger.warning("Batch item %d failed: %s", index, result)
+    return results
 
 
-def run_health_check(description: str) -> dict:
-    return HEALTH_CHECK_GRAPH.invoke({"description": description})
+async def run_experiment_review(payload: dict) -> dict:
+    return await EXPERIMENT_GRAPH.ainvoke(payload)
 
 
-def run_experiment_review(payload: dict) -> dict:
-    return EXPERIMENT_GRAPH.invoke(payload)
+def metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        "cache": get_response_cache().metrics(),
+        "species_profiles": get_species_profiles().metrics(),
+        "single_flight": _single_flight.metrics(),
+        "structured_output": structured.metrics(),
+        "providers": get_provider_health().metrics(),
+    }
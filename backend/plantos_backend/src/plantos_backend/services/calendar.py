@@ -0,0 +1,221 @@
+"""Care calendar kept as an incrementally maintained per-day view.
+
+Each stored ``CareTask`` is expanded into its recurring occurrences (every
+``cadence_days`` from ``next_due_at``) and filed into one bucket per calendar
+day. Writes through ``PlantRepository`` re-expand only the tasks they touch, so
+reading a date range costs O(days + k) instead of regrouping every task.
+
+Only a rolling window is stored: a task's current (possibly overdue) occurrence
+plus its occurrences from today to ``horizon_days`` ahead. Days that have passed
+are evicted as the window rolls forward, and days beyond the horizon are
+computed per request without being stored, so memory stays bounded whatever
+range is asked for.
+
+The view is built from the store on the first calendar read and lives in
+process; writes only update a view that has already been built, so processes
+that never serve the calendar never scan the task table for it. With a shared
+SQLite or Firestore backend each worker keeps its own copy, which only sees
+writes made through that worker. Sync routes share the view across threadpool
+threads, so every method holds the calendar's lock.
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from plantos_backend.models import CareSignal, CareTask
+from plantos_backend.settings import get_settings
+from plantos_backend.storage import get_store
+
+
+class Occurrence(NamedTuple):
+    due_at: datetime
+    task_id: str
+    plant_id: str
+    signal: CareSignal
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _first_on_or_after(due_at: datetime, cadence_days: int, day: date) -> datetime:
+    """First occurrence of the ``cadence_days`` series from ``due_at`` on or after ``day``."""
+    behind = (day - due_at.date()).days
+    if behind <= 0:
+        return due_at
+    return due_at + timedelta(days=-(-behind // cadence_days) * cadence_days)
+
+
+class CareCalendar:
+    """Per-day buckets of task occurrences from today up to a rolling horizon."""
+
+    def __init__(self, horizon_days: int = 90, today: Callable[[], date] = utc_today) -> None:
+        self.horizon_days = horizon_days
+        self.today = today
+        self.start = today()
+        self.until = self.start + timedelta(days=horizon_days)
+        self._days: Dict[date, Dict[str, Occurrence]] = defaultdict(dict)
+        self._tasks: Dict[str, CareTask] = {}
+        self._task_days: Dict[str, List[date]] = {}
+        self._pending: Dict[str, datetime] = {}
+        self._plant_tasks: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(days) for days in self._task_days.values())
+
+    def put(self, task: CareTask) -> None:
+        """Add or re-expand ``task`` (e.g. after completion moved its due date)."""
+        with self._lock:
+            self.discard(task.id)
+            self._tasks[task.id] = task
+            self._task_days[task.id] = []
+            self._plant_tasks[task.plant_id].add(task.id)
+            self._expand(task, task.next_due_at)
+
+    def put_many(self, tasks: Iterable[CareTask]) -> None:
+        with self._lock:
+            for task in tasks:
+                self.put(task)
+
+    def discard(self, task_id: str) -> None:
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task is None:
+                return
+            for day in self._task_days.pop(task_id):
+                bucket = self._days[day]
+                bucket.pop(task_id, None)
+                if not bucket:
+                    del self._days[day]
+            self._pending.pop(task_id, None)
+            plant_tasks = self._plant_tasks[task.plant_id]
+            plant_tasks.discard(task_id)
+            if not plant_tasks:
+                del self._plant_tasks[task.plant_id]
+
+    def discard_plant(self, plant_id: str) -> None:
+        with self._lock:
+            for task_id in list(self._plant_tasks.get(plant_id, ())):
+                self.discard(task_id)
+
+    def tasks_for_plant(self, plant_id: str) -> List[CareTask]:
+        with self._lock:
+            return [self._tasks[task_id] for task_id in self._plant_tasks.get(plant_id, ())]
+
+    def roll(self) -> None:
+        """Move the window to today: evict passed occurrences and expand new days."""
+        with self._lock:
+            self._roll()
+
+    def range(self, start: date, end: date) -> List[Tuple[date, List[Occurrence]]]:
+        """Non-empty days in ``[start, end]`` with their occurrences in due order."""
+        with self._lock:
+            self._roll()
+            days = []
+            for offset in range((min(end, self.until) - start).days + 1):
+                day = start + timedelta(days=offset)
+                bucket = self._days.get(day)
+                if bucket:
+                    days.append((day, sorted(bucket.values())))
+            if end > self.until:
+                days += self._project(max(start, self.until + timedelta(days=1)), end)
+            return days
+
+    def _roll(self) -> None:
+        today = self.today()
+        if today <= self.start:
+            return
+        self.start = today
+        for day in [day for day in self._days if day < today]:
+            bucket = self._days[day]
+            for task_id, occurrence in list(bucket.items()):
+                # A task's current occurrence stays visible while it is overdue.
+                if occurrence.due_at != self._tasks[task_id].next_due_at:
+                    del bucket[task_id]
+                    self._task_days[task_id].remove(day)
+            if not bucket:
+                del self._days[day]
+        until = today + timedelta(days=self.horizon_days)
+        if until > self.until:
+            self.until = until
+            for task_id, due_at in list(self._pending.items()):
+                self._expand(self._tasks[task_id], due_at)
+
+    def _project(self, start: date, end: date) -> List[Tuple[date, List[Occurrence]]]:
+        # Days past the horizon are computed from each task's next unstored occurrence.
+        buckets: Dict[date, List[Occurrence]] = defaultdict(list)
+        for task_id, due_at in self._pending.items():
+            task = self._tasks[task_id]
+            if task.cadence_days > 0:
+                due_at = _first_on_or_after(due_at, task.cadence_days, start)
+            while due_at.date() <= end:
+                if due_at.date() >= start:
+                    buckets[due_at.date()].append(
+                        Occurrence(due_at, task.id, task.plant_id, task.signal)
+                    )
+                if task.cadence_days <= 0:
+                    break
+                due_at += timedelta(days=task.cadence_days)
+        return [(day, sorted(buckets[day])) for day in sorted(buckets)]
+
+    def _file(self, task: CareTask, due_at: datetime) -> None:
+        day = due_at.date()
+        self._days[day][task.id] = Occurrence(due_at, task.id, task.plant_id, task.signal)
+        self._task_days[task.id].append(day)
+
+    def _expand(self, task: CareTask, due_at: datetime | None) -> None:
+        # Materialize occurrences up to the horizon; remember the next one for roll().
+        recurring = task.cadence_days > 0
+        step = timedelta(days=task.cadence_days)
+        if due_at == task.next_due_at and due_at.date() < self.start:
+            # Overdue: keep the current occurrence; later ones start in the window.
+            self._file(task, due_at)
+            due_at = due_at + step if recurring else None
+        if due_at is not None and recurring:
+            due_at = _first_on_or_after(due_at, task.cadence_days, self.start)
+        while due_at is not None and due_at.date() <= self.until:
+            self._file(task, due_at)
+            due_at = due_at + step if recurring else None
+        if due_at is None:
+            self._pending.pop(task.id, None)
+        else:
+            self._pending[task.id] = due_at
+
+
+_calendar: CareCalendar | None = None
+# Held while the view is built so a write that lands mid-build waits and then applies
+# to the finished view instead of being skipped.
+_calendar_lock = threading.Lock()
+
+
+def build_care_calendar() -> CareCalendar:
+    calendar = CareCalendar(get_settings().calendar_horizon_days)
+    calendar.put_many(get_store().tasks_due())
+    return calendar
+
+
+def get_care_calendar() -> CareCalendar:
+    """Return the shared calendar view, building it from the store on first use."""
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = build_care_calendar()
+        return _calendar
+
+
+def built_care_calendar() -> CareCalendar | None:
+    """Return the shared view if a read has built it; writes skip an unbuilt view."""
+    with _calendar_lock:
+        return _calendar
+
+
+def set_care_calendar(calendar: CareCalendar | None) -> None:
+    """Replace the shared view (``None`` rebuilds it from the store on next use)."""
+    global _calendar
+    with _calendar_lock:
+        _calendar = calendar
@@ -0,0 +1,50 @@
+"""Photo health diagnoses, run inline or as background jobs."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any, Dict
+
+from plantos_backend.models import Job
+from plantos_backend.repositories.plants import plant_repository
+from plantos_backend.schemas.plants import TimelineEventCreate
+from plantos_backend.services import ai
+from plantos_backend.services.images import StoredPhoto
+from plantos_backend.services.jobs import JobHandler
+
+DIAGNOSE_JOB = "diagnose"
+
+
+async def diagnose_photo(plant_id: str, photo: StoredPhoto) -> dict:
+    """Diagnose a stored photo and record the outcome on the plant's timeline."""
+    # We pass the description as "Diagnose this plant from the photo" + any user notes
+    # if we had them. For now, we assume the AI can look at the photo (or we just use
+    # a placeholder description). Since our current graph only takes text description,
+    # we'll simulate it or update the graph later to take image path.
+    # TODO: Update HealthCheckState to accept image_url/path
+    description = f"Visual diagnosis requested. Image available at: {photo.url}"
+
+    # Photos diagnosed before (same bytes) are answered from the hash cache.
+    result = await ai.run_photo_diagnosis(photo.sha256, description)
+
+    diagnosis = result.get("diagnosis", "Unknown")
+    recommendations = result.get("recommendations", [])
+    note = f"Diagnosis: {diagnosis}\nRecommendations: {', '.join(recommendations)}"
+
+    # Only save URL if it's public, otherwise local path might be tricky for frontend
+    photo_url = photo.thumbnail_url if "http" in photo.thumbnail_url else None
+    plant_repository.add_timeline_event(
+        plant_id,
+        TimelineEventCreate(event_type="health_check", note=note, photo_url=photo_url),
+    )
+    return result
+
+
+def diagnose_job(plant_id: str, photo: StoredPhoto) -> Job:
+    return Job(kind=DIAGNOSE_JOB, payload={"plant_id": plant_id, "photo": asdict(photo)})
+
+
+async def _run_diagnose_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return await diagnose_photo(payload["plant_id"], StoredPhoto(**payload["photo"]))
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {DIAGNOSE_JOB: _run_diagnose_job}
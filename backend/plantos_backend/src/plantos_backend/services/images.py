@@ -0,0 +1,155 @@
+"""Photo processing ahead of storage and AI diagnosis.
+
+Uploaded photos are decoded, rotated upright from their EXIF orientation,
+downscaled to ``image_max_edge`` and re-encoded (WebP by default), with a small
+thumbnail for the timeline. The upload is spooled to a temporary file in chunks
+and the pool worker decodes it from there, so the request handler never holds
+the whole photo in memory. Decoding and encoding are CPU-bound, so they run in
+a shared process pool rather than on the event loop or a thread. Stored names
+derive from the SHA-256 of the original upload, so a photo seen before skips
+processing entirely.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from pathlib import Path
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from plantos_backend.services.storage import StorageService, spool_upload
+from plantos_backend.settings import get_settings
+
+CONTENT_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+EXTENSIONS = {"WEBP": ".webp", "JPEG": ".jpg"}
+
+
+class InvalidImageError(ValueError):
+    """Raised when an upload cannot be decoded as an image."""
+
+
+@dataclass(frozen=True)
+class ProcessedImage:
+    data: bytes
+    thumbnail: bytes
+    format: str
+    width: int
+    height: int
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPES[self.format]
+
+    @property
+    def extension(self) -> str:
+        return EXTENSIONS[self.format]
+
+
+@dataclass(frozen=True)
+class StoredPhoto:
+    sha256: str
+    url: str
+    thumbnail_url: str
+
+
+def _encode(image: Image.Image, image_format: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "JPEG":
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(buffer, "WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def process_image(
+    source: bytes | str | Path,
+    max_edge: int = 1536,
+    thumbnail_edge: int = 320,
+    image_format: str = "WEBP",
+    quality: int = 80,
+) -> ProcessedImage:
+    """Orient, downscale and re-encode ``source`` (bytes or a file path).
+
+    EXIF (including GPS) is dropped.
+    """
+    image_format = image_format.upper()
+    if image_format not in CONTENT_TYPES:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    try:
+        opened = io.BytesIO(source) if isinstance(source, bytes) else source
+        with Image.open(opened) as original:
+            # Let the JPEG decoder skip straight to a reduced scale where it can.
+            original.draft("RGB", (max_edge, max_edge))
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise InvalidImageError(f"Unreadable image: {exc}") from exc
+
+    keep_alpha = image_format == "WEBP" and image.mode in ("RGBA", "LA", "P")
+    image = image.convert("RGBA" if keep_alpha else "RGB")
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    thumbnail = image.copy()
+    thumbnail.thumbnail((thumbnail_edge, thumbnail_edge), Image.Resampling.LANCZOS)
+    return ProcessedImage(
+        data=_encode(image, image_format, quality),
+        thumbnail=_encode(thumbnail, image_format, quality),
+        format=image_format,
+        width=image.width,
+        height=image.height,
+    )
+
+
+@lru_cache
+def get_image_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=get_settings().image_workers)
+
+
+def shutdown_image_pool() -> None:
+    if get_image_pool.cache_info().currsize:
+        get_image_pool().shutdown(wait=False, cancel_futures=True)
+    get_image_pool.cache_clear()
+
+
+async def prepare_image(source: bytes | str | Path) -> ProcessedImage:
+    """Run ``process_image`` with the configured limits in the process pool."""
+    settings = get_settings()
+    job = partial(
+        process_image,
+        source,
+        max_edge=settings.image_max_edge,
+        thumbnail_edge=settings.image_thumbnail_edge,
+        image_format=settings.image_format,
+        quality=settings.image_quality,
+    )
+    return await asyncio.get_running_loop().run_in_executor(get_image_pool(), job)
+
+
+async def store_photo(storage: StorageService, file: UploadFile) -> StoredPhoto:
+    """Spool, process and store an uploaded photo along with its thumbnail.
+
+    Repeat uploads of the same bytes return the existing objects unprocessed.
+    """
+    settings = get_settings()
+    path, sha256 = await spool_upload(
+        file, settings.upload_chunk_bytes, settings.upload_max_bytes, settings.upload_spool_dir
+    )
+    try:
+        extension = EXTENSIONS[settings.image_format.upper()]
+        name, thumbnail_name = f"{sha256}{extension}", f"{sha256}-thumb{extension}"
+
+        url, thumbnail_url = await asyncio.gather(
+            storage.find(name), storage.find(thumbnail_name)
+        )
+        if url is None or thumbnail_url is None:
+            image = await prepare_image(str(path))
+            url, thumbnail_url = await asyncio.gather(
+                storage.save(name, image.data, image.content_type),
+                storage.save(thumbnail_name, image.thumbnail, image.content_type),
+            )
+    finally:
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+    return StoredPhoto(sha256=sha256, url=url, thumbnail_url=thumbnail_url)
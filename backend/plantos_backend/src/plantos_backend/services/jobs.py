@@ -0,0 +1,400 @@
+"""Background job queue for slow work such as photo diagnoses.
+
+Endpoints enqueue a ``Job`` and return its id immediately; a ``JobRunner``
+started with the app pulls jobs off the queue with bounded concurrency and
+records their result, which clients poll via ``GET /jobs/{job_id}``.
+
+``MemoryJobQueue`` keeps everything in process. ``SqliteJobQueue`` persists jobs
+so they survive restarts and can be shared by every worker process on a host.
+While a job runs, its runner refreshes ``updated_at`` every
+``job_heartbeat_seconds``; every runner periodically re-queues jobs whose
+heartbeat is older than ``job_stale_seconds`` (their worker crashed), and
+fails them instead once they have been claimed ``job_max_attempts`` times. A
+runner whose job was re-queued under it cancels the handler, and results are
+only recorded while the claim is still current, so a re-run is never
+overwritten by the run it replaced.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol
+
+from plantos_backend.models import Job, JobStatus
+from plantos_backend.settings import AppSettings, get_settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class JobQueue(Protocol):
+    async def enqueue(self, job: Job) -> Job:
+        ...
+
+    async def claim(self) -> Job:
+        """Wait for the next queued job and mark it running."""
+        ...
+
+    async def update(self, job: Job) -> None:
+        ...
+
+    async def finish(self, job: Job) -> bool:
+        """Record a finished run; ``False`` (and nothing written) if the claim was lost."""
+        ...
+
+    async def heartbeat(self, job: Job) -> bool:
+        """Refresh a running job's ``updated_at``; ``False`` if it is no longer running."""
+        ...
+
+    async def requeue_stale(self, stale_seconds: float, max_attempts: int = 3) -> int:
+        """Return running jobs without a heartbeat for ``stale_seconds`` to the queue.
+
+        Jobs already claimed ``max_attempts`` times are marked failed instead.
+        """
+        ...
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        ...
+
+
+class MemoryJobQueue:
+    """In-process queue; keeps the most recent ``max_jobs`` jobs for status lookups."""
+
+    def __init__(self, max_jobs: int = 10_000) -> None:
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._pending: asyncio.Queue[str] | None = None
+
+    @property
+    def pending(self) -> asyncio.Queue[str]:
+        if self._pending is None:
+            self._pending = asyncio.Queue()
+        return self._pending
+
+    async def enqueue(self, job: Job) -> Job:
+        self._jobs[job.id] = job
+        self._trim()
+        self.pending.put_nowait(job.id)
+        return job
+
+    async def claim(self) -> Job:
+        while True:
+            job = self._jobs.get(await self.pending.get())
+            if job is not None and job.status == JobStatus.queued:
+                job.status = JobStatus.running
+                job.attempts += 1
+                job.updated_at = datetime.now(timezone.utc)
+                return job
+
+    async def update(self, job: Job) -> None:
+        job.updated_at = datetime.now(timezone.utc)
+        self._jobs[job.id] = job
+
+    async def finish(self, job: Job) -> bool:
+        # Runs are never re-queued here (see requeue_stale), so the claim always holds.
+        await self.update(job)
+        return True
+
+    async def heartbeat(self, job: Job) -> bool:
+        if job.status != JobStatus.running:
+            return False
+        job.updated_at = datetime.now(timezone.utc)
+        return True
+
+    async def requeue_stale(self, stale_seconds: float, max_attempts: int = 3) -> int:
+        # Jobs run in this process, so a crash takes the queue down with them.
+        return 0
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _trim(self) -> None:
+        # Evict the oldest finished jobs first; unfinished ones are never dropped.
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            for job_id in [job.id for job in self._jobs.values() if job.finished][:excess]:
+                del self._jobs[job_id]
+
+
+class SqliteJobQueue:
+    """Durable queue in a SQLite file; workers claim jobs with a conditional UPDATE."""
+
+    def __init__(self, path: str, poll_interval: float = 0.5) -> None:
+        self.path = path
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "created_at TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at, id)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _write(self, job: Job) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO jobs (id, status, created_at, data) VALUES (?, ?, ?, ?)",
+                (job.id, job.status.value, job.created_at.isoformat(), job.model_dump_json()),
+            )
+
+    def _claim_next(self) -> Optional[Job]:
+        connection = self._connection()
+        while True:
+            row = connection.execute(
+                "SELECT id, data FROM jobs WHERE status = ? ORDER BY created_at, id LIMIT 1",
+                (JobStatus.queued.value,),
+            ).fetchone()
+            if row is None:
+                return None
+            job = Job.model_validate_json(row[1])
+            job.status = JobStatus.running
+            job.attempts += 1
+            job.updated_at = datetime.now(timezone.utc)
+            # Status, attempts and heartbeat land in one statement, so the reaper
+            # never sees a running job with the previous run's ``updated_at``.
+            with connection:
+                claimed = connection.execute(
+                    "UPDATE jobs SET status = ?, data = ? WHERE id = ? AND status = ?",
+                    (job.status.value, job.model_dump_json(), job.id, JobStatus.queued.value),
+                ).rowcount
+            if claimed:
+                return job
+            # Another worker claimed it first; try the next one.
+
+    def _finish(self, job: Job) -> bool:
+        job.updated_at = datetime.now(timezone.utc)
+        # Only while this run's claim stands: same attempt and still running.
+        with self._connection() as connection:
+            return bool(
+                connection.execute(
+                    "UPDATE jobs SET status = ?, data = ? WHERE id = ? AND status = ? "
+                    "AND json_extract(data, '$.attempts') = ?",
+                    (
+                        job.status.value,
+                        job.model_dump_json(),
+                        job.id,
+                        JobStatus.running.value,
+                        job.attempts,
+                    ),
+                ).rowcount
+            )
+
+    def _heartbeat(self, job: Job) -> bool:
+        job.updated_at = datetime.now(timezone.utc)
+        with self._connection() as connection:
+            return bool(
+                connection.execute(
+                    "UPDATE jobs SET data = ? WHERE id = ? AND status = ? "
+                    "AND json_extract(data, '$.attempts') = ?",
+                    (job.model_dump_json(), job.id, JobStatus.running.value, job.attempts),
+                ).rowcount
+            )
+
+    def _requeue_stale(self, stale_seconds: float, max_attempts: int) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+        connection = self._connection()
+        rows = connection.execute(
+            "SELECT id, data FROM jobs WHERE status = ?", (JobStatus.running.value,)
+        ).fetchall()
+        requeued = 0
+        for job_id, data in rows:
+            job = Job.model_validate_json(data)
+            if job.updated_at >= cutoff:
+                continue
+            if job.attempts >= max_attempts:
+                job.status = JobStatus.failed
+                job.error = f"Worker lost the job on each of {job.attempts} attempts"
+            else:
+                job.status = JobStatus.queued
+            # Compare-and-swap on the stored row: a heartbeat or completion that
+            # landed since the SELECT changed ``data`` and keeps the job.
+            with connection:
+                requeued += connection.execute(
+                    "UPDATE jobs SET status = ?, data = ? WHERE id = ? AND status = ? AND data = ?",
+                    (
+                        job.status.value,
+                        job.model_dump_json(),
+                        job_id,
+                        JobStatus.running.value,
+                        data,
+                    ),
+                ).rowcount
+        return requeued
+
+    async def enqueue(self, job: Job) -> Job:
+        await asyncio.to_thread(self._write, job)
+        return job
+
+    async def claim(self) -> Job:
+        while True:
+            job = await asyncio.to_thread(self._claim_next)
+            if job is not None:
+                return job
+            await asyncio.sleep(self.poll_interval)
+
+    async def update(self, job: Job) -> None:
+        job.updated_at = datetime.now(timezone.utc)
+        await asyncio.to_thread(self._write, job)
+
+    async def finish(self, job: Job) -> bool:
+        return await asyncio.to_thread(self._finish, job)
+
+    async def heartbeat(self, job: Job) -> bool:
+        return await asyncio.to_thread(self._heartbeat, job)
+
+    async def requeue_stale(self, stale_seconds: float, max_attempts: int = 3) -> int:
+        return await asyncio.to_thread(self._requeue_stale, stale_seconds, max_attempts)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        row = await asyncio.to_thread(
+            lambda: self._connection()
+            .execute("SELECT data FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return Job.model_validate_json(row[0]) if row else None
+
+
+class JobRunner:
+    """Runs queued jobs on ``concurrency`` worker tasks using per-kind handlers.
+
+    Running jobs send a heartbeat every ``heartbeat_seconds``, and the runner
+    re-queues jobs whose heartbeat is older than ``stale_seconds`` just as often,
+    giving up on a job once it has been claimed ``max_attempts`` times. Queue
+    errors are logged and retried after ``retry_seconds``.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 4,
+        heartbeat_seconds: float = 30,
+        stale_seconds: float = 120,
+        max_attempts: int = 3,
+        retry_seconds: float = 1.0,
+    ) -> None:
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work(), name=f"job-worker-{index}")
+                for index in range(self.concurrency)
+            ]
+            self._workers.append(asyncio.create_task(self._reap(), name="job-reaper"))
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                await self.run(await self.queue.claim())
+            except Exception:
+                # A transient queue error (e.g. a locked database) must not retire the worker.
+                logger.exception("Job worker failed; retrying")
+                await asyncio.sleep(self.retry_seconds)
+
+    async def _reap(self) -> None:
+        while True:
+            try:
+                requeued = await self.queue.requeue_stale(self.stale_seconds, self.max_attempts)
+                if requeued:
+                    logger.warning("Re-queued %d stale jobs", requeued)
+            except Exception:
+                logger.exception("Re-queueing stale jobs failed")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    async def _heartbeat(self, job: Job, work: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                alive = await self.queue.heartbeat(job)
+            except Exception:
+                logger.exception("Heartbeat for job %s failed", job.id)
+                continue
+            if not alive:
+                logger.warning("Job %s was re-queued under its runner; cancelling it", job.id)
+                work.cancel()
+                return
+
+    async def run(self, job: Job) -> Job:
+        handler = self.handlers.get(job.kind)
+        work = asyncio.create_task(self._handle(handler, job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, work))
+        try:
+            await work
+        except asyncio.CancelledError:
+            if not work.cancelled() or asyncio.current_task().cancelling():
+                raise
+            # The heartbeat cancelled a run whose job now belongs to another claim.
+            return job
+        finally:
+            heartbeat.cancel()
+            work.cancel()
+            await asyncio.gather(heartbeat, work, return_exceptions=True)
+        if not await self.queue.finish(job):
+            logger.warning("Job %s finished after its claim was lost; result dropped", job.id)
+        return job
+
+    async def _handle(self, handler: JobHandler | None, job: Job) -> None:
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind: {job.kind}")
+            job.result = await handler(job.payload)
+            job.status = JobStatus.succeeded
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            job.status = JobStatus.failed
+            job.error = str(exc) or type(exc).__name__
+
+
+_job_queue: JobQueue | None = None
+
+
+def create_job_queue(settings: AppSettings) -> JobQueue:
+    backend = settings.job_queue_backend.lower()
+    if backend == "memory":
+        return MemoryJobQueue()
+    if backend == "sqlite":
+        return SqliteJobQueue(settings.job_queue_path)
+    raise ValueError(f"Unknown job queue backend: {settings.job_queue_backend}")
+
+
+def get_job_queue() -> JobQueue:
+    """Return the shared job queue, creating it on first use."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = create_job_queue(get_settings())
+    return _job_queue
+
+
+def set_job_queue(queue: JobQueue | None) -> None:
+    """Replace the shared queue (``None`` resets to the configured backend)."""
+    global _job_queue
+    _job_queue = queue
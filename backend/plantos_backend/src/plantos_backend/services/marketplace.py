@@ -10,56 +10,58 @@ from plantos_backend.schemas.marketplace import (
     OrderCreate,
     OrderUpdate,
 )
-from plantos_backend.storage.memory import memory_store
+from plantos_backend.storage import get_store
+from plantos_backend.storage.indexes import IndexKey
 
 
 def create_listing(payload: ListingCreate, provenance: list[str] | None = None) -> Listing:
     listing = Listing(**payload.model_dump(), provenance=provenance or [])
-    memory_store.listings[listing.id] = listing
-    return listing
+    return get_store().put_listing(listing)
 
 
-def list_listings(status: ListingStatus | None = None) -> List[Listing]:
-    listings = list(memory_store.listings.values())
-    if status:
-        listings = [listing for listing in listings if listing.status == status]
-    return listings
+def list_listings(
+    status: ListingStatus | None = None,
+    after: IndexKey | None = None,
+    limit: int | None = None,
+) -> List[Listing]:
+    return get_store().list_listings(status, after=after, limit=limit)
 
 
 def update_listing(listing_id: str, payload: ListingUpdate) -> Listing:
-    listing = memory_store.listings.get(listing_id)
+    listing = get_store().get_listing(listing_id)
     if not listing:
         raise ValueError("Listing not found")
     listing = listing.model_copy(update=payload.model_dump(exclude_unset=True))
-    memory_store.listings[listing_id] = listing
-    return listing
+    return get_store().put_listing(listing)
 
 
 def create_order(payload: OrderCreate) -> Order:
-    listing = memory_store.listings.get(payload.listing_id)
+    listing = get_store().get_listing(payload.listing_id)
     if not listing:
         raise ValueError("Listing not found")
-    listing = listing.model_copy(update={"status": ListingStatus.reserved})
-    memory_store.listings[listing.id] = listing
+    listing = get_store().put_listing(
+        listing.model_copy(update={"status": ListingStatus.reserved})
+    )
     order = Order(
         listing_id=payload.listing_id,
         buyer_name=payload.buyer_name,
         total=listing.price,
         currency=listing.currency,
     )
-    memory_store.orders[order.id] = order
-    return order
+    return get_store().put_order(order)
+
+
+def list_orders(listing_id: str) -> List[Order]:
+    return get_store().orders_for_listing(listing_id)
 
 
 def update_order(order_id: str, payload: OrderUpdate) -> Order:
-    order = memory_store.orders.get(order_id)
+    order = get_store().get_order(order_id)
     if not order:
         raise ValueError("Order not found")
-    order = order.model_copy(update=payload.model_dump())
-    memory_store.orders[order_id] = order
+    order = get_store().put_order(order.model_copy(update=payload.model_dump()))
     if payload.status == OrderStatus.fulfilled:
-        listing = memory_store.listings.get(order.listing_id)
+        listing = get_store().get_listing(order.listing_id)
         if listing:
-            listing = listing.model_copy(update={"status": ListingStatus.sold})
-            memory_store.listings[listing.id] = listing
+            get_store().put_listing(listing.model_copy(update={"status": ListingStatus.sold}))
     return order
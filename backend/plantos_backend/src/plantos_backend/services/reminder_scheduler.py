@@ -0,0 +1,490 @@
+"""In-process scheduler that sends reminders as care tasks fall due.
+
+Upcoming tasks are kept in a min-heap keyed on when their reminder is due
+(``next_due_at`` minus the lead time), so the loop sleeps until exactly the next
+reminder instead of polling. Tasks written through ``PlantRepository`` are
+pushed onto the heap as they change, and the heap is reloaded from the store
+every lookahead period.
+
+Every worker runs the loop, but only the holder of the ``reminders`` lease
+sends. The lease must be shared by every worker: ``memory`` only covers one
+process, ``sqlite`` the workers on one host and ``firestore`` every host. The
+lease is renewed between send attempts, and a worker that loses it stops
+sending. The lease also stores a watermark: the due time up to which every
+reminder has been delivered or given up. A failed reminder holds the watermark
+back until it is retried, and a task written with a due time behind the
+watermark rewinds it, so the next tick sends that task's reminder too. A worker
+that takes over resumes from the watermark, and reminder ids are deterministic,
+so delivered reminders are not rebuilt. A reminder can still go out twice if
+one send call outlasts the lease, so keep ``reminder_lease_seconds`` well above
+a sender's timeout.
+
+Lease and store calls block, so the loop runs them with ``asyncio.to_thread``.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from plantos_backend.models import CareTask
+from plantos_backend.services.reminders import ReminderDispatcher, get_reminder_dispatcher
+from plantos_backend.settings import AppSettings
+from plantos_backend.storage import get_store
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "reminders"
+# Sorts after every real id, so a watermark key excludes tasks due exactly at it.
+_AFTER_ALL_IDS = "\uffff"
+
+
+@dataclass
+class Lease:
+    name: str
+    owner: str
+    expires_at: float
+    watermark: Optional[datetime] = None
+    # Lowest due time written behind the watermark since the last advance.
+    rewound_to: Optional[datetime] = None
+
+    @property
+    def resume_from(self) -> Optional[datetime]:
+        """Where the next scan starts: the watermark, or lower if a write rewound it."""
+        if self.watermark is None or self.rewound_to is None:
+            return self.watermark
+        return min(self.watermark, self.rewound_to)
+
+
+class LeaseStore(Protocol):
+    def acquire(self, name: str, owner: str, ttl_seconds: float) -> Optional[Lease]:
+        """Take or renew ``name`` for ``owner``; ``None`` while someone else holds it."""
+        ...
+
+    def advance(self, name: str, owner: str, watermark: datetime) -> bool:
+        """Record progress; ``False`` if ``owner`` no longer holds the lease.
+
+        A pending rewind caps the new watermark and is then cleared, so a task
+        written behind the watermark during a tick is scanned on the next one.
+        """
+        ...
+
+    def rewind(self, name: str, watermark: datetime) -> None:
+        """Keep the watermark at or below ``watermark``, whoever holds the lease."""
+        ...
+
+    def release(self, name: str, owner: str) -> None:
+        ...
+
+
+def _watermark_text(watermark: datetime) -> str:
+    # Fixed-width UTC text, so stored watermarks compare in time order.
+    return watermark.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _watermark(text: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(text) if text else None
+
+
+class MemoryLeaseStore:
+    """Leases for a single process."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+        self._leases: Dict[str, Lease] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, name: str, owner: str, ttl_seconds: float) -> Optional[Lease]:
+        now = self.clock()
+        with self._lock:
+            lease = self._leases.get(name)
+            if lease is not None and lease.owner != owner and lease.expires_at > now:
+                return None
+            watermark = lease.watermark if lease is not None else None
+            rewound_to = lease.rewound_to if lease is not None else None
+            self._leases[name] = Lease(name, owner, now + ttl_seconds, watermark, rewound_to)
+            return Lease(name, owner, now + ttl_seconds, watermark, rewound_to)
+
+    def advance(self, name: str, owner: str, watermark: datetime) -> bool:
+        with self._lock:
+            lease = self._leases.get(name)
+            if lease is None or lease.owner != owner:
+                return False
+            if lease.rewound_to is not None:
+                watermark = min(watermark, lease.rewound_to)
+            lease.watermark, lease.rewound_to = watermark, None
+            return True
+
+    def rewind(self, name: str, watermark: datetime) -> None:
+        with self._lock:
+            lease = self._leases.get(name)
+            if lease is not None and (lease.rewound_to is None or lease.rewound_to > watermark):
+                lease.rewound_to = watermark
+
+    def release(self, name: str, owner: str) -> None:
+        with self._lock:
+            lease = self._leases.get(name)
+            if lease is not None and lease.owner == owner:
+                lease.expires_at = 0.0
+
+
+class SqliteLeaseStore:
+    """Leases in a SQLite file shared by every worker on a host."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.clock = clock
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, watermark TEXT, rewound_to TEXT)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def acquire(self, name: str, owner: str, ttl_seconds: float) -> Optional[Lease]:
+        now = self.clock()
+        with self._connection() as connection:
+            # Insert if new, otherwise take over only if we hold it or it has expired.
+            claimed = connection.execute(
+                "INSERT OR IGNORE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                (name, owner, now + ttl_seconds),
+            ).rowcount or connection.execute(
+                "UPDATE leases SET owner = ?, expires_at = ? "
+                "WHERE name = ? AND (owner = ? OR expires_at <= ?)",
+                (owner, now + ttl_seconds, name, owner, now),
+            ).rowcount
+            if not claimed:
+                return None
+            watermark, rewound_to = connection.execute(
+                "SELECT watermark, rewound_to FROM leases WHERE name = ?", (name,)
+            ).fetchone()
+        return Lease(name, owner, now + ttl_seconds, _watermark(watermark), _watermark(rewound_to))
+
+    def advance(self, name: str, owner: str, watermark: datetime) -> bool:
+        text = _watermark_text(watermark)
+        with self._connection() as connection:
+            return bool(
+                connection.execute(
+                    "UPDATE leases SET watermark = min(?, coalesce(rewound_to, ?)), "
+                    "rewound_to = NULL WHERE name = ? AND owner = ?",
+                    (text, text, name, owner),
+                ).rowcount
+            )
+
+    def rewind(self, name: str, watermark: datetime) -> None:
+        text = _watermark_text(watermark)
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE leases SET rewound_to = ? "
+                "WHERE name = ? AND (rewound_to IS NULL OR rewound_to > ?)",
+                (text, name, text),
+            )
+
+    def release(self, name: str, owner: str) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE leases SET expires_at = 0 WHERE name = ? AND owner = ?", (name, owner)
+            )
+
+
+class FirestoreLeaseStore:
+    """Leases as Firestore documents, updated in transactions, shared by every host."""
+
+    def __init__(
+        self, client: Any, collection: str = "leases", clock: Callable[[], float] = time.time
+    ) -> None:
+        from google.cloud import firestore
+
+        self.client = client
+        self.collection = collection
+        self.clock = clock
+        self._transactional = firestore.transactional
+
+    def _update(
+        self, name: str, change: Callable[[Optional[Dict[str, Any]]], Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        # Read and write in one transaction; Firestore retries it on contention.
+        reference = self.client.collection(self.collection).document(name)
+
+        def run(transaction: Any) -> Optional[Dict[str, Any]]:
+            snapshot = reference.get(transaction=transaction)
+            updated = change(snapshot.to_dict() if snapshot.exists else None)
+            if updated is not None:
+                transaction.set(reference, updated)
+            return updated
+
+        return self._transactional(run)(self.client.transaction())
+
+    def acquire(self, name: str, owner: str, ttl_seconds: float) -> Optional[Lease]:
+        now = self.clock()
+
+        def take(current: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if current and current["owner"] != owner and current["expires_at"] > now:
+                return None
+            return {
+                **(current or {"watermark": None, "rewound_to": None}),
+                "owner": owner,
+                "expires_at": now + ttl_seconds,
+            }
+
+        lease = self._update(name, take)
+        if lease is None:
+            return None
+        return Lease(
+            name,
+            owner,
+            lease["expires_at"],
+            _watermark(lease["watermark"]),
+            _watermark(lease.get("rewound_to")),
+        )
+
+    def advance(self, name: str, owner: str, watermark: datetime) -> bool:
+        text = _watermark_text(watermark)
+
+        def move(current: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if not current or current["owner"] != owner:
+                return None
+            rewound_to = current.get("rewound_to")
+            return {
+                **current,
+                "watermark": min(text, rewound_to) if rewound_to else text,
+                "rewound_to": None,
+            }
+
+        return self._update(name, move) is not None
+
+    def rewind(self, name: str, watermark: datetime) -> None:
+        text = _watermark_text(watermark)
+
+        def lower(current: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if not current or (current.get("rewound_to") and current["rewound_to"] <= text):
+                return None
+            return {**current, "rewound_to": text}
+
+        self._update(name, lower)
+
+    def release(self, name: str, owner: str) -> None:
+        def expire(current: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if not current or current["owner"] != owner:
+                return None
+            return {**current, "expires_at": 0.0}
+
+        self._update(name, expire)
+
+
+def create_lease_store(settings: AppSettings) -> LeaseStore:
+    backend = settings.reminder_lease_backend.lower()
+    if backend == "memory":
+        return MemoryLeaseStore()
+    if backend == "sqlite":
+        return SqliteLeaseStore(settings.reminder_lease_path)
+    if backend == "firestore":
+        from plantos_backend.storage.firestore import get_firestore_client
+
+        return FirestoreLeaseStore(get_firestore_client())
+    raise ValueError(f"Unknown lease backend: {settings.reminder_lease_backend}")
+
+
+class ReminderScheduler:
+    """Sleeps until the next reminder is due, then dispatches everything due."""
+
+    def __init__(
+        self,
+        leases: LeaseStore,
+        dispatcher: ReminderDispatcher | None = None,
+        owner: str | None = None,
+        lead: timedelta = timedelta(0),
+        lookahead: timedelta = timedelta(hours=1),
+        lease_seconds: float = 30,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.leases = leases
+        self.dispatcher = dispatcher
+        self.owner = owner or uuid.uuid4().hex
+        self.lead = lead
+        self.lookahead = lookahead
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self._heap: List[Tuple[datetime, str]] = []
+        self._reload_at: Optional[datetime] = None
+        self._renewed_at: Optional[datetime] = None
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+
+    def next_wake(self) -> Optional[datetime]:
+        return self._heap[0][0] if self._heap else None
+
+    def push(self, tasks: Iterable[CareTask]) -> None:
+        """Schedule wake-ups for ``tasks`` due within the lookahead."""
+        horizon = self.clock() + self.lookahead
+        for task in tasks:
+            wake_at = task.next_due_at - self.lead
+            if wake_at <= horizon:
+                heapq.heappush(self._heap, (wake_at, task.id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def notify(self, tasks: Iterable[CareTask]) -> None:
+        """Thread-safe ``push`` (and ``rewind`` for late tasks) for writers outside the loop."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        tasks = list(tasks)
+        self._loop.call_soon_threadsafe(self.push, tasks)
+        # The watermark never passes now + lead, so only tasks due by then can be behind it.
+        cutoff = self.clock() + self.lead
+        late = [task for task in tasks if task.next_due_at <= cutoff]
+        if late:
+            asyncio.run_coroutine_threadsafe(self.rewind(late), self._loop)
+
+    async def rewind(self, tasks: Iterable[CareTask]) -> None:
+        """Rewind the shared watermark below ``tasks`` so the next tick sends them."""
+        watermark = min(task.next_due_at for task in tasks) - timedelta(microseconds=1)
+        await asyncio.to_thread(self.leases.rewind, LEASE_NAME, watermark)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def reload(self) -> None:
+        # Overdue tasks need no wake-up: the next tick's watermark range covers them.
+        now = self.clock()
+        upcoming = await asyncio.to_thread(
+            get_store().tasks_due,
+            until=now + self.lead + self.lookahead,
+            after=(now + self.lead, _AFTER_ALL_IDS),
+        )
+        self._heap = []
+        self.push(upcoming)
+        self._reload_at = now + self.lookahead
+
+    async def tick(self) -> List[str]:
+        """Pop due wake-ups and, if this worker holds the lease, send what is due.
+
+        Returns the ids of the reminders delivered.
+        """
+        now = self.clock()
+        if self._reload_at is None or now >= self._reload_at:
+            await self.reload()
+        while self._heap and self._heap[0][0] <= now:
+            heapq.heappop(self._heap)
+
+        lease = await asyncio.to_thread(
+            self.leases.acquire, LEASE_NAME, self.owner, self.lease_seconds
+        )
+        if lease is None:
+            return []
+        self._renewed_at = now
+        cutoff = now + self.lead
+        resume_from = lease.resume_from
+        if resume_from is None:
+            # A first run starts from now rather than sending every overdue reminder.
+            await asyncio.to_thread(self.leases.advance, LEASE_NAME, self.owner, cutoff)
+            return []
+        if cutoff <= resume_from:
+            return []
+        tasks = await asyncio.to_thread(
+            get_store().tasks_due, until=cutoff, after=(resume_from, _AFTER_ALL_IDS)
+        )
+        delivered: List[str] = []
+        watermark = cutoff
+        if tasks:
+            dispatcher = self.dispatcher or get_reminder_dispatcher()
+            built = await asyncio.to_thread(dispatcher.build, tasks)
+            reminders = await dispatcher.dispatch(built, keep_going=self._renew)
+            delivered = [reminder.id for reminder in reminders if reminder.delivered_at]
+            unsettled = await asyncio.to_thread(dispatcher.unsettled, tasks)
+            if unsettled:
+                # Stop just short of the first reminder still to send, so it is retried.
+                watermark = min(task.next_due_at for task in unsettled) - timedelta(microseconds=1)
+        if watermark > resume_from:
+            # A rewind that lands while dispatching caps this advance, so it is not lost.
+            await asyncio.to_thread(self.leases.advance, LEASE_NAME, self.owner, watermark)
+        return delivered
+
+    async def _renew(self) -> bool:
+        """Keep the lease while dispatching; ``False`` once another worker holds it."""
+        now = self.clock()
+        if self._renewed_at is not None and now - self._renewed_at < timedelta(
+            seconds=self.lease_seconds / 3
+        ):
+            return True
+        lease = await asyncio.to_thread(
+            self.leases.acquire, LEASE_NAME, self.owner, self.lease_seconds
+        )
+        if lease is None:
+            logger.warning("Lost the reminder lease while dispatching; stopping")
+            return False
+        self._renewed_at = now
+        return True
+
+    def seconds_until_next(self) -> float:
+        """Sleep until the next wake-up, but renew the lease and reload in time."""
+        now = self.clock()
+        deadlines = [now + timedelta(seconds=self.lease_seconds / 2)]
+        if self._heap:
+            deadlines.append(self._heap[0][0])
+        if self._reload_at is not None:
+            deadlines.append(self._reload_at)
+        return max(0.0, (min(deadlines) - now).total_seconds())
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Reminder dispatch failed")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.seconds_until_next())
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        global _scheduler
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name="reminder-scheduler")
+            _scheduler = self
+
+    async def stop(self) -> None:
+        global _scheduler
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self.leases.release, LEASE_NAME, self.owner)
+        if _scheduler is self:
+            _scheduler = None
+
+
+_scheduler: ReminderScheduler | None = None
+
+
+def create_reminder_scheduler(settings: AppSettings) -> ReminderScheduler:
+    return ReminderScheduler(
+        create_lease_store(settings),
+        lead=timedelta(minutes=settings.reminder_lead_minutes),
+        lookahead=timedelta(minutes=settings.reminder_lookahead_minutes),
+        lease_seconds=settings.reminder_lease_seconds,
+    )
+
+
+def notify_task_changes(tasks: Iterable[CareTask]) -> None:
+    """Let the running scheduler know about new or rescheduled tasks."""
+    if _scheduler is not None:
+        _scheduler.notify(tasks)
@@ -1,30 +1,354 @@
-"""Reminder scheduling helpers."""
+"""Reminder scheduling and dispatch.
+
+Due tasks become ``Reminder`` records, one per configured channel, with ids
+derived from the task, channel and due time so re-dispatching a task never
+duplicates a reminder. ``ReminderDispatcher`` groups reminders per user and
+channel, sends them in batches through the channel's ``ReminderSender``
+(rate limited by a token bucket, retried with backoff) and persists the
+outcome: ``delivered_at`` on success, ``error`` once retries run out. A failed
+reminder is dispatched again no sooner than ``redispatch_seconds`` later, and
+given up once ``give_up_attempts`` send attempts have failed in total.
+
+``build`` and ``unsettled`` read plants and reminders in bulk and block on the
+store; async callers run them with ``asyncio.to_thread``, and outcomes are
+written off the event loop the same way.
+"""
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import logging
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Iterable, List
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+from plantos_backend.models import CareTask, Plant, Reminder, ReminderChannel
+from plantos_backend.settings import AppSettings, get_settings
+from plantos_backend.storage import get_store
 
-from plantos_backend.models import CareTask
+logger = logging.getLogger(__name__)
+
+
+def due_cutoff(minutes: int = 120) -> datetime:
+    """Return the end of the reminder window starting now."""
+    return datetime.now(timezone.utc) + timedelta(minutes=minutes)
 
 
 def due_within(tasks: Iterable[CareTask], minutes: int = 120) -> List[CareTask]:
-    now = datetime.now(timezone.utc)
-    window = now + timedelta(minutes=minutes)
+    window = due_cutoff(minutes)
     return [task for task in tasks if task.next_due_at <= window]
 
 
-def enqueue_reminders(tasks: List[CareTask]) -> List[str]:
-    """
-    Stub for enqueuing push notifications.
-    In a real system, this would push to a queue or call Firebase Cloud Messaging.
-    Returns a list of reminder IDs generated.
-    """
-    reminder_ids = []
-    for task in tasks:
-        # In a real implementation, we would create a Reminder document here
-        # and send the notification.
-        # For now, we just simulate it.
-        print(f"Enqueuing reminder for task {task.id} (due {task.next_due_at})")
-        reminder_ids.append(f"rem_{task.id}")
-    return reminder_ids
+def reminder_id(task: CareTask, channel: ReminderChannel) -> str:
+    """Stable id for the reminder of ``task``'s current occurrence on ``channel``."""
+    source = f"{task.id}:{channel.value}:{task.next_due_at.isoformat()}"
+    return f"reminder_{hashlib.sha256(source.encode()).hexdigest()[:16]}"
+
+
+def _plants_for(tasks: Iterable[CareTask]) -> Dict[str, Plant]:
+    """The plants owning ``tasks``, fetched in one batched read."""
+    return {plant.id: plant for plant in get_store().get_plants(task.plant_id for task in tasks)}
+
+
+def _stored_reminders(
+    tasks: Iterable[CareTask], channels: Sequence[ReminderChannel]
+) -> Dict[str, Reminder]:
+    """Existing reminders for ``tasks`` on ``channels``, fetched in one batched read."""
+    ids = [reminder_id(task, channel) for task in tasks for channel in channels]
+    return {reminder.id: reminder for reminder in get_store().get_reminders(ids)}
+
+
+class ReminderSender(Protocol):
+    async def send(self, user_id: Optional[str], reminders: Sequence[Reminder]) -> None:
+        """Deliver one batch to one user; raise to have the batch retried."""
+        ...
+
+
+class LogSender:
+    """Writes reminders to the log; the default until a real provider is configured."""
+
+    def __init__(self, channel: ReminderChannel) -> None:
+        self.channel = channel
+
+    async def send(self, user_id: Optional[str], reminders: Sequence[Reminder]) -> None:
+        for reminder in reminders:
+            logger.info(
+                "Reminder %s via %s to %s for task %s (due %s)",
+                reminder.id,
+                self.channel.value,
+                user_id or "-",
+                reminder.task_id,
+                reminder.send_at.isoformat(),
+            )
+
+
+class FakeSender:
+    """Records batches in memory; fails the first ``failures`` calls."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.calls = 0
+        self.batches: List[Tuple[Optional[str], List[str]]] = []
+
+    async def send(self, user_id: Optional[str], reminders: Sequence[Reminder]) -> None:
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("fake sender failure")
+        self.batches.append((user_id, [reminder.id for reminder in reminders]))
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second with bursts of up to ``capacity``."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self._lock: asyncio.Lock | None = None
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await self.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class ReminderDispatcher:
+    """Builds, batches, sends and records reminders."""
+
+    def __init__(
+        self,
+        senders: Dict[ReminderChannel, ReminderSender],
+        channels: Sequence[ReminderChannel] = (ReminderChannel.push,),
+        batch_size: int = 100,
+        rate_per_second: float = 10.0,
+        burst: int = 20,
+        max_attempts: int = 3,
+        retry_seconds: float = 1.0,
+        redispatch_seconds: float = 300.0,
+        give_up_attempts: int = 9,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.senders = senders
+        self.channels = list(channels)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+        self.redispatch_seconds = redispatch_seconds
+        self.give_up_attempts = give_up_attempts
+        self.sleep = sleep
+        self.clock = clock
+        self.buckets = {
+            channel: TokenBucket(rate_per_second, burst, sleep=sleep) for channel in senders
+        }
+
+    def exhausted(self, reminder: Reminder) -> bool:
+        """Whether ``reminder`` has failed ``give_up_attempts`` times and will not be sent."""
+        return reminder.delivered_at is None and reminder.attempts >= self.give_up_attempts
+
+    def _due(self, reminder: Reminder, now: datetime) -> bool:
+        if reminder.delivered_at is not None or self.exhausted(reminder):
+            return False
+        if reminder.error is None:
+            return True
+        return now >= reminder.updated_at + timedelta(seconds=self.redispatch_seconds)
+
+    def build(self, tasks: Iterable[CareTask]) -> List[Reminder]:
+        """Reminders to send now for ``tasks``.
+
+        Muted plants, delivered and given-up reminders are skipped, as are failed
+        ones still waiting out ``redispatch_seconds``.
+        """
+        now = self.clock()
+        tasks = list(tasks)
+        plants = _plants_for(tasks)
+        stored = _stored_reminders(tasks, self.channels)
+        reminders = []
+        for task in tasks:
+            plant = plants.get(task.plant_id)
+            if plant is None or not plant.reminders_enabled:
+                continue
+            for channel in self.channels:
+                existing = stored.get(reminder_id(task, channel))
+                if existing is not None and not self._due(existing, now):
+                    continue
+                reminders.append(
+                    existing
+                    or Reminder(
+                        id=reminder_id(task, channel),
+                        task_id=task.id,
+                        plant_id=task.plant_id,
+                        user_id=plant.owner_id,
+                        send_at=task.next_due_at,
+                        channel=channel,
+                    )
+                )
+        return reminders
+
+    def unsettled(self, tasks: Iterable[CareTask]) -> List[CareTask]:
+        """Tasks with a reminder that is neither delivered nor given up yet."""
+        tasks = list(tasks)
+        plants = _plants_for(tasks)
+        stored = _stored_reminders(tasks, self.channels)
+        pending = []
+        for task in tasks:
+            plant = plants.get(task.plant_id)
+            if plant is None or not plant.reminders_enabled:
+                continue
+            for channel in self.channels:
+                existing = stored.get(reminder_id(task, channel))
+                if existing is None or not (
+                    existing.delivered_at is not None or self.exhausted(existing)
+                ):
+                    pending.append(task)
+                    break
+        return pending
+
+    async def dispatch(
+        self,
+        reminders: Sequence[Reminder],
+        keep_going: Callable[[], Awaitable[bool]] | None = None,
+    ) -> List[Reminder]:
+        """Send ``reminders`` and persist their outcome; returns them updated.
+
+        ``keep_going`` is checked before every send attempt; once it returns
+        ``False`` the remaining batches are left unsent and unrecorded.
+        """
+        groups: Dict[ReminderChannel, Dict[Optional[str], List[Reminder]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for reminder in reminders:
+            groups[reminder.channel][reminder.user_id].append(reminder)
+        await asyncio.gather(
+            *(
+                self._dispatch_channel(channel, users, keep_going)
+                for channel, users in groups.items()
+            )
+        )
+        return list(reminders)
+
+    async def _dispatch_channel(
+        self,
+        channel: ReminderChannel,
+        users: Dict[Optional[str], List[Reminder]],
+        keep_going: Callable[[], Awaitable[bool]] | None,
+    ) -> None:
+        sender = self.senders.get(channel)
+        for user_id, reminders in users.items():
+            for start in range(0, len(reminders), self.batch_size):
+                batch = reminders[start : start + self.batch_size]
+                if sender is None:
+                    error = f"No sender for channel: {channel.value}"
+                    await self._record(batch, attempts=self.max_attempts, error=error)
+                elif not await self._send(channel, sender, user_id, batch, keep_going):
+                    return
+
+    async def _send(
+        self,
+        channel: ReminderChannel,
+        sender: ReminderSender,
+        user_id: Optional[str],
+        batch: List[Reminder],
+        keep_going: Callable[[], Awaitable[bool]] | None = None,
+    ) -> bool:
+        """Send one batch with retries; ``False`` if ``keep_going`` stopped it."""
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            await self.buckets[channel].acquire()
+            if keep_going is not None and not await keep_going():
+                if attempt > 1:
+                    await self._record(batch, attempts=attempt - 1, error=error)
+                return False
+            try:
+                await sender.send(user_id, batch)
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+                logger.warning(
+                    "Sending %d %s reminders failed (attempt %d): %s",
+                    len(batch),
+                    channel.value,
+                    attempt,
+                    error,
+                )
+                if attempt < self.max_attempts:
+                    await self.sleep(self.retry_seconds * 2 ** (attempt - 1))
+                continue
+            await self._record(batch, attempts=attempt, delivered_at=self.clock())
+            return True
+        await self._record(batch, attempts=self.max_attempts, error=error)
+        return True
+
+    async def _record(
+        self,
+        batch: List[Reminder],
+        attempts: int,
+        delivered_at: Optional[datetime] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        now = self.clock()
+        for reminder in batch:
+            reminder.attempts += attempts
+            reminder.delivered_at = delivered_at
+            reminder.error = error
+            reminder.updated_at = now
+        await asyncio.to_thread(get_store().put_reminders, batch)
+
+
+def create_reminder_dispatcher(settings: AppSettings) -> ReminderDispatcher:
+    channels = [ReminderChannel(channel) for channel in settings.reminder_channels]
+    return ReminderDispatcher(
+        senders={channel: LogSender(channel) for channel in ReminderChannel},
+        channels=channels,
+        batch_size=settings.reminder_batch_size,
+        rate_per_second=settings.reminder_rate_per_second,
+        burst=settings.reminder_burst,
+        max_attempts=settings.reminder_max_attempts,
+        retry_seconds=settings.reminder_retry_seconds,
+        redispatch_seconds=settings.reminder_redispatch_seconds,
+        give_up_attempts=settings.reminder_give_up_attempts,
+    )
+
+
+_dispatcher: ReminderDispatcher | None = None
+
+
+def get_reminder_dispatcher() -> ReminderDispatcher:
+    """Return the shared dispatcher, creating it on first use."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = create_reminder_dispatcher(get_settings())
+    return _dispatcher
+
+
+def set_reminder_dispatcher(dispatcher: ReminderDispatcher | None) -> None:
+    """Replace the shared dispatcher (``None`` resets to the configured senders)."""
+    global _dispatcher
+    _dispatcher = dispatcher
+
 
+async def enqueue_reminders(tasks: List[CareTask]) -> List[str]:
+    """Send reminders for ``tasks``; returns the ids of the reminders delivered."""
+    dispatcher = get_reminder_dispatcher()
+    reminders = await dispatcher.dispatch(await asyncio.to_thread(dispatcher.build, tasks))
+    return [reminder.id for reminder in reminders if reminder.delivered_at is not None]
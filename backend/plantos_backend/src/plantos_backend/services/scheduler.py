@@ -1,26 +1,146 @@
 """Care schedule orchestration."""
 from __future__ import annotations
 
+import statistics
 from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Iterable, List
-
-from plantos_backend.models import CareSignal, CareTask, Plant, TimelineEvent, CollectionNames
-from datetime import timezone
-
-
-def forecast_tasks(plants: Iterable[Plant], horizon_days: int = 7) -> List[CareTask]:
-    """Generate care tasks for all plants within the time horizon."""
-    tasks: List[CareTask] = []
-    for plant in plants:
-        for task in (
-            CareTask.from_plant(plant, signal)
-            for signal in (CareSignal.watering, CareSignal.feeding)
-        ):
-            window = datetime.now(task.next_due_at.tzinfo) + timedelta(days=horizon_days)
-            if task.next_due_at <= window:
-                tasks.append(task)
-    return tasks
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from plantos_backend.models import CareSignal, CareTask, Plant, TimelineEvent
+from plantos_backend.models.common import generate_id
+from plantos_backend.settings import get_settings
+
+# Column order of the per-signal arrays in ``ScheduleTable``.
+FORECAST_SIGNALS: Tuple[CareSignal, ...] = (CareSignal.watering, CareSignal.feeding)
+_DAY = np.timedelta64(1, "D").astype("timedelta64[us]")
+
+
+def _to_datetime64(value: datetime) -> np.datetime64:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "us")
+
+
+@dataclass
+class Forecast:
+    """Due occurrences as parallel arrays, ordered by plant, signal and occurrence."""
+
+    plant_index: np.ndarray
+    signal_index: np.ndarray
+    due_at: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.due_at)
+
+
+@dataclass
+class ScheduleTable:
+    """Columnar view of plant care cadences for bulk forecasting.
+
+    ``intervals`` and ``anchors`` have one column per ``FORECAST_SIGNALS`` entry;
+    an anchor is when that signal was last completed (UTC, ``datetime64[us]``),
+    and occurrences fall every ``interval`` days after it. Build the table once
+    and forecast from it repeatedly; only surviving rows become ``CareTask``s.
+    """
+
+    plant_ids: List[str]
+    intervals: np.ndarray
+    anchors: np.ndarray
+
+    @classmethod
+    def from_plants(
+        cls,
+        plants: Iterable[Plant],
+        last_completed: Mapping[Tuple[str, CareSignal], datetime] | None = None,
+        now: datetime | None = None,
+    ) -> "ScheduleTable":
+        """Columns for ``plants``; signals never completed are anchored at ``now``."""
+        plants = list(plants)
+        plant_ids = [plant.id for plant in plants]
+        intervals = np.array(
+            [(plant.watering_interval_days, plant.feeding_interval_days) for plant in plants],
+            dtype=np.int64,
+        ).reshape(len(plants), len(FORECAST_SIGNALS))
+        anchors = np.full(intervals.shape, _to_datetime64(now or datetime.now(timezone.utc)))
+        rows = {plant_id: row for row, plant_id in enumerate(plant_ids)} if last_completed else {}
+        for (plant_id, signal), completed_at in (last_completed or {}).items():
+            row = rows.get(plant_id)
+            if row is None:
+                continue
+            anchors[row, FORECAST_SIGNALS.index(signal)] = _to_datetime64(completed_at)
+        return cls(plant_ids=plant_ids, intervals=intervals, anchors=anchors)
+
+    def forecast(self, until: datetime, repeat: bool = False) -> Forecast:
+        """The next occurrence due by ``until`` (every one with ``repeat``).
+
+        The first occurrence of a signal is included even if already overdue. A
+        zero interval is due at its anchor and never repeats.
+        """
+        intervals = self.intervals.ravel()
+        anchors = self.anchors.ravel()
+        step = intervals * _DAY
+        first = anchors + step
+        valid = first <= _to_datetime64(until)
+        counts = valid.astype(np.int64)
+        if repeat:
+            repeating = valid & (intervals > 0)
+            span = _to_datetime64(until) - first[repeating]
+            counts[repeating] = span // step[repeating] + 1
+
+        rows = np.repeat(np.arange(intervals.size), counts)
+        offsets = np.cumsum(counts) - counts
+        occurrence = np.arange(rows.size) - np.repeat(offsets, counts) + 1
+        due_at = anchors[rows] + occurrence * step[rows]
+        plant_index, signal_index = np.divmod(rows, len(FORECAST_SIGNALS))
+        return Forecast(plant_index=plant_index, signal_index=signal_index, due_at=due_at)
+
+    def materialize(self, forecast: Forecast) -> List[CareTask]:
+        """Build ``CareTask`` objects for the forecast rows only."""
+        now = datetime.now(timezone.utc)
+        cadences = self.intervals[forecast.plant_index, forecast.signal_index].tolist()
+        return [
+            CareTask.model_construct(
+                id=generate_id("task"),
+                created_at=now,
+                updated_at=now,
+                plant_id=self.plant_ids[plant],
+                signal=FORECAST_SIGNALS[signal],
+                cadence_days=cadence,
+                next_due_at=due_at.replace(tzinfo=timezone.utc),
+                priority="medium",
+                duration_minutes=5,
+            )
+            for plant, signal, cadence, due_at in zip(
+                forecast.plant_index.tolist(),
+                forecast.signal_index.tolist(),
+                cadences,
+                forecast.due_at.astype("datetime64[us]").tolist(),
+                strict=True,
+            )
+        ]
+
+
+def forecast_tasks(
+    plants: Iterable[Plant] | ScheduleTable,
+    horizon_days: int = 7,
+    repeat: bool = False,
+) -> List[CareTask]:
+    """Generate care tasks for all plants within the time horizon.
+
+    Accepts plants or a prebuilt ``ScheduleTable``; due times are computed in
+    bulk and only tasks inside the horizon are created. Each signal yields its
+    next occurrence; pass ``repeat=True`` for every occurrence in the horizon.
+    """
+    now = datetime.now(timezone.utc)
+    if isinstance(plants, ScheduleTable):
+        table = plants
+    else:
+        table = ScheduleTable.from_plants(plants, now=now)
+    forecast = table.forecast(now + timedelta(days=horizon_days), repeat=repeat)
+    return table.materialize(forecast)
 
 
 def merge_tasks(tasks: Iterable[CareTask]) -> Dict[str, List[CareTask]]:
@@ -32,6 +152,159 @@ def merge_tasks(tasks: Iterable[CareTask]) -> Dict[str, List[CareTask]]:
     return dict(grouped)
 
 
+def tolerance_days(task: CareTask, max_shift_days: int) -> int:
+    """How far ``task`` may move either way: a quarter of its cadence, capped."""
+    return max(0, min(max_shift_days, task.cadence_days // 4))
+
+
+@dataclass
+class OptimizedSchedule:
+    """Tasks grouped by planned day (YYYY-MM-DD), with what the optimizer did."""
+
+    days: Dict[str, List[CareTask]] = field(default_factory=dict)
+    moved: int = 0
+    overloaded: int = 0
+
+    def load(self, day: str) -> int:
+        return sum(task.duration_minutes for task in self.days.get(day, []))
+
+
+_Window = Tuple[int, int, int, CareTask]
+
+
+def _pull_towards_due(
+    days: Dict[int, List[_Window]], capacity_minutes: int
+) -> Dict[int, List[_Window]]:
+    """Move each task to the open day nearest its due date that has room.
+
+    Tasks are first re-placed from scratch onto the open days, tightest windows
+    first. If one no longer fits, the planned days are kept and tasks only move
+    one at a time onto a closer day with room, so capacity is never broken.
+    """
+    windows = sorted(
+        (window for group in days.values() for window in group),
+        key=lambda window: (window[0] - window[2], window[1]),
+    )
+    load = dict.fromkeys(days, 0)
+    placed: Dict[int, List[_Window]] = defaultdict(list)
+    for window in windows:
+        latest, due, earliest, task = window
+        room = capacity_minutes - task.duration_minutes
+        fits = [day for day in range(earliest, latest + 1) if day in load and load[day] <= room]
+        if not fits:
+            break
+        best = min(fits, key=lambda day: abs(day - due))
+        load[best] += task.duration_minutes
+        placed[best].append(window)
+    else:
+        return placed
+
+    load = {day: sum(window[3].duration_minutes for window in group) for day, group in days.items()}
+    placed = defaultdict(list)
+    for day, group in days.items():
+        for window in group:
+            latest, due, earliest, task = window
+            target = day
+            for candidate in sorted(range(earliest, latest + 1), key=lambda d: abs(d - due)):
+                if abs(candidate - due) >= abs(day - due):
+                    break
+                if 0 < load.get(candidate, 0) <= capacity_minutes - task.duration_minutes:
+                    load[day] -= task.duration_minutes
+                    load[candidate] += task.duration_minutes
+                    target = candidate
+                    break
+            placed[target].append(window)
+    return placed
+
+
+def optimize_tasks(
+    tasks: Iterable[CareTask],
+    capacity_minutes: int | None = None,
+    max_shift_days: int | None = None,
+    today: date | None = None,
+) -> OptimizedSchedule:
+    """Shift tasks within their tolerance so care lands on fewer, capacity-bounded days.
+
+    Greedy interval stabbing: tasks are taken by latest allowed day; each joins
+    the fullest already-planned day in its window that still has room, otherwise
+    opens the latest free day in its window so later tasks can join it. Tasks
+    that fit nowhere go to the least loaded day and are counted as overloaded.
+    Each resulting group then slides, within the windows of all its tasks, to
+    the free day closest to their median due date, and finally every task moves
+    back to the open day nearest its own due date that still has room. That
+    last pass never opens a day or breaks capacity, so grouping only moves the
+    tasks it has to: when every day is already busy nothing is shifted beyond
+    what capacity forces. Tasks are never pulled before ``today``.
+    O(n log n + n * window).
+    """
+    settings = get_settings()
+    if capacity_minutes is None:
+        capacity_minutes = settings.schedule_capacity_minutes
+    if max_shift_days is None:
+        max_shift_days = settings.schedule_max_shift_days
+    today = (today or datetime.now(timezone.utc).date()).toordinal()
+
+    # Days are handled as ordinals: integer arithmetic keeps the inner loop cheap.
+    windows = []
+    for task in tasks:
+        due = task.next_due_at.date().toordinal()
+        tolerance = tolerance_days(task, max_shift_days)
+        earliest, latest = max(due - tolerance, today), due + tolerance
+        if earliest > latest:
+            # Overdue beyond its tolerance: leave it where it is.
+            earliest = latest = due
+        windows.append((latest, due, earliest, task))
+    windows.sort(key=lambda window: window[:3])
+
+    load: Dict[int, int] = defaultdict(int)
+    planned: Dict[int, List[_Window]] = defaultdict(list)
+    result = OptimizedSchedule()
+    for window in windows:
+        latest, due, earliest, task = window
+        room = capacity_minutes - task.duration_minutes
+        free = [day for day in range(earliest, latest + 1) if load[day] <= room]
+        open_days = [day for day in free if load[day]]
+        if open_days:
+            best = max(open_days, key=lambda day: (load[day], -abs(day - due)))
+        elif free:
+            best = free[-1]
+        else:
+            best = min(range(earliest, latest + 1), key=lambda day: (load[day], abs(day - due)))
+            result.overloaded += 1
+        load[best] += task.duration_minutes
+        planned[best].append(window)
+
+    days: Dict[int, List[_Window]] = {}
+    for day in sorted(planned):
+        group = planned[day]
+        lower = max(earliest for _, _, earliest, _ in group)
+        upper = min(latest for latest, _, _, _ in group)
+        target = min(max(statistics.median_low([due for _, due, _, _ in group]), lower), upper)
+        days[day if target in days or target in planned else target] = group
+
+    placed = _pull_towards_due(days, capacity_minutes)
+    for day in sorted(placed):
+        tasks_on_day = []
+        for _, due, _, task in placed[day]:
+            if day != due:
+                task = task.model_copy(
+                    update={"next_due_at": task.next_due_at + timedelta(days=day - due)}
+                )
+                result.moved += 1
+            tasks_on_day.append(task)
+        result.days[date.fromordinal(day).isoformat()] = tasks_on_day
+    return result
+
+
+def plant_cadence(plant: Plant, signal: CareSignal) -> int | None:
+    """The plant's interval in days for ``signal``, or ``None`` if it has none."""
+    if signal == CareSignal.watering:
+        return plant.watering_interval_days
+    if signal == CareSignal.feeding:
+        return plant.feeding_interval_days
+    return None
+
+
 def generate_initial_tasks(plant: Plant) -> List[CareTask]:
     """Create initial care tasks for a new plant."""
     tasks = []
@@ -59,16 +332,12 @@ def complete_task(task: CareTask, plant: Plant) -> tuple[CareTask, TimelineEvent
     # Ideally we use the completion time as the reference for the next interval
     # to avoid "drift" where you water late but the next one is still scheduled early.
     now = datetime.now(timezone.utc)
-    
-    if task.signal == CareSignal.watering:
-        next_due = now + timedelta(days=plant.watering_interval_days)
-    elif task.signal == CareSignal.feeding:
-        next_due = now + timedelta(days=plant.feeding_interval_days)
-    else:
+    cadence = plant_cadence(plant, task.signal)
+    if cadence is None:
         # Default fallback
-        next_due = now + timedelta(days=7)
+        cadence = 7
+    next_due = now + timedelta(days=cadence)
 
-    updated_task = task.model_copy(update={"next_due_at": next_due})
-    
-    return updated_task, event
+    updated_task = task.model_copy(update={"next_due_at": next_due, "cadence_days": cadence})
 
+    return updated_task, event
@@ -1,21 +1,89 @@
-"""Storage service for handling file uploads."""
+"""Storage service for handling file uploads.
+
+Uploads are streamed: ``spool_upload`` copies a photo to a temporary file one
+``upload_chunk_bytes`` chunk at a time, hashing it on the way and enforcing
+``upload_max_bytes``, with every blocking write in a worker thread so the event
+loop keeps serving other requests. Image processing then reads the spooled file
+and stores only its re-encoded outputs through ``StorageService.save``.
+
+Stored objects are content-addressed (named after the SHA-256 of the original
+upload), so storing a photo that is already present is a no-op.
+
+One service (and, in production, one pooled GCS client) is created at startup
+and handed to endpoints through the ``Storage`` dependency.
+"""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
-import shutil
+import tempfile
 from pathlib import Path
-from typing import Protocol
+from typing import Annotated, Any, AsyncIterator, Optional, Protocol, Tuple
 from uuid import uuid4
 
-from fastapi import UploadFile
+from fastapi import Depends, UploadFile
 
-from plantos_backend.settings import get_settings
+from plantos_backend.settings import AppSettings, get_settings
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds ``upload_max_bytes``."""
 
 
 class StorageService(Protocol):
-    def upload_image(self, file: UploadFile) -> str:
+    async def save(self, name: str, data: bytes, content_type: str) -> str:
         ...
 
+    async def find(self, name: str) -> Optional[str]:
+        """URL of the stored object called ``name``, or ``None`` if there is none."""
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+async def iter_chunks(
+    file: UploadFile, chunk_size: int, max_bytes: int, digest: Any = None
+) -> AsyncIterator[bytes]:
+    """Yield ``file`` in chunks, failing once more than ``max_bytes`` were read.
+
+    Each chunk is also fed to ``digest`` when one is given.
+    """
+    received = 0
+    while chunk := await file.read(chunk_size):
+        received += len(chunk)
+        if received > max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the {max_bytes} byte limit")
+        if digest is not None:
+            digest.update(chunk)
+        yield chunk
+
+
+async def spool_upload(
+    file: UploadFile, chunk_size: int, max_bytes: int, directory: str | None = None
+) -> Tuple[Path, str]:
+    """Stream ``file`` to a temporary file in ``directory``; returns its path and SHA-256.
+
+    The caller owns the file and must delete it. Nothing is left behind when the
+    upload fails or exceeds ``max_bytes``.
+    """
+    digest = hashlib.sha256()
+    handle, name = await asyncio.to_thread(
+        tempfile.mkstemp, suffix=".part", prefix=".upload-", dir=directory
+    )
+    path = Path(name)
+    buffer = os.fdopen(handle, "wb")
+    try:
+        async for chunk in iter_chunks(file, chunk_size, max_bytes, digest):
+            await asyncio.to_thread(buffer.write, chunk)
+        await asyncio.to_thread(buffer.close)
+    except BaseException:
+        buffer.close()
+        path.unlink(missing_ok=True)
+        raise
+    return path, digest.hexdigest()
+
 
 class LocalStorageService:
     """Stores files in a local directory."""
@@ -26,41 +94,93 @@ class LocalStorageService:
         # Ensure this directory is served statically if we want to view images,
         # but for now we just return the path.
 
-    def upload_image(self, file: UploadFile) -> str:
-        file_ext = Path(file.filename).suffix if file.filename else ".jpg"
-        filename = f"{uuid4()}{file_ext}"
-        file_path = self.upload_dir / filename
-        
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # Return absolute path for now, or a relative URL if we had a static mount.
-        # For the AI processing, absolute path is fine if running locally.
+    def _partial_path(self) -> Path:
+        return self.upload_dir / f".{uuid4()}.part"
+
+    async def save(self, name: str, data: bytes, content_type: str) -> str:
+        file_path = self.upload_dir / name
+        partial_path = self._partial_path()
+
+        def write() -> None:
+            if not file_path.exists():
+                partial_path.write_bytes(data)
+                _publish(partial_path, file_path)
+
+        await asyncio.to_thread(write)
         return str(file_path.absolute())
 
+    async def find(self, name: str) -> Optional[str]:
+        file_path = self.upload_dir / name
+        exists = await asyncio.to_thread(file_path.exists)
+        return str(file_path.absolute()) if exists else None
+
+    def close(self) -> None:
+        pass
+
 
 class GCSStorageService:
     """Stores files in Google Cloud Storage."""
-    
+
     def __init__(self, bucket_name: str):
         from google.cloud import storage
+
         self.client = storage.Client()
         self.bucket = self.client.bucket(bucket_name)
 
-    def upload_image(self, file: UploadFile) -> str:
-        file_ext = Path(file.filename).suffix if file.filename else ".jpg"
-        blob_name = f"uploads/{uuid4()}{file_ext}"
-        blob = self.bucket.blob(blob_name)
-        
-        blob.upload_from_file(file.file)
+    async def save(self, name: str, data: bytes, content_type: str) -> str:
+        blob = self.bucket.blob(f"uploads/{name}")
+
+        from google.api_core.exceptions import PreconditionFailed
+
+        def write() -> None:
+            # if_generation_match=0 only creates; an existing object is left as is.
+            try:
+                blob.upload_from_string(data, content_type=content_type, if_generation_match=0)
+            except PreconditionFailed:
+                pass
+
+        await asyncio.to_thread(write)
         return blob.public_url
 
+    async def find(self, name: str) -> Optional[str]:
+        blob = self.bucket.blob(f"uploads/{name}")
+        exists = await asyncio.to_thread(blob.exists)
+        return blob.public_url if exists else None
 
-def get_storage_service() -> StorageService:
-    settings = get_settings()
-    if settings.environment == "production":
-        # Assume bucket name is in settings or env
-        bucket_name = os.getenv("PLANTOS_STORAGE_BUCKET", "plantos-uploads")
-        return GCSStorageService(bucket_name)
+    def close(self) -> None:
+        """Release the client's pooled HTTP session."""
+        self.client.close()
+
+
+def _publish(partial_path: Path, file_path: Path) -> None:
+    """Move a finished upload into place unless identical content is already there."""
+    if file_path.exists():
+        partial_path.unlink()
     else:
-        return LocalStorageService()
+        os.replace(partial_path, file_path)
+
+
+_storage_service: StorageService | None = None
+
+
+def create_storage_service(settings: AppSettings) -> StorageService:
+    if settings.environment == "production":
+        return GCSStorageService(settings.storage_bucket)
+    return LocalStorageService(settings.upload_dir)
+
+
+def get_storage_service() -> StorageService:
+    """Return the shared storage service, creating it on first use."""
+    global _storage_service
+    if _storage_service is None:
+        _storage_service = create_storage_service(get_settings())
+    return _storage_service
+
+
+def set_storage_service(service: StorageService | None) -> None:
+    """Replace the shared service (``None`` resets to the configured one)."""
+    global _storage_service
+    _storage_service = service
+
+
+Storage = Annotated[StorageService, Depends(get_storage_service)]
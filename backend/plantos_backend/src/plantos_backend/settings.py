@@ -18,10 +18,103 @@ class AppSettings(BaseSettings):
     port: int = 8000
     cors_origins: List[str] = Field(default_factory=lambda: ["*"])
 
+    # Persistence: "memory", "sqlite" or "firestore". The Firestore client honours
+    # FIRESTORE_EMULATOR_HOST for local emulators.
+    storage_backend: str = "memory"
+    sqlite_path: str = "plantos.db"
+    firestore_project: str | None = None
+    firestore_database: str | None = None
+
+    # Photo uploads are streamed in chunks of upload_chunk_bytes to a temporary
+    # file in upload_spool_dir (default: the system temp dir); files larger than
+    # upload_max_bytes are rejected.
+    upload_dir: str = "uploads"
+    storage_bucket: str = "plantos-uploads"
+    upload_chunk_bytes: int = 1024 * 1024
+    upload_max_bytes: int = 25 * 1024 * 1024
+    upload_spool_dir: str | None = None
+    # Diagnosis photos are downscaled, re-encoded ("webp" or "jpeg") and
+    # thumbnailed in a process pool of image_workers (default: one per CPU).
+    image_max_edge: int = 1536
+    image_thumbnail_edge: int = 320
+    image_format: str = "webp"
+    image_quality: int = 80
+    image_workers: int | None = None
+
+    # Background jobs: "memory" or "sqlite" (durable, shared by workers on a host).
+    # Running jobs heartbeat every job_heartbeat_seconds; jobs silent for
+    # job_stale_seconds (their worker crashed) are re-queued, or failed once
+    # they have been claimed job_max_attempts times.
+    job_queue_backend: str = "memory"
+    job_queue_path: str = "jobs.db"
+    job_workers: int = 4
+    job_heartbeat_seconds: float = 30
+    job_stale_seconds: float = 120
+    job_max_attempts: int = 3
+
+    # Care calendar: recurring tasks are stored calendar_horizon_days ahead; days
+    # further out are computed per query. One query may span calendar_max_days.
+    calendar_horizon_days: int = 90
+    calendar_max_days: int = 366
+    # Schedule optimizer: tasks may move up to schedule_max_shift_days (at most a
+    # quarter of their cadence) to fill days up to schedule_capacity_minutes.
+    schedule_capacity_minutes: int = 120
+    schedule_max_shift_days: int = 2
+
+    # Reminders go out on reminder_channels ("push", "email", "sms") in batches of
+    # reminder_batch_size per user and channel. Each channel is limited to
+    # reminder_rate_per_second send calls (bursts of reminder_burst); failed
+    # batches are retried with exponential backoff up to reminder_max_attempts.
+    # A failed reminder is dispatched again after reminder_redispatch_seconds and
+    # given up after reminder_give_up_attempts failed attempts in total.
+    reminder_channels: List[str] = Field(default_factory=lambda: ["push"])
+    reminder_batch_size: int = 100
+    reminder_rate_per_second: float = 10.0
+    reminder_burst: int = 20
+    reminder_max_attempts: int = 3
+    reminder_retry_seconds: float = 1.0
+    reminder_redispatch_seconds: float = 300
+    reminder_give_up_attempts: int = 9
+    # The in-process reminder scheduler wakes when the next task falls due (minus
+    # reminder_lead_minutes). Only the worker holding the reminder lease sends, so
+    # enable it only with a lease every worker shares: "memory" (a single worker
+    # process), "sqlite" (workers on one host) or "firestore" (any number of hosts).
+    reminder_scheduler_enabled: bool = False
+    reminder_lead_minutes: int = 0
+    reminder_lookahead_minutes: int = 60
+    reminder_lease_backend: str = "memory"
+    reminder_lease_path: str = "leases.db"
+    reminder_lease_seconds: float = 30
+
     # AI Providers
     openai_api_key: str | None = None
     gemini_api_key: str | None = None
     default_ai_provider: str = "gemini"
+    # default_ai_provider="router" spreads calls over ai_router_providers by rolling
+    # latency; optionally hedge to the next provider after ai_hedge_after_seconds.
+    ai_router_providers: List[str] = Field(default_factory=lambda: ["gemini", "openai"])
+    ai_router_window: int = 100
+    ai_router_max_error_rate: float = 0.5
+    ai_hedge_after_seconds: float | None = None
+    ai_breaker_failures: int = 5
+    ai_breaker_cooldown_seconds: float = 30.0
+    # Upper bound on concurrent model calls fanned out by a single graph node.
+    ai_max_concurrency: int = 8
+    ai_variant_timeout_seconds: float = 20.0
+    # Connection pool shared by every HTTP-based chat model client.
+    ai_http_max_connections: int = 100
+    ai_http_max_keepalive_connections: int = 20
+    ai_http_keepalive_expiry_seconds: float = 30.0
+    ai_http_timeout_seconds: float = 60.0
+    # Use providers' native structured output; invalid replies get bounded repair turns.
+    ai_native_structured_output: bool = True
+    ai_structured_max_repairs: int = 1
+    # Graph response cache; set ai_cache_path to add a shared on-disk tier.
+    ai_cache_max_entries: int = 1024
+    ai_cache_ttl_seconds: float = 86400
+    ai_cache_path: str | None = None
+    # SQLite file persisting species care profiles learned during onboarding.
+    species_profile_path: str | None = None
 
     model_config = SettingsConfigDict(
         env_prefix="plantos_",
@@ -0,0 +1,40 @@
+"""Storage backends and the process-wide store accessor."""
+from __future__ import annotations
+
+from plantos_backend.settings import AppSettings, get_settings
+from plantos_backend.storage.base import DataStore
+from plantos_backend.storage.memory import memory_store
+
+_store: DataStore | None = None
+
+
+def create_store(settings: AppSettings) -> DataStore:
+    backend = settings.storage_backend.lower()
+    if backend == "memory":
+        return memory_store
+    if backend == "sqlite":
+        from plantos_backend.storage.sqlite import SqliteStore
+
+        return SqliteStore(settings.sqlite_path)
+    if backend == "firestore":
+        from plantos_backend.storage.firestore import FirestoreStore, get_firestore_client
+
+        return FirestoreStore(get_firestore_client())
+    raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
+
+
+def get_store() -> DataStore:
+    """Return the configured store, creating it on first use."""
+    global _store
+    if _store is None:
+        _store = create_store(get_settings())
+    return _store
+
+
+def set_store(store: DataStore | None) -> None:
+    """Override the active store (``None`` resets to the configured backend)."""
+    global _store
+    _store = store
+
+
+__all__ = ["DataStore", "create_store", "get_store", "set_store"]
@@ -0,0 +1,131 @@
+"""Storage backend interface shared by the memory and Firestore stores."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Protocol
+
+from plantos_backend.models import (
+    CareTask,
+    Listing,
+    ListingStatus,
+    Order,
+    Plant,
+    PropagationBatch,
+    Reminder,
+    TimelineEvent,
+)
+from plantos_backend.storage.indexes import IndexKey
+
+
+class DataStore(Protocol):
+    """Persistence operations used by repositories and services.
+
+    Ordered reads return ``(sort_key, id)``-ordered pages; ``after`` is the key of
+    the last item of the previous page.
+    """
+
+    def put_plant(self, plant: Plant) -> Plant:
+        ...
+
+    def get_plant(self, plant_id: str) -> Optional[Plant]:
+        ...
+
+    def get_plants(self, plant_ids: Iterable[str]) -> List[Plant]:
+        """Fetch several plants in one read; missing ids are skipped."""
+        ...
+
+    def remove_plant(self, plant_id: str) -> Optional[Plant]:
+        """Remove a plant together with its care tasks and timeline."""
+        ...
+
+    def list_plants(
+        self, after: IndexKey | None = None, limit: int | None = None
+    ) -> List[Plant]:
+        ...
+
+    def put_task(self, task: CareTask) -> CareTask:
+        ...
+
+    def put_tasks(self, tasks: Iterable[CareTask]) -> List[CareTask]:
+        """Write several tasks in one batch."""
+        ...
+
+    def get_task(self, task_id: str) -> Optional[CareTask]:
+        ...
+
+    def remove_task(self, task_id: str) -> Optional[CareTask]:
+        ...
+
+    def tasks_for_plant(self, plant_id: str) -> List[CareTask]:
+        ...
+
+    def tasks_due(
+        self,
+        until: datetime | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[CareTask]:
+        ...
+
+    def put_reminders(self, reminders: Iterable[Reminder]) -> List[Reminder]:
+        """Write several reminders in one batch."""
+        ...
+
+    def get_reminder(self, reminder_id: str) -> Optional[Reminder]:
+        ...
+
+    def get_reminders(self, reminder_ids: Iterable[str]) -> List[Reminder]:
+        """Fetch several reminders in one read; missing ids are skipped."""
+        ...
+
+    def reminders_for_task(self, task_id: str) -> List[Reminder]:
+        """Reminders for a task ordered by ``send_at``."""
+        ...
+
+    def add_event(self, event: TimelineEvent) -> TimelineEvent:
+        ...
+
+    def list_events(
+        self,
+        plant_id: str,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[TimelineEvent]:
+        ...
+
+    def put_batch(self, batch: PropagationBatch) -> PropagationBatch:
+        ...
+
+    def get_batch(self, batch_id: str) -> Optional[PropagationBatch]:
+        ...
+
+    def list_batches(
+        self,
+        mother_plant_id: str | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[PropagationBatch]:
+        ...
+
+    def put_listing(self, listing: Listing) -> Listing:
+        ...
+
+    def get_listing(self, listing_id: str) -> Optional[Listing]:
+        ...
+
+    def list_listings(
+        self,
+        status: ListingStatus | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[Listing]:
+        ...
+
+    def put_order(self, order: Order) -> Order:
+        ...
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        ...
+
+    def orders_for_listing(self, listing_id: str) -> List[Order]:
+        ...
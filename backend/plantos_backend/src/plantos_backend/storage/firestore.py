@@ -0,0 +1,272 @@
+"""Firestore-backed store sharing one client per process.
+
+Filtered, ordered reads (``where`` + ``order_by`` on another field) need the
+matching composite indexes in the Firestore project. Point
+``FIRESTORE_EMULATOR_HOST`` at a local emulator to run without credentials.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from plantos_backend.models import (
+    CareTask,
+    CollectionNames,
+    Listing,
+    ListingStatus,
+    Order,
+    Plant,
+    PropagationBatch,
+    Reminder,
+    TimelineEvent,
+    TimestampedModel,
+)
+from plantos_backend.settings import get_settings
+from plantos_backend.storage.indexes import IndexKey
+
+ModelT = TypeVar("ModelT", bound=TimestampedModel)
+
+# Firestore rejects write batches with more than 500 operations.
+MAX_BATCH_WRITES = 500
+
+
+@lru_cache
+def get_firestore_client() -> firestore.Client:
+    """Return the process-wide Firestore client (one gRPC channel per process)."""
+    settings = get_settings()
+    return firestore.Client(
+        project=settings.firestore_project,
+        database=settings.firestore_database,
+    )
+
+
+def _to_value(value: Any) -> Any:
+    # Datetimes stay native so range queries compare timestamps; enums become their values.
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _to_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_to_value(item) for item in value]
+    return value
+
+
+def _to_document(model: TimestampedModel) -> Dict[str, Any]:
+    return _to_value(model.model_dump())
+
+
+class FirestoreStore:
+    """``DataStore`` implementation persisting each model in its ``collection_name``."""
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    def _collection(self, model: Type[TimestampedModel]) -> Any:
+        return self.client.collection(CollectionNames(model.collection_name).value)
+
+    def _put(self, model: ModelT) -> ModelT:
+        self._collection(type(model)).document(model.id).set(_to_document(model))
+        return model
+
+    def _get(self, model: Type[ModelT], item_id: str) -> Optional[ModelT]:
+        snapshot = self._collection(model).document(item_id).get()
+        if not snapshot.exists:
+            return None
+        return model.model_validate(snapshot.to_dict())
+
+    def _get_many(self, model: Type[ModelT], item_ids: Iterable[str]) -> List[ModelT]:
+        # One batched ``get_all`` round trip instead of a read per document.
+        collection = self._collection(model)
+        references = [collection.document(item_id) for item_id in dict.fromkeys(item_ids)]
+        if not references:
+            return []
+        return [
+            model.model_validate(snapshot.to_dict())
+            for snapshot in self.client.get_all(references)
+            if snapshot.exists
+        ]
+
+    def _page(
+        self,
+        model: Type[ModelT],
+        query: Any,
+        sort_field: str,
+        after: IndexKey | None,
+        limit: int | None,
+    ) -> List[ModelT]:
+        query = query.order_by(sort_field).order_by("id")
+        if after is not None:
+            query = query.start_after({sort_field: after[0], "id": after[1]})
+        if limit is not None:
+            query = query.limit(limit)
+        return [model.model_validate(snapshot.to_dict()) for snapshot in query.stream()]
+
+    def _write_batched(self, operations: Iterable[tuple[str, Any, Dict[str, Any] | None]]) -> None:
+        batch = self.client.batch()
+        pending = 0
+        for action, reference, data in operations:
+            if action == "set":
+                batch.set(reference, data)
+            else:
+                batch.delete(reference)
+            pending += 1
+            if pending == MAX_BATCH_WRITES:
+                batch.commit()
+                batch = self.client.batch()
+                pending = 0
+        if pending:
+            batch.commit()
+
+    def _references_where(self, model: Type[TimestampedModel], field: str, value: Any) -> List[Any]:
+        # Projection query: only document references are needed, not the payloads.
+        query = self._collection(model).where(filter=FieldFilter(field, "==", value))
+        return [snapshot.reference for snapshot in query.select(["id"]).stream()]
+
+    def put_plant(self, plant: Plant) -> Plant:
+        return self._put(plant)
+
+    def get_plant(self, plant_id: str) -> Optional[Plant]:
+        return self._get(Plant, plant_id)
+
+    def get_plants(self, plant_ids: Iterable[str]) -> List[Plant]:
+        return self._get_many(Plant, plant_ids)
+
+    def remove_plant(self, plant_id: str) -> Optional[Plant]:
+        plant = self.get_plant(plant_id)
+        if not plant:
+            return None
+        tasks = self._references_where(CareTask, "plant_id", plant_id)
+        references = [
+            *(
+                reminder
+                for task in tasks
+                for reminder in self._references_where(Reminder, "task_id", task.id)
+            ),
+            *tasks,
+            *self._references_where(TimelineEvent, "plant_id", plant_id),
+            self._collection(Plant).document(plant_id),
+        ]
+        self._write_batched(("delete", reference, None) for reference in references)
+        return plant
+
+    def list_plants(
+        self, after: IndexKey | None = None, limit: int | None = None
+    ) -> List[Plant]:
+        return self._page(Plant, self._collection(Plant), "created_at", after, limit)
+
+    def put_task(self, task: CareTask) -> CareTask:
+        return self._put(task)
+
+    def put_tasks(self, tasks: Iterable[CareTask]) -> List[CareTask]:
+        tasks = list(tasks)
+        collection = self._collection(CareTask)
+        self._write_batched(
+            ("set", collection.document(task.id), _to_document(task)) for task in tasks
+        )
+        return tasks
+
+    def get_task(self, task_id: str) -> Optional[CareTask]:
+        return self._get(CareTask, task_id)
+
+    def remove_task(self, task_id: str) -> Optional[CareTask]:
+        task = self.get_task(task_id)
+        if task:
+            self._collection(CareTask).document(task_id).delete()
+        return task
+
+    def tasks_for_plant(self, plant_id: str) -> List[CareTask]:
+        query = self._collection(CareTask).where(filter=FieldFilter("plant_id", "==", plant_id))
+        return self._page(CareTask, query, "next_due_at", None, None)
+
+    def tasks_due(
+        self,
+        until: datetime | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[CareTask]:
+        query = self._collection(CareTask)
+        if until is not None:
+            query = query.where(filter=FieldFilter("next_due_at", "<=", until))
+        return self._page(CareTask, query, "next_due_at", after, limit)
+
+    def put_reminders(self, reminders: Iterable[Reminder]) -> List[Reminder]:
+        reminders = list(reminders)
+        collection = self._collection(Reminder)
+        self._write_batched(
+            ("set", collection.document(reminder.id), _to_document(reminder))
+            for reminder in reminders
+        )
+        return reminders
+
+    def get_reminder(self, reminder_id: str) -> Optional[Reminder]:
+        return self._get(Reminder, reminder_id)
+
+    def get_reminders(self, reminder_ids: Iterable[str]) -> List[Reminder]:
+        return self._get_many(Reminder, reminder_ids)
+
+    def reminders_for_task(self, task_id: str) -> List[Reminder]:
+        query = self._collection(Reminder).where(filter=FieldFilter("task_id", "==", task_id))
+        return self._page(Reminder, query, "send_at", None, None)
+
+    def add_event(self, event: TimelineEvent) -> TimelineEvent:
+        return self._put(event)
+
+    def list_events(
+        self,
+        plant_id: str,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[TimelineEvent]:
+        query = self._collection(TimelineEvent).where(
+            filter=FieldFilter("plant_id", "==", plant_id)
+        )
+        return self._page(TimelineEvent, query, "created_at", after, limit)
+
+    def put_batch(self, batch: PropagationBatch) -> PropagationBatch:
+        return self._put(batch)
+
+    def get_batch(self, batch_id: str) -> Optional[PropagationBatch]:
+        return self._get(PropagationBatch, batch_id)
+
+    def list_batches(
+        self,
+        mother_plant_id: str | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[PropagationBatch]:
+        query = self._collection(PropagationBatch)
+        if mother_plant_id:
+            query = query.where(filter=FieldFilter("mother_plant_id", "==", mother_plant_id))
+        return self._page(PropagationBatch, query, "created_at", after, limit)
+
+    def put_listing(self, listing: Listing) -> Listing:
+        return self._put(listing)
+
+    def get_listing(self, listing_id: str) -> Optional[Listing]:
+        return self._get(Listing, listing_id)
+
+    def list_listings(
+        self,
+        status: ListingStatus | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[Listing]:
+        query = self._collection(Listing)
+        if status:
+            query = query.where(filter=FieldFilter("status", "==", status.value))
+        return self._page(Listing, query, "created_at", after, limit)
+
+    def put_order(self, order: Order) -> Order:
+        return self._put(order)
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        return self._get(Order, order_id)
+
+    def orders_for_listing(self, listing_id: str) -> List[Order]:
+        query = self._collection(Order).where(filter=FieldFilter("listing_id", "==", listing_id))
+        return self._page(Order, query, "created_at", None, None)
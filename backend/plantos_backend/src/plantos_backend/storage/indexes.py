@@ -0,0 +1,114 @@
+"""Index structures maintained alongside the in-memory store.
+
+Sync routes run on FastAPI's threadpool, so every read and write of an index holds the
+index's lock: a bisect followed by a list insert or delete is not atomic.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+IndexKey = Tuple[Any, str]
+
+
+class SortedIndex:
+    """Keeps ``(sort_key, item_id)`` pairs ordered so range scans cost O(log n + k)."""
+
+    def __init__(self) -> None:
+        self._entries: List[IndexKey] = []
+        self._keys: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._keys
+
+    def add(self, item_id: str, sort_key: Any) -> None:
+        with self._lock:
+            if item_id in self._keys:
+                if self._keys[item_id] == sort_key:
+                    return
+                self.discard(item_id)
+            insort(self._entries, (sort_key, item_id))
+            self._keys[item_id] = sort_key
+
+    def discard(self, item_id: str) -> None:
+        with self._lock:
+            if item_id not in self._keys:
+                return
+            entry = (self._keys.pop(item_id), item_id)
+            position = bisect_left(self._entries, entry)
+            del self._entries[position]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+
+    def range(
+        self,
+        upper: Any = None,
+        after: Optional[IndexKey] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Return ids whose sort key is ``<= upper``, starting strictly after ``after``."""
+        with self._lock:
+            start = bisect_right(self._entries, after) if after is not None else 0
+            end = (
+                bisect_right(self._entries, upper, key=itemgetter(0))
+                if upper is not None
+                else len(self._entries)
+            )
+            if limit is not None:
+                end = min(end, start + limit)
+            return [item_id for _, item_id in self._entries[start:end]]
+
+
+class GroupIndex:
+    """Maps a grouping key to an ordered index of the ids filed under it."""
+
+    def __init__(self) -> None:
+        self._groups: Dict[Any, SortedIndex] = {}
+        self._membership: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._membership
+
+    def add(self, item_id: str, group_key: Any, sort_key: Any) -> None:
+        with self._lock:
+            if item_id in self._membership and self._membership[item_id] != group_key:
+                self.discard(item_id)
+            self._groups.setdefault(group_key, SortedIndex()).add(item_id, sort_key)
+            self._membership[item_id] = group_key
+
+    def discard(self, item_id: str) -> None:
+        with self._lock:
+            if item_id not in self._membership:
+                return
+            group_key = self._membership.pop(item_id)
+            group = self._groups[group_key]
+            group.discard(item_id)
+            if not len(group):
+                del self._groups[group_key]
+
+    def get(
+        self,
+        group_key: Any,
+        after: Optional[IndexKey] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        with self._lock:
+            group = self._groups.get(group_key)
+            if group is None:
+                return []
+            return group.range(after=after, limit=limit)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._groups.clear()
+            self._membership.clear()
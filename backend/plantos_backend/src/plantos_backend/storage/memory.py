@@ -1,18 +1,28 @@
 """In-memory data store used for prototypes and tests."""
 from __future__ import annotations
 
+import threading
+from bisect import bisect_right, insort
 from dataclasses import dataclass, field
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
 
 from plantos_backend.models import (
     CareTask,
     Experiment,
     Listing,
+    ListingStatus,
     Order,
     Plant,
     PropagationBatch,
+    Reminder,
     TimelineEvent,
 )
+from plantos_backend.storage.indexes import GroupIndex, IndexKey, SortedIndex
+
+
+def _event_key(event: TimelineEvent) -> IndexKey:
+    return event.created_at, event.id
 
 
 @dataclass
@@ -24,6 +34,218 @@ class MemoryStore:
     propagations: Dict[str, PropagationBatch] = field(default_factory=dict)
     listings: Dict[str, Listing] = field(default_factory=dict)
     orders: Dict[str, Order] = field(default_factory=dict)
+    reminders: Dict[str, Reminder] = field(default_factory=dict)
+
+    # Care tasks ordered by ``next_due_at`` for due-window queries.
+    tasks_by_due: SortedIndex = field(default_factory=SortedIndex)
+    # Collections ordered by ``created_at`` for keyset pagination.
+    plants_by_created: SortedIndex = field(default_factory=SortedIndex)
+    batches_by_created: SortedIndex = field(default_factory=SortedIndex)
+    listings_by_created: SortedIndex = field(default_factory=SortedIndex)
+    # Secondary indexes for the common filtered reads.
+    tasks_by_plant: GroupIndex = field(default_factory=GroupIndex)
+    batches_by_mother: GroupIndex = field(default_factory=GroupIndex)
+    listings_by_status: GroupIndex = field(default_factory=GroupIndex)
+    orders_by_listing: GroupIndex = field(default_factory=GroupIndex)
+    reminders_by_task: GroupIndex = field(default_factory=GroupIndex)
+    # One write touches a primary dict and several indexes; sync routes run on the
+    # threadpool, so every operation holds this lock to stay atomic for readers.
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    def put_plant(self, plant: Plant) -> Plant:
+        with self._lock:
+            self.plants[plant.id] = plant
+            self.plants_by_created.add(plant.id, plant.created_at)
+            return plant
+
+    def get_plant(self, plant_id: str) -> Optional[Plant]:
+        with self._lock:
+            return self.plants.get(plant_id)
+
+    def get_plants(self, plant_ids: Iterable[str]) -> List[Plant]:
+        with self._lock:
+            return [self.plants[plant_id] for plant_id in plant_ids if plant_id in self.plants]
+
+    def remove_plant(self, plant_id: str) -> Optional[Plant]:
+        with self._lock:
+            removed = self.plants.pop(plant_id, None)
+            if removed:
+                self.plants_by_created.discard(plant_id)
+                for task_id in self.tasks_by_plant.get(plant_id):
+                    self.remove_task(task_id)
+                self.timeline.pop(plant_id, None)
+            return removed
+
+    def list_plants(
+        self, after: IndexKey | None = None, limit: int | None = None
+    ) -> List[Plant]:
+        with self._lock:
+            plant_ids = self.plants_by_created.range(after=after, limit=limit)
+            return [self.plants[plant_id] for plant_id in plant_ids]
+
+    def put_task(self, task: CareTask) -> CareTask:
+        with self._lock:
+            self.care_tasks[task.id] = task
+            self.tasks_by_due.add(task.id, task.next_due_at)
+            self.tasks_by_plant.add(task.id, task.plant_id, task.next_due_at)
+            return task
+
+    def put_tasks(self, tasks: Iterable[CareTask]) -> List[CareTask]:
+        with self._lock:
+            return [self.put_task(task) for task in tasks]
+
+    def get_task(self, task_id: str) -> Optional[CareTask]:
+        with self._lock:
+            return self.care_tasks.get(task_id)
+
+    def remove_task(self, task_id: str) -> Optional[CareTask]:
+        with self._lock:
+            self.tasks_by_due.discard(task_id)
+            self.tasks_by_plant.discard(task_id)
+            for reminder_id in self.reminders_by_task.get(task_id):
+                self.reminders_by_task.discard(reminder_id)
+                self.reminders.pop(reminder_id, None)
+            return self.care_tasks.pop(task_id, None)
+
+    def tasks_for_plant(self, plant_id: str) -> List[CareTask]:
+        with self._lock:
+            return [self.care_tasks[task_id] for task_id in self.tasks_by_plant.get(plant_id)]
+
+    def tasks_due(
+        self,
+        until: datetime | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[CareTask]:
+        """Return tasks ordered by due time, optionally bounded and paged."""
+        with self._lock:
+            task_ids = self.tasks_by_due.range(upper=until, after=after, limit=limit)
+            return [self.care_tasks[task_id] for task_id in task_ids]
+
+    def put_reminders(self, reminders: Iterable[Reminder]) -> List[Reminder]:
+        with self._lock:
+            stored = []
+            for reminder in reminders:
+                self.reminders[reminder.id] = reminder
+                self.reminders_by_task.add(reminder.id, reminder.task_id, reminder.send_at)
+                stored.append(reminder)
+            return stored
+
+    def get_reminder(self, reminder_id: str) -> Optional[Reminder]:
+        with self._lock:
+            return self.reminders.get(reminder_id)
+
+    def get_reminders(self, reminder_ids: Iterable[str]) -> List[Reminder]:
+        with self._lock:
+            return [
+                self.reminders[reminder_id]
+                for reminder_id in reminder_ids
+                if reminder_id in self.reminders
+            ]
+
+    def reminders_for_task(self, task_id: str) -> List[Reminder]:
+        with self._lock:
+            reminder_ids = self.reminders_by_task.get(task_id)
+            return [self.reminders[reminder_id] for reminder_id in reminder_ids]
+
+    def add_event(self, event: TimelineEvent) -> TimelineEvent:
+        with self._lock:
+            insort(self.timeline.setdefault(event.plant_id, []), event, key=_event_key)
+            return event
+
+    def list_events(
+        self,
+        plant_id: str,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[TimelineEvent]:
+        with self._lock:
+            events = self.timeline.get(plant_id, [])
+            start = bisect_right(events, after, key=_event_key) if after is not None else 0
+            end = start + limit if limit is not None else None
+            return events[start:end]
+
+    def put_batch(self, batch: PropagationBatch) -> PropagationBatch:
+        with self._lock:
+            self.propagations[batch.id] = batch
+            self.batches_by_created.add(batch.id, batch.created_at)
+            self.batches_by_mother.add(batch.id, batch.mother_plant_id, batch.created_at)
+            return batch
+
+    def get_batch(self, batch_id: str) -> Optional[PropagationBatch]:
+        with self._lock:
+            return self.propagations.get(batch_id)
+
+    def list_batches(
+        self,
+        mother_plant_id: str | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[PropagationBatch]:
+        with self._lock:
+            if mother_plant_id:
+                batch_ids = self.batches_by_mother.get(mother_plant_id, after=after, limit=limit)
+            else:
+                batch_ids = self.batches_by_created.range(after=after, limit=limit)
+            return [self.propagations[batch_id] for batch_id in batch_ids]
+
+    def put_listing(self, listing: Listing) -> Listing:
+        with self._lock:
+            self.listings[listing.id] = listing
+            self.listings_by_created.add(listing.id, listing.created_at)
+            self.listings_by_status.add(listing.id, listing.status, listing.created_at)
+            return listing
+
+    def get_listing(self, listing_id: str) -> Optional[Listing]:
+        with self._lock:
+            return self.listings.get(listing_id)
+
+    def list_listings(
+        self,
+        status: ListingStatus | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[Listing]:
+        with self._lock:
+            if status:
+                listing_ids = self.listings_by_status.get(status, after=after, limit=limit)
+            else:
+                listing_ids = self.listings_by_created.range(after=after, limit=limit)
+            return [self.listings[listing_id] for listing_id in listing_ids]
+
+    def put_order(self, order: Order) -> Order:
+        with self._lock:
+            self.orders[order.id] = order
+            self.orders_by_listing.add(order.id, order.listing_id, order.created_at)
+            return order
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        with self._lock:
+            return self.orders.get(order_id)
+
+    def orders_for_listing(self, listing_id: str) -> List[Order]:
+        with self._lock:
+            return [self.orders[order_id] for order_id in self.orders_by_listing.get(listing_id)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.plants.clear()
+            self.care_tasks.clear()
+            self.timeline.clear()
+            self.experiments.clear()
+            self.propagations.clear()
+            self.listings.clear()
+            self.orders.clear()
+            self.reminders.clear()
+            self.tasks_by_due.clear()
+            self.plants_by_created.clear()
+            self.batches_by_created.clear()
+            self.listings_by_created.clear()
+            self.tasks_by_plant.clear()
+            self.batches_by_mother.clear()
+            self.listings_by_status.clear()
+            self.orders_by_listing.clear()
+            self.reminders_by_task.clear()
 
 
 memory_store = MemoryStore()
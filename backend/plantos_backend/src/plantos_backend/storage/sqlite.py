@@ -0,0 +1,379 @@
+"""Embedded SQLite store for single-node deployments.
+
+Each model is stored as JSON next to the columns it is filtered or ordered by.
+Timestamps are kept as fixed-width UTC ISO strings so they sort lexically.
+The database runs in WAL mode so readers on other threads or worker processes
+never block the writer; every thread gets its own connection.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Type, TypeVar
+
+from plantos_backend.models import (
+    CareTask,
+    Listing,
+    ListingStatus,
+    Order,
+    Plant,
+    PropagationBatch,
+    Reminder,
+    TimelineEvent,
+    TimestampedModel,
+)
+from plantos_backend.storage.indexes import IndexKey
+
+ModelT = TypeVar("ModelT", bound=TimestampedModel)
+
+# Stay well under SQLite's bound-parameter limit in ``IN (...)`` reads.
+MAX_IN_PARAMS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plants (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plants_created ON plants (created_at, id);
+
+CREATE TABLE IF NOT EXISTS care_tasks (
+    id TEXT PRIMARY KEY,
+    plant_id TEXT NOT NULL,
+    next_due_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS care_tasks_due ON care_tasks (next_due_at, id);
+CREATE INDEX IF NOT EXISTS care_tasks_plant ON care_tasks (plant_id, next_due_at, id);
+
+CREATE TABLE IF NOT EXISTS timeline (
+    id TEXT PRIMARY KEY,
+    plant_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timeline_plant ON timeline (plant_id, created_at, id);
+
+CREATE TABLE IF NOT EXISTS propagations (
+    id TEXT PRIMARY KEY,
+    mother_plant_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS propagations_created ON propagations (created_at, id);
+CREATE INDEX IF NOT EXISTS propagations_mother
+    ON propagations (mother_plant_id, created_at, id);
+
+CREATE TABLE IF NOT EXISTS listings (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS listings_created ON listings (created_at, id);
+CREATE INDEX IF NOT EXISTS listings_status ON listings (status, created_at, id);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    listing_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_listing ON orders (listing_id, created_at, id);
+
+CREATE TABLE IF NOT EXISTS reminders (
+    id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    send_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reminders_task ON reminders (task_id, send_at, id);
+"""
+
+INSERT_PLANT = "INSERT OR REPLACE INTO plants (id, created_at, data) VALUES (?, ?, ?)"
+INSERT_TASK = (
+    "INSERT OR REPLACE INTO care_tasks (id, plant_id, next_due_at, data) VALUES (?, ?, ?, ?)"
+)
+INSERT_REMINDER = (
+    "INSERT OR REPLACE INTO reminders (id, task_id, send_at, data) VALUES (?, ?, ?, ?)"
+)
+INSERT_EVENT = (
+    "INSERT OR REPLACE INTO timeline (id, plant_id, created_at, data) VALUES (?, ?, ?, ?)"
+)
+INSERT_BATCH = (
+    "INSERT OR REPLACE INTO propagations (id, mother_plant_id, created_at, data) "
+    "VALUES (?, ?, ?, ?)"
+)
+INSERT_LISTING = (
+    "INSERT OR REPLACE INTO listings (id, status, created_at, data) VALUES (?, ?, ?, ?)"
+)
+INSERT_ORDER = (
+    "INSERT OR REPLACE INTO orders (id, listing_id, created_at, data) VALUES (?, ?, ?, ?)"
+)
+
+
+def _timestamp(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+class SqliteStore:
+    """``DataStore`` implementation backed by a single SQLite database file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, cached_statements=256)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _write(self, sql: str, params: Sequence) -> None:
+        with self._connection() as connection:
+            connection.execute(sql, params)
+
+    def _get(self, model: Type[ModelT], table: str, item_id: str) -> Optional[ModelT]:
+        row = self._connection().execute(
+            f"SELECT data FROM {table} WHERE id = ?", (item_id,)
+        ).fetchone()
+        return model.model_validate_json(row[0]) if row else None
+
+    def _get_many(self, model: Type[ModelT], table: str, item_ids: Iterable[str]) -> List[ModelT]:
+        item_ids = list(dict.fromkeys(item_ids))
+        found = []
+        for start in range(0, len(item_ids), MAX_IN_PARAMS):
+            chunk = item_ids[start : start + MAX_IN_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._connection().execute(
+                f"SELECT data FROM {table} WHERE id IN ({placeholders})", chunk
+            ).fetchall()
+            found.extend(model.model_validate_json(row[0]) for row in rows)
+        return found
+
+    def _select(
+        self,
+        model: Type[ModelT],
+        table: str,
+        sort_column: str,
+        where: Sequence[tuple[str, object]] = (),
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[ModelT]:
+        conditions = _conditions(where)
+        clauses = [f"{column} {comparison} ?" for column, comparison, _ in conditions]
+        params: list = [value for _, _, value in conditions]
+        if after is not None:
+            clauses.append(f"({sort_column}, id) > (?, ?)")
+            params.extend([_timestamp(after[0]), after[1]])
+        sql = f"SELECT data FROM {table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {sort_column}, id LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        rows = self._connection().execute(sql, params).fetchall()
+        return [model.model_validate_json(row[0]) for row in rows]
+
+    def put_plant(self, plant: Plant) -> Plant:
+        self._write(INSERT_PLANT, (plant.id, _timestamp(plant.created_at), plant.model_dump_json()))
+        return plant
+
+    def get_plant(self, plant_id: str) -> Optional[Plant]:
+        return self._get(Plant, "plants", plant_id)
+
+    def get_plants(self, plant_ids: Iterable[str]) -> List[Plant]:
+        return self._get_many(Plant, "plants", plant_ids)
+
+    def remove_plant(self, plant_id: str) -> Optional[Plant]:
+        plant = self.get_plant(plant_id)
+        if plant:
+            with self._connection() as connection:
+                connection.execute(
+                    "DELETE FROM reminders WHERE task_id IN "
+                    "(SELECT id FROM care_tasks WHERE plant_id = ?)",
+                    (plant_id,),
+                )
+                connection.execute("DELETE FROM care_tasks WHERE plant_id = ?", (plant_id,))
+                connection.execute("DELETE FROM timeline WHERE plant_id = ?", (plant_id,))
+                connection.execute("DELETE FROM plants WHERE id = ?", (plant_id,))
+        return plant
+
+    def list_plants(
+        self, after: IndexKey | None = None, limit: int | None = None
+    ) -> List[Plant]:
+        return self._select(Plant, "plants", "created_at", after=after, limit=limit)
+
+    def put_task(self, task: CareTask) -> CareTask:
+        self._write(INSERT_TASK, _task_row(task))
+        return task
+
+    def put_tasks(self, tasks: Iterable[CareTask]) -> List[CareTask]:
+        tasks = list(tasks)
+        with self._connection() as connection:
+            connection.executemany(INSERT_TASK, [_task_row(task) for task in tasks])
+        return tasks
+
+    def get_task(self, task_id: str) -> Optional[CareTask]:
+        return self._get(CareTask, "care_tasks", task_id)
+
+    def remove_task(self, task_id: str) -> Optional[CareTask]:
+        task = self.get_task(task_id)
+        if task:
+            self._write("DELETE FROM care_tasks WHERE id = ?", (task_id,))
+        return task
+
+    def tasks_for_plant(self, plant_id: str) -> List[CareTask]:
+        return self._select(
+            CareTask, "care_tasks", "next_due_at", where=[("plant_id", plant_id)]
+        )
+
+    def tasks_due(
+        self,
+        until: datetime | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[CareTask]:
+        where = [("next_due_at <=", _timestamp(until))] if until is not None else []
+        return self._select(
+            CareTask, "care_tasks", "next_due_at", where=where, after=after, limit=limit
+        )
+
+    def put_reminders(self, reminders: Iterable[Reminder]) -> List[Reminder]:
+        reminders = list(reminders)
+        rows = [
+            (
+                reminder.id,
+                reminder.task_id,
+                _timestamp(reminder.send_at),
+                reminder.model_dump_json(),
+            )
+            for reminder in reminders
+        ]
+        with self._connection() as connection:
+            connection.executemany(INSERT_REMINDER, rows)
+        return reminders
+
+    def get_reminder(self, reminder_id: str) -> Optional[Reminder]:
+        return self._get(Reminder, "reminders", reminder_id)
+
+    def get_reminders(self, reminder_ids: Iterable[str]) -> List[Reminder]:
+        return self._get_many(Reminder, "reminders", reminder_ids)
+
+    def reminders_for_task(self, task_id: str) -> List[Reminder]:
+        return self._select(Reminder, "reminders", "send_at", where=[("task_id", task_id)])
+
+    def add_event(self, event: TimelineEvent) -> TimelineEvent:
+        self._write(
+            INSERT_EVENT,
+            (event.id, event.plant_id, _timestamp(event.created_at), event.model_dump_json()),
+        )
+        return event
+
+    def list_events(
+        self,
+        plant_id: str,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[TimelineEvent]:
+        return self._select(
+            TimelineEvent,
+            "timeline",
+            "created_at",
+            where=[("plant_id", plant_id)],
+            after=after,
+            limit=limit,
+        )
+
+    def put_batch(self, batch: PropagationBatch) -> PropagationBatch:
+        self._write(
+            INSERT_BATCH,
+            (
+                batch.id,
+                batch.mother_plant_id,
+                _timestamp(batch.created_at),
+                batch.model_dump_json(),
+            ),
+        )
+        return batch
+
+    def get_batch(self, batch_id: str) -> Optional[PropagationBatch]:
+        return self._get(PropagationBatch, "propagations", batch_id)
+
+    def list_batches(
+        self,
+        mother_plant_id: str | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[PropagationBatch]:
+        where = [("mother_plant_id", mother_plant_id)] if mother_plant_id else []
+        return self._select(
+            PropagationBatch, "propagations", "created_at", where=where, after=after, limit=limit
+        )
+
+    def put_listing(self, listing: Listing) -> Listing:
+        self._write(
+            INSERT_LISTING,
+            (
+                listing.id,
+                listing.status.value,
+                _timestamp(listing.created_at),
+                listing.model_dump_json(),
+            ),
+        )
+        return listing
+
+    def get_listing(self, listing_id: str) -> Optional[Listing]:
+        return self._get(Listing, "listings", listing_id)
+
+    def list_listings(
+        self,
+        status: ListingStatus | None = None,
+        after: IndexKey | None = None,
+        limit: int | None = None,
+    ) -> List[Listing]:
+        where = [("status", status.value)] if status else []
+        return self._select(
+            Listing, "listings", "created_at", where=where, after=after, limit=limit
+        )
+
+    def put_order(self, order: Order) -> Order:
+        self._write(
+            INSERT_ORDER,
+            (order.id, order.listing_id, _timestamp(order.created_at), order.model_dump_json()),
+        )
+        return order
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        return self._get(Order, "orders", order_id)
+
+    def orders_for_listing(self, listing_id: str) -> List[Order]:
+        return self._select(Order, "orders", "created_at", where=[("listing_id", listing_id)])
+
+
+def _task_row(task: CareTask) -> tuple:
+    return task.id, task.plant_id, _timestamp(task.next_due_at), task.model_dump_json()
+
+
+def _conditions(where: Sequence[tuple[str, object]]) -> List[tuple[str, str, object]]:
+    """Expand ``("column", value)`` / ``("column <=", value)`` pairs."""
+    expanded = []
+    for column, value in where:
+        name, _, comparison = column.partition(" ")
+        expanded.append((name, comparison or "=", value))
+    return expanded
@@ -5,11 +5,45 @@ from plantos_backend.storage.memory import memory_store
 
 @pytest.fixture(autouse=True)
 def reset_store():
-    memory_store.plants.clear()
-    memory_store.care_tasks.clear()
-    memory_store.timeline.clear()
-    memory_store.experiments.clear()
-    memory_store.propagations.clear()
-    memory_store.listings.clear()
-    memory_store.orders.clear()
+    from plantos_backend.services.calendar import set_care_calendar
+
+    memory_store.clear()
+    set_care_calendar(None)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_job_queue():
+    from plantos_backend.services.jobs import set_job_queue
+
+    set_job_queue(None)
     yield
+
+
+@pytest.fixture(autouse=True)
+def reset_ai_cache():
+    from plantos_backend.ai.cache import get_response_cache
+    from plantos_backend.ai.routing import get_provider_health
+    from plantos_backend.ai.species import get_species_profiles
+    from plantos_backend.ai.structured import reset_metrics
+
+    get_response_cache().clear()
+    get_species_profiles().clear()
+    reset_metrics()
+    get_provider_health.cache_clear()
+    yield
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Route graph nodes to a ``FakeChatModel`` that replies with ``responses`` in turn."""
+    from fake_models import FakeChatModel, FakeProvider
+
+    def install(responses, delay: float = 0.0) -> FakeChatModel:
+        model = FakeChatModel(responses=list(responses), delay=delay, prompts=[])
+        monkeypatch.setattr(
+            "plantos_backend.ai.graphs.get_provider", lambda *args, **kwargs: FakeProvider(model)
+        )
+        return model
+
+    return install
@@ -0,0 +1,193 @@
+"""Minimal in-process stand-in for ``google.cloud.firestore.Client``.
+
+Covers the subset of the query API used by ``FirestoreStore``: equality and range
+filters, ``order_by``, ``start_after``, ``limit``, ``select``, ``get_all``, write
+batches and the transactions driven by ``firestore.transactional``.
+"""
+from __future__ import annotations
+
+import copy
+import operator
+from typing import Any, Dict, List, Optional
+
+_OPERATORS = {
+    "==": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+class FakeSnapshot:
+    def __init__(self, reference: "FakeDocument", data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data)
+
+
+class FakeDocument:
+    def __init__(self, collection: "FakeCollection", doc_id: str):
+        self.collection = collection
+        self.id = doc_id
+
+    def set(self, data: Dict[str, Any]) -> None:
+        self.collection.client.writes += 1
+        self.collection.docs[self.id] = copy.deepcopy(data)
+
+    def get(self, transaction: Any = None) -> FakeSnapshot:
+        self.collection.client.reads += 1
+        return FakeSnapshot(self, self.collection.docs.get(self.id))
+
+    def delete(self) -> None:
+        self.collection.client.writes += 1
+        self.collection.docs.pop(self.id, None)
+
+
+class FakeQuery:
+    def __init__(self, collection: "FakeCollection"):
+        self.collection = collection
+        self.filters: List[tuple] = []
+        self.orders: List[str] = []
+        self.cursor: Optional[Dict[str, Any]] = None
+        self.max_results: Optional[int] = None
+        self.projection: Optional[List[str]] = None
+
+    def _clone(self) -> "FakeQuery":
+        clone = copy.copy(self)
+        clone.filters = list(self.filters)
+        clone.orders = list(self.orders)
+        return clone
+
+    def where(self, *, filter: Any) -> "FakeQuery":  # noqa: A002 - mirrors the real API
+        clone = self._clone()
+        clone.filters.append((filter.field_path, _OPERATORS[filter.op_string], filter.value))
+        return clone
+
+    def order_by(self, field: str) -> "FakeQuery":
+        clone = self._clone()
+        clone.orders.append(field)
+        return clone
+
+    def start_after(self, values: Dict[str, Any]) -> "FakeQuery":
+        clone = self._clone()
+        clone.cursor = values
+        return clone
+
+    def limit(self, count: int) -> "FakeQuery":
+        clone = self._clone()
+        clone.max_results = count
+        return clone
+
+    def select(self, fields: List[str]) -> "FakeQuery":
+        clone = self._clone()
+        clone.projection = fields
+        return clone
+
+    def stream(self):
+        rows = [
+            (doc_id, data)
+            for doc_id, data in self.collection.docs.items()
+            if all(compare(data.get(field), value) for field, compare, value in self.filters)
+        ]
+        rows.sort(key=lambda row: tuple(row[1][field] for field in self.orders))
+        if self.cursor is not None:
+            cursor = tuple(self.cursor[field] for field in self.orders)
+            rows = [row for row in rows if tuple(row[1][field] for field in self.orders) > cursor]
+        if self.max_results is not None:
+            rows = rows[: self.max_results]
+        self.collection.client.reads += len(rows)
+        for doc_id, data in rows:
+            if self.projection is not None:
+                data = {field: data[field] for field in self.projection}
+            yield FakeSnapshot(self.collection.document(doc_id), data)
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client: "FakeFirestoreClient", name: str):
+        super().__init__(self)
+        self.client = client
+        self.name = name
+        self.docs: Dict[str, Dict[str, Any]] = {}
+
+    def document(self, doc_id: str) -> FakeDocument:
+        return FakeDocument(self, doc_id)
+
+
+class FakeWriteBatch:
+    def __init__(self, client: "FakeFirestoreClient"):
+        self.client = client
+        self.operations: List[tuple] = []
+
+    def set(self, reference: FakeDocument, data: Dict[str, Any]) -> None:
+        self.operations.append(("set", reference, data))
+
+    def delete(self, reference: FakeDocument) -> None:
+        self.operations.append(("delete", reference, None))
+
+    def commit(self) -> None:
+        self.client.commits += 1
+        for action, reference, data in self.operations:
+            if action == "set":
+                reference.collection.docs[reference.id] = copy.deepcopy(data)
+            else:
+                reference.collection.docs.pop(reference.id, None)
+
+
+class FakeTransaction(FakeWriteBatch):
+    """Buffers writes until ``_commit``; the hooks ``firestore.transactional`` calls."""
+
+    _read_only = False
+    _max_attempts = 5
+
+    def __init__(self, client: "FakeFirestoreClient"):
+        super().__init__(client)
+        self._id: Optional[bytes] = None
+
+    def _clean_up(self) -> None:
+        self.operations = []
+        self._id = None
+
+    def _begin(self, retry_id: Optional[bytes] = None) -> None:
+        self._id = b"transaction"
+
+    def _commit(self) -> list:
+        self.commit()
+        self._clean_up()
+        return []
+
+    def _rollback(self) -> None:
+        self._clean_up()
+
+
+class FakeFirestoreClient:
+    def __init__(self) -> None:
+        self.collections: Dict[str, FakeCollection] = {}
+        self.reads = 0
+        self.writes = 0
+        self.commits = 0
+        self.batch_gets = 0
+
+    def collection(self, name: str) -> FakeCollection:
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self, name)
+        return self.collections[name]
+
+    def get_all(self, references: List[FakeDocument]):
+        self.batch_gets += 1
+        for reference in references:
+            self.reads += 1
+            yield FakeSnapshot(reference, reference.collection.docs.get(reference.id))
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def transaction(self) -> FakeTransaction:
+        return FakeTransaction(self)
@@ -0,0 +1,62 @@
+"""Chat-model fakes for exercising the LangGraph workflows offline."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import ValidationError
+
+
+class FakeChatModel(FakeListChatModel):
+    """``FakeListChatModel`` whose async path awaits instead of blocking a thread."""
+
+    delay: float = 0.0
+    prompts: List[str] = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self.prompts.append(messages[-1].content)
+        await asyncio.sleep(self.delay)
+        return self._generate(messages, stop=stop, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        self.prompts.append(messages[-1].content)
+        await asyncio.sleep(self.delay)
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            yield chunk
+
+
+class ToolCallingChatModel(FakeChatModel):
+    """Answers structured-output requests with tool calls (no text), as Gemini does.
+
+    Each structured call replies with the next ``tool_args``; plain calls use
+    ``responses`` like ``FakeChatModel``.
+    """
+
+    tool_args: List[dict] = []
+    structured_calls: List[List[BaseMessage]] = []
+
+    def with_structured_output(self, schema, include_raw: bool = False, **kwargs: Any):
+        async def reply(messages):
+            self.structured_calls.append(messages)
+            args = self.tool_args.pop(0)
+            raw = AIMessage(
+                content="", tool_calls=[{"name": schema.__name__, "args": args, "id": "call_1"}]
+            )
+            try:
+                return {"raw": raw, "parsed": schema.model_validate(args), "parsing_error": None}
+            except ValidationError as exc:
+                return {"raw": raw, "parsed": None, "parsing_error": exc}
+
+        return RunnableLambda(reply)
+
+
+class FakeProvider:
+    def __init__(self, model: FakeChatModel):
+        self.model = model
+
+    def get_chat_model(self, model_name: str | None = None) -> FakeChatModel:
+        return self.model
@@ -0,0 +1,76 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from plantos_backend.ai.cache import ResponseCache, SqliteCacheBackend, cache_key
+from plantos_backend.app import app
+from plantos_backend.services import ai
+
+DIAGNOSIS = '{"diagnosis": "Root rot", "severity": "high", "recommendations": ["Repot"]}'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_keys_ignore_case_and_whitespace():
+    first = cache_key("health", {"description": "Yellow  leaves\n"})
+    assert first == cache_key("health", {"description": "yellow leaves"})
+    assert first != cache_key("onboard", {"description": "yellow leaves"})
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=2, ttl_seconds=60, clock=clock)
+    cache.set("a", {"value": 1})
+    cache.set("b", {"value": 2})
+    assert cache.get("a") == {"value": 1}
+
+    cache.set("c", {"value": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"value": 1}
+
+    clock.now += 61
+    assert cache.get("a") is None
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["evictions"]) == (2, 2, 1)
+    assert metrics["expirations"] == 1
+
+
+def test_disk_backend_survives_new_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(backend=SqliteCacheBackend(path)).set("k", {"species": "Pothos"})
+
+    fresh = ResponseCache(backend=SqliteCacheBackend(path))
+    assert fresh.get("k") == {"species": "Pothos"}
+    assert fresh.metrics()["size"] == 1
+
+
+def test_repeated_health_checks_hit_the_cache(fake_llm):
+    model = fake_llm([DIAGNOSIS])
+
+    first = asyncio.run(ai.run_health_check("Soggy soil, mushy stems"))
+    first["recommendations"].append("mutated by caller")
+    second = asyncio.run(ai.run_health_check("soggy soil,  mushy stems"))
+
+    assert len(model.prompts) == 1
+    assert second["recommendations"] == ["Repot"]
+    metrics = TestClient(app).get("/ai/metrics").json()["cache"]
+    assert (metrics["hits"], metrics["misses"]) == (1, 1)
+
+
+def test_fallback_diagnosis_is_not_cached(fake_llm):
+    model = fake_llm(["not json", "still not json", DIAGNOSIS])
+
+    first = asyncio.run(ai.run_health_check("Brown tips"))
+    second = asyncio.run(ai.run_health_check("Brown tips"))
+
+    assert first["severity"] == "unknown"
+    assert second["diagnosis"] == "Root rot"
+    assert len(model.prompts) == 3
+    assert asyncio.run(ai.run_health_check("Brown tips"))["diagnosis"] == "Root rot"
+    assert len(model.prompts) == 3
@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from plantos_backend.app import app
+from plantos_backend.services import ai
+
+client = TestClient(app)
+
+DIAGNOSIS = '{"diagnosis": "Overwatering", "severity": "medium", "recommendations": ["Dry out"]}'
+
+
+def test_identify_endpoint_runs_async_graph(fake_llm):
+    profile = '```json\n{"light": "bright indirect", "watering_days": 7}\n```'
+    fake_llm(["Monstera deliciosa", profile])
+
+    resp = client.post("/ai/identify", json={"notes": "big split leaves"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["species_guess"] == "Monstera deliciosa"
+    assert body["care_profile"]["watering_days"] == 7
+
+
+def test_health_checks_share_the_event_loop(fake_llm):
+    fake_llm([DIAGNOSIS], delay=0.2)
+
+    async def run_many():
+        return await asyncio.gather(*(ai.run_health_check(f"case {i}") for i in range(20)))
+
+    started = time.perf_counter()
+    results = asyncio.run(run_many())
+    elapsed = time.perf_counter() - started
+
+    assert all(result["diagnosis"] == "Overwatering" for result in results)
+    assert elapsed < 1.0
+
+
+def _experiment(count: int) -> dict:
+    return {
+        "hypothesis": "More light speeds growth",
+        "metric": "growth",
+        "variants": [{"id": f"v{i}", "description": f"{i} hours"} for i in range(count)],
+    }
+
+
+def test_variants_are_scored_concurrently_with_a_limit(fake_llm, monkeypatch):
+    from plantos_backend.settings import get_settings
+
+    monkeypatch.setattr(get_settings(), "ai_max_concurrency", 3)
+    fake_llm(["0.8"], delay=0.1)
+
+    started = time.perf_counter()
+    result = asyncio.run(ai.run_experiment_review(_experiment(6)))
+    elapsed = time.perf_counter() - started
+
+    assert [variant["metric"] for variant in result["variants"]] == [0.8] * 6
+    assert 0.2 <= elapsed < 0.5
+
+
+def test_slow_variant_falls_back_to_default_score(fake_llm, monkeypatch):
+    from plantos_backend.ai.graphs import DEFAULT_VARIANT_SCORE
+    from plantos_backend.settings import get_settings
+
+    monkeypatch.setattr(get_settings(), "ai_variant_timeout_seconds", 0.05)
+    fake_llm(["0.9"], delay=0.2)
+
+    result = asyncio.run(ai.run_experiment_review(_experiment(2)))
+
+    assert [variant["metric"] for variant in result["variants"]] == [DEFAULT_VARIANT_SCORE] * 2
+
+
+def test_health_batch_returns_results_in_order(fake_llm, monkeypatch):
+    from plantos_backend.settings import get_settings
+
+    monkeypatch.setattr(get_settings(), "ai_max_concurrency", 4)
+    model = fake_llm([DIAGNOSIS], delay=0.05)
+    items = [{"description": f"case {i % 5}"} for i in range(10)]
+
+    resp = client.post("/ai/health:batch", json={"items": items})
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert len(results) == 10
+    assert all(item["result"]["diagnosis"] == "Overwatering" for item in results)
+    assert len(model.prompts) == 5
+
+
+def test_identify_batch_reports_per_item_errors(fake_llm, monkeypatch):
+    from plantos_backend.settings import get_settings
+
+    # One item at a time so the scripted replies line up with the items.
+    monkeypatch.setattr(get_settings(), "ai_max_concurrency", 1)
+    profile = '{"light": "low", "watering_days": 14}'
+    fake_llm(["Zamioculcas zamiifolia", profile, "Unknown"])
+
+    resp = client.post(
+        "/ai/identify:batch", json={"items": [{"notes": "glossy"}, {"notes": "blurry photo"}]}
+    )
+
+    assert resp.status_code == 200
+    first, second = resp.json()["results"]
+    assert first["result"]["care_profile"]["watering_days"] == 14
+    assert first["error"] is None
+    assert second["result"] is None
+    assert second["error"].startswith("Incomplete result")
+
+
+def test_batch_rejects_empty_and_oversized_requests():
+    assert client.post("/ai/health:batch", json={"items": []}).status_code == 422
+    items = [{"description": "x"}] * 101
+    assert client.post("/ai/health:batch", json={"items": items}).status_code == 422
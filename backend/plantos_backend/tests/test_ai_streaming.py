@@ -0,0 +1,80 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from plantos_backend.app import app
+
+client = TestClient(app)
+
+SSE = {"Accept": "text/event-stream"}
+DIAGNOSIS = '{"diagnosis": "Spider mites", "severity": "high", "recommendations": ["Rinse"]}'
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        event, data = frame.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_health_check_streams_tokens_node_and_result(fake_llm):
+    fake_llm([DIAGNOSIS])
+
+    resp = client.post("/ai/health", json={"description": "fine webbing"}, headers=SSE)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _events(resp.text)
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert len(tokens) > 1 and "".join(tokens) == DIAGNOSIS
+    assert ("node", {"node": "diagnose"}) in events
+    assert events[-1][0] == "result"
+    assert events[-1][1]["diagnosis"] == "Spider mites"
+
+
+def test_streamed_runs_skip_native_structured_output(monkeypatch):
+    from fake_models import FakeProvider, ToolCallingChatModel
+
+    model = ToolCallingChatModel(
+        responses=[DIAGNOSIS],
+        tool_args=[{"diagnosis": "Scale", "severity": "low"}],
+        prompts=[],
+        structured_calls=[],
+    )
+    monkeypatch.setattr("plantos_backend.ai.graphs.get_provider", lambda: FakeProvider(model))
+
+    events = _events(
+        client.post("/ai/health", json={"description": "fine webbing"}, headers=SSE).text
+    )
+    plain = client.post("/ai/health", json={"description": "sticky leaves"}).json()
+
+    assert "".join(data["text"] for event, data in events if event == "token") == DIAGNOSIS
+    assert events[-1][1]["diagnosis"] == "Spider mites"
+    assert plain["diagnosis"] == "Scale"
+    assert len(model.structured_calls) == 1
+
+
+def test_streamed_answers_are_cached(fake_llm):
+    model = fake_llm([DIAGNOSIS])
+    client.post("/ai/health", json={"description": "fine webbing"}, headers=SSE)
+
+    events = _events(
+        client.post("/ai/health", json={"description": "Fine  webbing"}, headers=SSE).text
+    )
+    plain = client.post("/ai/health", json={"description": "fine webbing"})
+
+    assert [event for event, _ in events] == ["result"]
+    assert plain.json()["diagnosis"] == "Spider mites"
+    assert len(model.prompts) == 1
+
+
+def test_onboarding_stream_reports_each_node_and_errors(fake_llm):
+    fake_llm(["Unknown"])
+
+    events = _events(client.post("/ai/identify", json={"notes": "?"}, headers=SSE).text)
+
+    nodes = [data["node"] for event, data in events if event == "node"]
+    assert nodes == ["identify", "profile"]
+    # No care profile for an unknown plant, so the result cannot be shaped.
+    assert events[-1][0] == "error"
@@ -0,0 +1,202 @@
+import sys
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from plantos_backend.app import app
+from plantos_backend.models import CareSignal, CareTask
+from plantos_backend.services.calendar import (
+    CareCalendar,
+    built_care_calendar,
+    get_care_calendar,
+)
+
+client = TestClient(app)
+
+START = datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+
+
+def _task(cadence_days: int, **overrides) -> CareTask:
+    fields = {
+        "plant_id": "plant_1",
+        "signal": CareSignal.watering,
+        "cadence_days": cadence_days,
+        "next_due_at": START,
+    }
+    return CareTask(**{**fields, **overrides})
+
+
+def _calendar(horizon_days: int = 30, today: date = date(2024, 5, 1)) -> CareCalendar:
+    return CareCalendar(horizon_days, today=lambda: today)
+
+
+def test_calendar_expands_recurring_tasks_into_day_buckets():
+    calendar = _calendar()
+    task = _task(3)
+    calendar.put(task)
+
+    days = calendar.range(date(2024, 5, 1), date(2024, 5, 10))
+    assert [day for day, _ in days] == [date(2024, 5, d) for d in (1, 4, 7, 10)]
+    assert all(occurrences[0].task_id == task.id for _, occurrences in days)
+
+
+def test_calendar_reexpands_updated_task_and_drops_old_occurrences():
+    calendar = _calendar()
+    task = _task(2)
+    calendar.put(task)
+    calendar.put(task.model_copy(update={"next_due_at": START + timedelta(days=5)}))
+
+    days = calendar.range(date(2024, 5, 1), date(2024, 5, 10))
+    assert [day for day, _ in days] == [date(2024, 5, d) for d in (6, 8, 10)]
+
+    calendar.discard(task.id)
+    assert calendar.range(date(2024, 5, 1), date(2024, 5, 31)) == []
+    assert len(calendar) == 0
+
+
+def test_calendar_projects_days_past_the_horizon_without_storing_them():
+    calendar = _calendar(horizon_days=9)
+    calendar.put(_task(7))
+    calendar.put(_task(30, next_due_at=START + timedelta(days=20), signal=CareSignal.feeding))
+    stored = len(calendar)
+
+    days = calendar.range(date(2024, 6, 1), date(2024, 6, 30))
+    assert len(calendar) == stored
+    assert [day for day, _ in days] == [
+        date(2024, 6, 5),
+        date(2024, 6, 12),
+        date(2024, 6, 19),
+        date(2024, 6, 20),
+        date(2024, 6, 26),
+    ]
+
+
+def test_calendar_rolls_forward_and_keeps_overdue_occurrences():
+    today = [date(2024, 5, 1)]
+    calendar = CareCalendar(horizon_days=10, today=lambda: today[0])
+    daily = _task(1)
+    calendar.put(daily)
+    calendar.put(_task(0, next_due_at=START - timedelta(days=3), signal=CareSignal.feeding))
+    assert len(calendar) == 12
+
+    today[0] = date(2024, 5, 21)
+    days = calendar.range(date(2024, 4, 1), date(2024, 5, 22))
+
+    # Daily occurrences that passed are gone; the un-completed ones stay overdue.
+    assert [day for day, _ in days] == [
+        date(2024, 4, 28),
+        date(2024, 5, 1),
+        date(2024, 5, 21),
+        date(2024, 5, 22),
+    ]
+    assert len(calendar) == 13
+
+
+def test_calendar_survives_concurrent_writers_and_readers():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    calendar = _calendar()
+    tasks = [_task(1 + index % 5, id=f"task_{index}") for index in range(20)]
+    errors = []
+
+    def write(worker: int) -> None:
+        try:
+            for step in range(300):
+                task = tasks[(worker + step) % len(tasks)]
+                if step % 3 == 2:
+                    calendar.discard(task.id)
+                else:
+                    calendar.put(task)
+        except Exception as exc:  # pragma: no cover - only reached on a race
+            errors.append(exc)
+
+    def read() -> None:
+        try:
+            for _ in range(300):
+                calendar.range(date(2024, 5, 1), date(2024, 7, 1))
+        except Exception as exc:  # pragma: no cover - only reached on a race
+            errors.append(exc)
+
+    try:
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+
+
+def test_task_writes_do_not_build_the_calendar(monkeypatch):
+    from plantos_backend.storage.memory import memory_store
+
+    scans = []
+    tasks_due = memory_store.tasks_due
+    monkeypatch.setattr(
+        memory_store, "tasks_due", lambda *args, **kwargs: scans.append(1) or tasks_due()
+    )
+    plant = client.post("/plants", json={"name": "Fern", "watering_interval_days": 2}).json()
+    client.patch(f"/plants/{plant['id']}", json={"watering_interval_days": 3})
+
+    assert built_care_calendar() is None
+    assert scans == []
+
+    resp = client.get("/schedules/calendar")
+    assert resp.status_code == 200
+    assert scans == [1]
+    assert built_care_calendar() is not None
+
+
+def test_far_future_calendar_query_stores_nothing():
+    for index in range(50):
+        client.post("/plants", json={"name": f"Plant {index}", "watering_interval_days": 1})
+    stored = len(get_care_calendar())
+
+    resp = client.get("/schedules/calendar", params={"from": "2300-01-01", "to": "2300-01-02"})
+
+    assert resp.status_code == 200
+    assert [len(day["tasks"]) for day in resp.json()] == [50, 50]
+    assert len(get_care_calendar()) == stored
+
+
+def test_calendar_endpoint_tracks_completion_and_interval_changes():
+    plant = client.post(
+        "/plants", json={"name": "Fern", "watering_interval_days": 2, "feeding_interval_days": 30}
+    ).json()
+    today = datetime.now(timezone.utc).date()
+    params = {"from": today.isoformat(), "to": (today + timedelta(days=6)).isoformat()}
+
+    def watering_days():
+        resp = client.get("/schedules/calendar", params=params)
+        assert resp.status_code == 200
+        return [
+            day["day"]
+            for day in resp.json()
+            for entry in day["tasks"]
+            if entry["signal"] == "watering"
+        ]
+
+    assert len(watering_days()) == 3
+
+    client.patch(f"/plants/{plant['id']}", json={"watering_interval_days": 3})
+    assert len(watering_days()) == 2
+    tasks = get_care_calendar().tasks_for_plant(plant["id"])
+    watering = next(task for task in tasks if task.signal == CareSignal.watering)
+    assert watering.cadence_days == 3
+
+    client.post(f"/plants/tasks/{watering.id}/complete")
+    assert len(watering_days()) == 2
+
+    client.delete(f"/plants/{plant['id']}")
+    assert client.get("/schedules/calendar", params=params).json() == []
+
+
+def test_calendar_endpoint_rejects_bad_ranges():
+    resp = client.get("/schedules/calendar", params={"from": "2024-05-10", "to": "2024-05-01"})
+    assert resp.status_code == 400
+    resp = client.get("/schedules/calendar", params={"from": "2024-01-01", "to": "2026-01-01"})
+    assert resp.status_code == 400
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+import pytest
+from fake_firestore import FakeFirestoreClient
+from fastapi.testclient import TestClient
+
+from plantos_backend.app import app
+from plantos_backend.models import (
+    CareSignal,
+    CareTask,
+    ListingStatus,
+    Plant,
+    Reminder,
+    TimelineEvent,
+    TimestampedModel,
+)
+from plantos_backend.storage import set_store
+from plantos_backend.storage.firestore import FirestoreStore, _to_document
+
+
+@pytest.fixture
+def fake_client():
+    return FakeFirestoreClient()
+
+
+@pytest.fixture
+def store(fake_client):
+    return FirestoreStore(fake_client)
+
+
+def test_put_tasks_uses_one_batch(store, fake_client):
+    plant = store.put_plant(Plant(name="Fern"))
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    tasks = [
+        CareTask(
+            plant_id=plant.id,
+            signal=CareSignal.watering,
+            cadence_days=1,
+            next_due_at=start + timedelta(hours=hours),
+        )
+        for hours in (3, 1, 2)
+    ]
+
+    store.put_tasks(tasks)
+
+    assert fake_client.commits == 1
+    due = store.tasks_due(until=start + timedelta(hours=2), limit=1)
+    assert [task.next_due_at.hour for task in due] == [1]
+    rest = store.tasks_due(after=(due[0].next_due_at, due[0].id))
+    assert [task.next_due_at.hour for task in rest] == [2, 3]
+    assert store.get_task(tasks[0].id).signal == CareSignal.watering
+
+
+def test_remove_plant_cascades_in_a_batch(store, fake_client):
+    plant = store.put_plant(Plant(name="Monstera"))
+    store.put_tasks(CareTask.from_plant(plant, signal) for signal in CareSignal)
+    store.add_event(TimelineEvent(plant_id=plant.id, event_type="note", note="hello"))
+    task = store.tasks_for_plant(plant.id)[0]
+    store.put_reminders([Reminder(task_id=task.id, send_at=task.next_due_at)])
+
+    assert store.remove_plant(plant.id).name == "Monstera"
+
+    assert store.get_plant(plant.id) is None
+    assert store.tasks_for_plant(plant.id) == []
+    assert store.reminders_for_task(task.id) == []
+    assert store.list_events(plant.id) == []
+    assert store.remove_plant(plant.id) is None
+
+
+def test_get_plants_reads_in_one_batch(store, fake_client):
+    plants = [store.put_plant(Plant(name=name)) for name in ("Fern", "Pilea", "Monstera")]
+    ids = [plants[2].id, "plant_missing", plants[0].id, plants[2].id]
+
+    found = store.get_plants(ids)
+
+    assert fake_client.batch_gets == 1
+    assert sorted(plant.name for plant in found) == ["Fern", "Monstera"]
+    assert store.get_plants([]) == []
+
+
+def test_nested_enums_are_stored_as_values():
+    class Tagged(TimestampedModel):
+        signals: List[CareSignal]
+        by_status: Dict[str, ListingStatus]
+
+    document = _to_document(
+        Tagged(signals=[CareSignal.watering], by_status={"a": ListingStatus.published})
+    )
+
+    assert document["signals"] == ["watering"]
+    assert document["by_status"] == {"a": "published"}
+    assert type(document["signals"][0]) is str
+    assert isinstance(document["created_at"], datetime)
+
+
+def test_api_runs_against_firestore_store(store):
+    set_store(store)
+    try:
+        client = TestClient(app)
+        plant_id = client.post("/plants", json={"name": "Pilea"}).json()["id"]
+        assert [item["id"] for item in client.get("/plants").json()] == [plant_id]
+        assert len(client.get(f"/plants/{plant_id}/tasks").json()) == 2
+
+        listing = {"batch_id": "b1", "title": "Pilea pup", "price": 5, "description": "Pup"}
+        listing_id = client.post("/marketplace/listings", json=listing).json()["id"]
+        client.post("/marketplace/orders", json={"listing_id": listing_id, "buyer_name": "Ana"})
+        reserved = client.get("/marketplace/listings", params={"status": "reserved"}).json()
+        assert [item["id"] for item in reserved] == [listing_id]
+        assert store.list_listings(ListingStatus.draft) == []
+    finally:
+        set_store(None)
@@ -0,0 +1,122 @@
+import asyncio
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from plantos_backend.app import app
+from plantos_backend.services import images, storage
+from plantos_backend.services.images import InvalidImageError, process_image
+from plantos_backend.services.storage import LocalStorageService
+from plantos_backend.settings import get_settings
+
+client = TestClient(app)
+
+DIAGNOSIS = '{"diagnosis": "Sunburn", "severity": "low", "recommendations": ["Move back"]}'
+
+
+def _photo(size=(4000, 3000), orientation: int | None = None) -> bytes:
+    image = Image.new("RGB", size, (40, 140, 60))
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    image.save(buffer, "JPEG", quality=95, exif=exif)
+    return buffer.getvalue()
+
+
+def test_photos_are_rotated_downscaled_and_thumbnailed():
+    # Orientation 6: the camera was held upright, so the stored landscape pixels
+    # must be rotated into a portrait image.
+    result = process_image(_photo(orientation=6), max_edge=1536, thumbnail_edge=320)
+
+    assert (result.width, result.height) == (1152, 1536)
+    assert result.content_type == "image/webp"
+    with Image.open(io.BytesIO(result.data)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (1152, 1536)
+        assert not image.getexif()
+    with Image.open(io.BytesIO(result.thumbnail)) as thumbnail:
+        assert max(thumbnail.size) == 320
+
+
+def test_small_photos_are_not_upscaled_and_can_stay_jpeg():
+    result = process_image(_photo(size=(800, 600)), image_format="jpeg")
+
+    assert (result.width, result.height) == (800, 600)
+    assert result.extension == ".jpg"
+    assert result.data[:2] == b"\xff\xd8"
+
+
+def test_non_images_are_rejected():
+    with pytest.raises(InvalidImageError):
+        process_image(b"definitely not a photo")
+
+
+def test_prepare_image_runs_in_the_process_pool():
+    original = _photo()
+
+    result = asyncio.run(images.prepare_image(original))
+
+    assert len(result.data) < len(original)
+
+
+def test_diagnose_stores_processed_photo_and_thumbnail(tmp_path, fake_llm, monkeypatch):
+    fake_llm([DIAGNOSIS])
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setattr(get_settings(), "upload_spool_dir", str(spool_dir))
+    uploads = tmp_path / "uploads"
+    app.dependency_overrides[storage.get_storage_service] = lambda: LocalStorageService(
+        str(uploads)
+    )
+    plant = client.post("/plants", json={"name": "Aloe", "species": "Aloe vera"}).json()
+
+    try:
+        resp = client.post(
+            f"/plants/{plant['id']}/diagnose",
+            files={"file": ("leaf.jpg", _photo(), "image/jpeg")},
+        )
+        bad = client.post(
+            f"/plants/{plant['id']}/diagnose",
+            files={"file": ("notes.txt", b"hello", "text/plain")},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    assert resp.json()["diagnosis"] == "Sunburn"
+    names = sorted(path.name for path in uploads.iterdir())
+    assert len(names) == 2
+    assert names[0].endswith("-thumb.webp") or names[1].endswith("-thumb.webp")
+    assert bad.status_code == 415
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_repeat_photo_skips_processing_and_diagnosis(tmp_path, fake_llm, monkeypatch):
+    model = fake_llm([DIAGNOSIS])
+    app.dependency_overrides[storage.get_storage_service] = lambda: LocalStorageService(
+        str(tmp_path)
+    )
+    plant = client.post("/plants", json={"name": "Aloe", "species": "Aloe vera"}).json()
+    photo = _photo()
+
+    def diagnose():
+        return client.post(
+            f"/plants/{plant['id']}/diagnose",
+            files={"file": ("leaf.jpg", photo, "image/jpeg")},
+        )
+
+    try:
+        first = diagnose()
+        processed = []
+        monkeypatch.setattr(images, "prepare_image", lambda data: processed.append(data))
+        second = diagnose()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.json() == second.json()
+    assert len(model.prompts) == 1
+    assert processed == []
+    assert len(list(tmp_path.iterdir())) == 2
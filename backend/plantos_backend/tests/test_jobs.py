@@ -0,0 +1,250 @@
+import asyncio
+import io
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from plantos_backend.app import app
+from plantos_backend.models import Job, JobStatus
+from plantos_backend.services import storage
+from plantos_backend.services.jobs import JobRunner, MemoryJobQueue, SqliteJobQueue
+from plantos_backend.services.storage import LocalStorageService
+
+DIAGNOSIS = '{"diagnosis": "Root rot", "severity": "high", "recommendations": ["Repot"]}'
+
+
+def _photo() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), (90, 60, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def test_background_diagnosis_returns_job_and_completes(tmp_path, fake_llm):
+    fake_llm([DIAGNOSIS])
+    app.dependency_overrides[storage.get_storage_service] = lambda: LocalStorageService(
+        str(tmp_path)
+    )
+    try:
+        with TestClient(app) as client:
+            plant = client.post("/plants", json={"name": "Ivy", "species": "Hedera"}).json()
+            resp = client.post(
+                f"/plants/{plant['id']}/diagnose",
+                params={"background": "true"},
+                files={"file": ("leaf.jpg", _photo(), "image/jpeg")},
+            )
+            job_url = resp.headers["Location"]
+            job = client.get(job_url, params={"wait": 5}).json()
+            timeline = client.get(f"/plants/{plant['id']}/timeline").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 202
+    assert resp.json()["status"] == "queued"
+    assert job["status"] == "succeeded"
+    assert job["result"]["diagnosis"] == "Root rot"
+    assert any(event["note"].startswith("Diagnosis: Root rot") for event in timeline)
+
+
+def test_unknown_job_is_404():
+    with TestClient(app) as client:
+        assert client.get("/jobs/job_missing").status_code == 404
+
+
+def test_runner_bounds_concurrency_and_records_failures():
+    queue = MemoryJobQueue()
+    running = peak = 0
+
+    async def handler(payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        if payload["n"] == 3:
+            raise RuntimeError("model unavailable")
+        return {"n": payload["n"]}
+
+    async def scenario():
+        runner = JobRunner(queue, {"work": handler}, concurrency=3)
+        runner.start()
+        jobs = [await queue.enqueue(Job(kind="work", payload={"n": n})) for n in range(10)]
+        while not all(job.finished for job in jobs):
+            await asyncio.sleep(0.01)
+        await runner.stop()
+        return jobs
+
+    jobs = asyncio.run(scenario())
+
+    assert peak == 3
+    assert jobs[0].status == JobStatus.succeeded and jobs[0].result == {"n": 0}
+    assert jobs[3].status == JobStatus.failed and jobs[3].error == "model unavailable"
+
+
+def test_memory_queue_evicts_only_finished_jobs():
+    queue = MemoryJobQueue(max_jobs=2)
+
+    async def scenario():
+        done = await queue.enqueue(Job(kind="work", status=JobStatus.succeeded))
+        pending = await queue.enqueue(Job(kind="work"))
+        await queue.enqueue(Job(kind="work"))
+        return done, pending
+
+    done, pending = asyncio.run(scenario())
+
+    assert asyncio.run(queue.get(done.id)) is None
+    assert asyncio.run(queue.get(pending.id)) is not None
+
+
+def test_sqlite_queue_persists_and_requeues_stale_jobs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = SqliteJobQueue(path, poll_interval=0.01)
+
+    async def claim_one():
+        first = await queue.enqueue(Job(kind="work", payload={"n": 1}))
+        await queue.enqueue(Job(kind="work", payload={"n": 2}))
+        return first, await queue.claim()
+
+    first, claimed = asyncio.run(claim_one())
+    assert claimed.id == first.id
+    assert claimed.status == JobStatus.running and claimed.attempts == 1
+
+    # A second worker process sees the same queue and skips the claimed job.
+    other = SqliteJobQueue(path, poll_interval=0.01)
+    assert asyncio.run(other.claim()).payload == {"n": 2}
+
+    claimed.updated_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    queue._write(claimed)
+    assert asyncio.run(other.requeue_stale(600)) == 1
+    assert asyncio.run(other.get(first.id)).status == JobStatus.queued
+
+
+def test_runner_heartbeats_long_jobs_and_requeues_orphans(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = SqliteJobQueue(path, poll_interval=0.01)
+    calls = []
+
+    async def handler(payload):
+        calls.append(payload["name"])
+        await asyncio.sleep(payload["seconds"])
+        return {}
+
+    async def scenario():
+        # A worker that crashed mid-job: claimed, then no heartbeat for an hour.
+        orphan = await queue.enqueue(Job(kind="work", payload={"name": "orphan", "seconds": 0}))
+        crashed = await SqliteJobQueue(path).claim()
+        crashed.updated_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        queue._write(crashed)
+
+        runner = JobRunner(
+            queue, {"work": handler}, concurrency=2, heartbeat_seconds=0.02, stale_seconds=0.1
+        )
+        runner.start()
+        slow = await queue.enqueue(Job(kind="work", payload={"name": "slow", "seconds": 0.4}))
+        while not all([(await queue.get(job.id)).finished for job in (orphan, slow)]):
+            await asyncio.sleep(0.01)
+        await runner.stop()
+        return await queue.get(orphan.id), await queue.get(slow.id)
+
+    orphan, slow = asyncio.run(scenario())
+
+    assert sorted(calls) == ["orphan", "slow"]
+    assert orphan.status == JobStatus.succeeded and orphan.attempts == 2
+    assert slow.status == JobStatus.succeeded and slow.attempts == 1
+
+
+def test_worker_survives_queue_errors():
+    queue = MemoryJobQueue()
+    claim = queue.claim
+    failures = [sqlite3.OperationalError("database is locked")]
+
+    async def flaky_claim():
+        if failures:
+            raise failures.pop()
+        return await claim()
+
+    queue.claim = flaky_claim
+
+    async def handler(payload):
+        return {"ok": True}
+
+    async def scenario():
+        runner = JobRunner(queue, {"work": handler}, concurrency=1, retry_seconds=0.01)
+        runner.start()
+        job = await queue.enqueue(Job(kind="work"))
+        while not job.finished:
+            await asyncio.sleep(0.01)
+        await runner.stop()
+        return job
+
+    assert asyncio.run(scenario()).status == JobStatus.succeeded
+    assert failures == []
+
+
+def test_sqlite_claim_writes_status_and_heartbeat_together(tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.db"))
+    before = datetime.now(timezone.utc)
+
+    async def scenario():
+        await queue.enqueue(Job(kind="work"))
+        # Claiming must not need a second write to bring ``data`` up to date.
+        queue._write = None
+        return await queue.claim()
+
+    claimed = asyncio.run(scenario())
+    status, data = queue._connection().execute("SELECT status, data FROM jobs").fetchone()
+    stored = Job.model_validate_json(data)
+    assert status == stored.status.value == JobStatus.running.value
+    assert stored.attempts == claimed.attempts == 1
+    assert stored.updated_at >= before
+
+
+def test_requeued_run_is_cancelled_and_cannot_overwrite_the_rerun(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = SqliteJobQueue(path, poll_interval=0.01)
+    cancelled = []
+
+    async def handler(payload):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return {"run": "first"}
+
+    async def scenario():
+        job = await queue.enqueue(Job(kind="work"))
+        runner = JobRunner(queue, {"work": handler}, concurrency=1, heartbeat_seconds=0.02)
+        first = asyncio.create_task(runner.run(await queue.claim()))
+        await asyncio.sleep(0.05)
+        # The reaper re-queued it (e.g. after a long pause) and another worker took it.
+        stored = await queue.get(job.id)
+        stored.status = JobStatus.queued
+        queue._write(stored)
+        rerun = await SqliteJobQueue(path).claim()
+        await first
+        rerun.status, rerun.result = JobStatus.succeeded, {"run": "second"}
+        assert await queue.finish(rerun)
+        return await queue.get(job.id)
+
+    job = asyncio.run(scenario())
+
+    assert cancelled == [True]
+    assert job.status == JobStatus.succeeded and job.result == {"run": "second"}
+    assert job.attempts == 2
+
+
+def test_stale_jobs_fail_after_max_attempts(tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.db"))
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    worn = Job(kind="work", status=JobStatus.running, attempts=3, updated_at=stale)
+    fresh = Job(kind="work", status=JobStatus.running, attempts=1, updated_at=stale)
+    queue._write(worn)
+    queue._write(fresh)
+
+    assert asyncio.run(queue.requeue_stale(60, max_attempts=3)) == 2
+
+    assert asyncio.run(queue.get(worn.id)).status == JobStatus.failed
+    assert "3 attempts" in asyncio.run(queue.get(worn.id)).error
+    assert asyncio.run(queue.get(fresh.id)).status == JobStatus.queued
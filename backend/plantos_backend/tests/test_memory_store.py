@@ -0,0 +1,157 @@
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+from plantos_backend.models import CareSignal, CareTask, Plant, Reminder
+from plantos_backend.storage.indexes import SortedIndex
+from plantos_backend.storage.memory import MemoryStore
+
+
+def _task(task_id: str, hours: int) -> CareTask:
+    return CareTask(
+        id=task_id,
+        plant_id="plant_1",
+        signal=CareSignal.watering,
+        cadence_days=7,
+        next_due_at=datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=hours),
+    )
+
+
+def test_sorted_index_range_and_reorder():
+    index = SortedIndex()
+    index.add("b", 2)
+    index.add("a", 1)
+    index.add("c", 3)
+    assert index.range() == ["a", "b", "c"]
+    assert index.range(upper=2) == ["a", "b"]
+
+    index.add("a", 5)
+    assert index.range() == ["b", "c", "a"]
+    index.discard("c")
+    assert index.range(after=(2, "b")) == ["a"]
+    assert len(index) == 2
+
+
+def test_sorted_index_survives_concurrent_writers():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    index = SortedIndex()
+    errors = []
+
+    def churn(worker: int) -> None:
+        try:
+            for step in range(2000):
+                item_id = f"item_{(worker * 7 + step) % 50}"
+                if step % 3 == 2:
+                    index.discard(item_id)
+                else:
+                    index.add(item_id, (step * 31 + worker) % 97)
+                index.range(upper=48)
+        except Exception as exc:  # pragma: no cover - only reached on a race
+            errors.append(exc)
+
+    try:
+        threads = [threading.Thread(target=churn, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert len(index) == len(index._keys)
+    assert sorted(index.range()) == sorted(index._keys)
+    assert index._entries == sorted(index._entries)
+
+
+def test_tasks_due_tracks_updates_and_pages():
+    store = MemoryStore()
+    for position, task_id in enumerate(["t1", "t2", "t3", "t4"]):
+        store.put_task(_task(task_id, hours=position))
+
+    cutoff = datetime(2025, 1, 1, 2, tzinfo=timezone.utc)
+    assert [task.id for task in store.tasks_due(until=cutoff)] == ["t1", "t2", "t3"]
+
+    store.put_task(_task("t1", hours=10))
+    store.remove_task("t2")
+    first_page = store.tasks_due(limit=2)
+    assert [task.id for task in first_page] == ["t3", "t4"]
+    last = first_page[-1]
+    assert [task.id for task in store.tasks_due(after=(last.next_due_at, last.id))] == ["t1"]
+
+
+def test_secondary_indexes_follow_updates():
+    from plantos_backend.models import ListingStatus
+    from plantos_backend.schemas.marketplace import ListingCreate, OrderCreate
+    from plantos_backend.services import marketplace
+    from plantos_backend.storage.memory import memory_store
+
+    listing = marketplace.create_listing(
+        ListingCreate(batch_id="batch_1", title="Pothos cutting", price=8, description="Rooted")
+    )
+    assert memory_store.list_listings(ListingStatus.draft) == [listing]
+
+    order = marketplace.create_order(OrderCreate(listing_id=listing.id, buyer_name="Sam"))
+    assert memory_store.list_listings(ListingStatus.draft) == []
+    assert [item.id for item in memory_store.list_listings(ListingStatus.reserved)] == [
+        listing.id
+    ]
+    assert marketplace.list_orders(listing.id) == [order]
+
+    store = MemoryStore()
+    store.put_task(_task("t1", hours=1))
+    store.put_task(_task("t2", hours=2))
+    store.remove_task("t1")
+    assert [task.id for task in store.tasks_for_plant("plant_1")] == ["t2"]
+
+
+def test_store_reads_never_see_half_applied_writes():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    store = MemoryStore()
+    errors = []
+
+    def write(worker: int) -> None:
+        try:
+            for step in range(500):
+                task_id = f"t{(worker + step) % 20}"
+                if step % 4 == 3:
+                    store.remove_task(task_id)
+                else:
+                    store.put_task(_task(task_id, hours=(step * 13 + worker) % 48))
+        except Exception as exc:  # pragma: no cover - only reached on a race
+            errors.append(exc)
+
+    def read() -> None:
+        try:
+            for _ in range(500):
+                store.tasks_due()
+                store.tasks_for_plant("plant_1")
+        except Exception as exc:  # pragma: no cover - only reached on a race
+            errors.append(exc)
+
+    try:
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert sorted(task.id for task in store.tasks_due()) == sorted(store.care_tasks)
+
+
+def test_remove_plant_drops_task_reminders():
+    store = MemoryStore()
+    plant = store.put_plant(Plant(name="Fern"))
+    task = store.put_task(_task("t1", hours=1).model_copy(update={"plant_id": plant.id}))
+    store.put_reminders([Reminder(task_id=task.id, send_at=task.next_due_at)])
+
+    store.remove_plant(plant.id)
+
+    assert store.reminders_for_task(task.id) == []
+    assert store.reminders == {}
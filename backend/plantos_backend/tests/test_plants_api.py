@@ -20,3 +20,67 @@ def test_due_tasks_endpoint():
     resp = client.get("/schedules/due")
     assert resp.status_code == 200
     assert isinstance(resp.json(), list)
+
+
+def test_due_tasks_pages_with_cursor():
+    for name in ("Fern", "Pothos", "Calathea"):
+        client.post("/plants", json={"name": name, "watering_interval_days": 1})
+
+    seen = []
+    params = {"minutes": 60 * 24 * 2, "limit": 2}
+    while True:
+        resp = client.get("/schedules/due", params=params)
+        assert resp.status_code == 200
+        seen.extend(item["task_id"] for item in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["after"] = cursor
+
+    assert len(seen) == len(set(seen)) == 3
+
+
+def test_list_plants_keyset_pages():
+    created = [client.post("/plants", json={"name": f"Plant {i}"}).json()["id"] for i in range(5)]
+
+    first = client.get("/plants", params={"limit": 2})
+    assert [item["id"] for item in first.json()] == created[:2]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/plants", params={"limit": 3, "after": cursor})
+    assert [item["id"] for item in second.json()] == created[2:]
+    assert "X-Next-Cursor" in second.headers
+
+    third = client.get("/plants", params={"limit": 3, "after": second.headers["X-Next-Cursor"]})
+    assert third.json() == []
+    assert client.get("/plants", params={"after": "not-a-cursor"}).status_code == 400
+
+
+def test_naive_cursor_is_rejected():
+    client.post("/plants", json={"name": "Fern", "watering_interval_days": 1})
+    naive = {"after": "2024-01-01T00:00:00,x"}
+    assert client.get("/plants", params=naive).status_code == 400
+    assert client.get("/schedules/due", params=naive).status_code == 400
+
+
+def test_list_endpoints_stream_ndjson():
+    import json
+
+    plant_id = client.post("/plants", json={"name": "Hoya"}).json()["id"]
+    for note in ("repotted", "new leaf"):
+        client.post(f"/plants/{plant_id}/timeline", json={"event_type": "note", "note": note})
+
+    resp = client.get(f"/plants/{plant_id}/timeline", headers={"Accept": "application/x-ndjson"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    assert [event["note"] for event in events] == ["repotted", "new leaf"]
+
+    listing = {"batch_id": "batch_1", "title": "Hoya cutting", "price": 12, "description": "Rooted"}
+    client.post("/marketplace/listings", json=listing)
+    resp = client.get(
+        "/marketplace/listings",
+        params={"status": "draft"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert [json.loads(line)["title"] for line in resp.text.splitlines()] == ["Hoya cutting"]
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from plantos_backend.ai import providers
+from plantos_backend.settings import get_settings
+
+
+@pytest.fixture(autouse=True)
+def api_keys(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "gemini_api_key", "gemini-test")
+    asyncio.run(providers.close_clients())
+    yield
+    asyncio.run(providers.close_clients())
+
+
+def test_providers_are_cached_per_name():
+    assert providers.get_provider("openai") is providers.get_provider("OpenAI")
+    assert providers.get_provider("gemini") is not providers.get_provider("openai")
+
+
+def test_chat_models_cached_per_model_and_temperature():
+    provider = providers.get_provider("openai")
+
+    model = provider.get_chat_model()
+    assert provider.get_chat_model() is model
+    assert provider.get_chat_model("gpt-4o", temperature=0) is model
+    assert provider.get_chat_model(temperature=0.7) is not model
+    assert provider.get_chat_model("gpt-4o-mini") is not model
+
+
+def test_openai_models_share_one_connection_pool():
+    provider = providers.get_provider("openai")
+
+    first = provider.get_chat_model()
+    second = provider.get_chat_model("gpt-4o-mini")
+
+    http_client, http_async_client = providers.get_http_clients()
+    assert first.http_async_client is second.http_async_client is http_async_client
+    assert first.http_client is http_client
+
+
+def test_close_clients_resets_caches():
+    provider = providers.get_provider("gemini")
+    asyncio.run(providers.close_clients())
+    assert providers.get_provider("gemini") is not provider
@@ -0,0 +1,264 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fake_firestore import FakeFirestoreClient
+
+from plantos_backend.models import CareSignal, CareTask, Plant, ReminderChannel
+from plantos_backend.repositories.plants import plant_repository
+from plantos_backend.services.reminder_scheduler import (
+    LEASE_NAME,
+    FirestoreLeaseStore,
+    MemoryLeaseStore,
+    ReminderScheduler,
+    SqliteLeaseStore,
+)
+from plantos_backend.services.reminders import FakeSender, ReminderDispatcher
+from plantos_backend.storage.memory import memory_store
+
+START = datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = START
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def seconds(self) -> float:
+        return self.now.timestamp()
+
+
+def _task(plant: Plant, minutes: float) -> CareTask:
+    return CareTask(
+        plant_id=plant.id,
+        signal=CareSignal.watering,
+        cadence_days=7,
+        next_due_at=START + timedelta(minutes=minutes),
+    )
+
+
+def _scheduler(leases, clock, sender, dispatcher_options=None, **options) -> ReminderScheduler:
+    dispatcher = ReminderDispatcher({ReminderChannel.push: sender}, **(dispatcher_options or {}))
+    options.setdefault("lease_seconds", 60)
+    return ReminderScheduler(leases, dispatcher, clock=clock, **options)
+
+
+def test_scheduler_wakes_for_next_due_task_and_sends_once():
+    clock, sender = Clock(), FakeSender()
+    plant = memory_store.put_plant(Plant(name="Fern"))
+    first, second = memory_store.put_tasks([_task(plant, 10), _task(plant, 30)])
+    scheduler = _scheduler(MemoryLeaseStore(clock.seconds), clock, sender)
+
+    assert asyncio.run(scheduler.tick()) == []
+    assert scheduler.next_wake() == first.next_due_at
+    assert scheduler.seconds_until_next() == 30
+
+    clock.now = first.next_due_at
+    assert len(asyncio.run(scheduler.tick())) == 1
+    assert asyncio.run(scheduler.tick()) == []
+    assert scheduler.next_wake() == second.next_due_at
+
+    clock.now = START + timedelta(minutes=45)
+    assert len(asyncio.run(scheduler.tick())) == 1
+    assert [task_ids for _, task_ids in sender.batches] == [
+        [memory_store.reminders_for_task(first.id)[0].id],
+        [memory_store.reminders_for_task(second.id)[0].id],
+    ]
+
+
+def test_lease_keeps_one_sender_and_hands_over_on_expiry(tmp_path):
+    clock = Clock()
+    leases = SqliteLeaseStore(str(tmp_path / "leases.db"), clock=clock.seconds)
+    plant = memory_store.put_plant(Plant(name="Fern"))
+    memory_store.put_tasks([_task(plant, 5), _task(plant, 90)])
+    first_sender, second_sender = FakeSender(), FakeSender()
+    first = _scheduler(leases, clock, first_sender, owner="worker-1", lease_seconds=3600)
+    second = _scheduler(leases, clock, second_sender, owner="worker-2", lease_seconds=3600)
+
+    asyncio.run(first.tick())
+    clock.now = START + timedelta(minutes=10)
+    assert asyncio.run(second.tick()) == []
+    assert len(asyncio.run(first.tick())) == 1
+
+    # worker-1 stops renewing; once its lease lapses worker-2 resumes from the watermark.
+    clock.now = START + timedelta(minutes=95)
+    assert len(asyncio.run(second.tick())) == 1
+    assert len(first_sender.batches) == len(second_sender.batches) == 1
+    assert asyncio.run(first.tick()) == []
+
+
+def test_firestore_leases_exclude_other_owners_until_expiry():
+    clock = Clock()
+    leases = FirestoreLeaseStore(FakeFirestoreClient(), clock=clock.seconds)
+
+    assert leases.acquire(LEASE_NAME, "worker-1", 30).owner == "worker-1"
+    assert leases.acquire(LEASE_NAME, "worker-2", 30) is None
+    assert leases.advance(LEASE_NAME, "worker-1", START)
+    assert not leases.advance(LEASE_NAME, "worker-2", START)
+
+    clock.now += timedelta(seconds=31)
+    lease = leases.acquire(LEASE_NAME, "worker-2", 30)
+    assert (lease.owner, lease.watermark) == ("worker-2", START)
+    leases.rewind(LEASE_NAME, START - timedelta(minutes=1))
+    leases.rewind(LEASE_NAME, START)
+    assert leases.acquire(LEASE_NAME, "worker-2", 30).resume_from == START - timedelta(minutes=1)
+    assert leases.advance(LEASE_NAME, "worker-2", START + timedelta(hours=1))
+    assert leases.acquire(LEASE_NAME, "worker-2", 30).watermark == START - timedelta(minutes=1)
+    leases.release(LEASE_NAME, "worker-2")
+    assert leases.acquire(LEASE_NAME, "worker-1", 30).owner == "worker-1"
+
+
+def test_worker_that_loses_the_lease_mid_dispatch_stops_sending():
+    clock = Clock()
+    leases = MemoryLeaseStore(clock.seconds)
+    plant = memory_store.put_plant(Plant(name="Fern"))
+    memory_store.put_tasks([_task(plant, 5), _task(plant, 6)])
+
+    class SlowSender(FakeSender):
+        async def send(self, user_id, reminders):
+            await super().send(user_id, reminders)
+            # This send outlives the lease and worker-2 takes over meanwhile.
+            clock.now += timedelta(minutes=5)
+            leases.acquire(LEASE_NAME, "worker-2", 60)
+
+    slow, other = SlowSender(), FakeSender()
+    options = {"dispatcher_options": {"batch_size": 1}, "lease_seconds": 60}
+    first = _scheduler(leases, clock, slow, owner="worker-1", **options)
+    second = _scheduler(leases, clock, other, owner="worker-2", **options)
+
+    asyncio.run(first.tick())
+    clock.now = START + timedelta(minutes=10)
+    assert len(asyncio.run(first.tick())) == 1
+    assert len(asyncio.run(second.tick())) == 1
+    assert len(slow.batches) == len(other.batches) == 1
+    assert slow.batches[0][1] != other.batches[0][1]
+
+
+def test_failed_reminders_hold_the_watermark_until_delivered():
+    clock = Clock()
+    plant = memory_store.put_plant(Plant(name="Fern"))
+    failing, ok = memory_store.put_tasks([_task(plant, 5), _task(plant, 8)])
+    sender = FakeSender(failures=3)
+    scheduler = _scheduler(
+        MemoryLeaseStore(clock.seconds),
+        clock,
+        sender,
+        dispatcher_options={"max_attempts": 3, "redispatch_seconds": 300, "clock": clock},
+    )
+    scheduler.dispatcher.sleep = lambda seconds: asyncio.sleep(0)
+
+    asyncio.run(scheduler.tick())
+    clock.now = START + timedelta(minutes=6)
+    assert asyncio.run(scheduler.tick()) == []
+    # The failed reminder waits out its redispatch delay; later ones still go out.
+    clock.now = START + timedelta(minutes=10)
+    assert len(asyncio.run(scheduler.tick())) == 1
+
+    clock.now = START + timedelta(minutes=12)
+    [retried] = asyncio.run(scheduler.tick())
+    assert retried == memory_store.reminders_for_task(failing.id)[0].id
+    assert asyncio.run(scheduler.tick()) == []
+    assert [len(ids) for _, ids in sender.batches] == [1, 1]
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite", "firestore"])
+def test_tasks_written_behind_the_watermark_are_still_sent(backend, tmp_path):
+    clock = Clock()
+    leases = {
+        "memory": lambda: MemoryLeaseStore(clock.seconds),
+        "sqlite": lambda: SqliteLeaseStore(str(tmp_path / "leases.db"), clock=clock.seconds),
+        "firestore": lambda: FirestoreLeaseStore(FakeFirestoreClient(), clock=clock.seconds),
+    }[backend]()
+    plant = memory_store.put_plant(Plant(name="Fern"))
+    memory_store.put_tasks([_task(plant, 40)])
+    late = []
+
+    class WritingSender(FakeSender):
+        async def send(self, user_id, reminders):
+            await super().send(user_id, reminders)
+            if not late:
+                # A task lands behind the cutoff while this tick is dispatching.
+                late.append(memory_store.put_task(_task(plant, 42)))
+                await scheduler.rewind(late)
+
+    sender = WritingSender()
+    scheduler = _scheduler(leases, clock, sender, lead=timedelta(minutes=30))
+
+    asyncio.run(scheduler.tick())
+    clock.now = START + timedelta(minutes=15)
+    assert len(asyncio.run(scheduler.tick())) == 1
+    # The rewind kept the watermark below the late task, so the next tick sends it.
+    assert asyncio.run(scheduler.tick()) == [memory_store.reminders_for_task(late[0].id)[0].id]
+
+    # A task completed into the already-covered window is picked up the same way.
+    rescheduled = memory_store.put_task(_task(plant, 35))
+    asyncio.run(scheduler.rewind([rescheduled]))
+    clock.now = START + timedelta(minutes=16)
+    assert asyncio.run(scheduler.tick()) == [
+        memory_store.reminders_for_task(rescheduled.id)[0].id
+    ]
+    assert asyncio.run(scheduler.tick()) == []
+
+
+def test_lease_and_store_calls_run_off_the_event_loop(monkeypatch):
+    clock = Clock()
+    plant = memory_store.put_plant(Plant(name="Fern"))
+    memory_store.put_tasks([_task(plant, 5)])
+    threads = []
+
+    class RecordingLeases(MemoryLeaseStore):
+        def acquire(self, *args):
+            threads.append(threading.get_ident())
+            return super().acquire(*args)
+
+        def advance(self, *args):
+            threads.append(threading.get_ident())
+            return super().advance(*args)
+
+    tasks_due = memory_store.tasks_due
+    monkeypatch.setattr(
+        memory_store,
+        "tasks_due",
+        lambda **kwargs: threads.append(threading.get_ident()) or tasks_due(**kwargs),
+    )
+    scheduler = _scheduler(RecordingLeases(clock.seconds), clock, FakeSender())
+
+    async def scenario() -> int:
+        await scheduler.tick()
+        clock.now = START + timedelta(minutes=10)
+        await scheduler.tick()
+        await scheduler.stop()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert len(threads) >= 5
+    assert loop_thread not in threads
+
+
+def test_running_scheduler_picks_up_new_tasks():
+    sender = FakeSender()
+    dispatcher = ReminderDispatcher({ReminderChannel.push: sender})
+    scheduler = ReminderScheduler(MemoryLeaseStore(), dispatcher, lease_seconds=60)
+    plant = memory_store.put_plant(Plant(name="Fern"))
+
+    async def scenario() -> None:
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        due = datetime.now(timezone.utc) + timedelta(seconds=0.2)
+        task = CareTask(
+            plant_id=plant.id, signal=CareSignal.watering, cadence_days=7, next_due_at=due
+        )
+        plant_repository.add_task(task)
+        # Already overdue, so behind the watermark the first tick recorded.
+        overdue = task.model_copy(
+            update={"id": "task_overdue", "next_due_at": due - timedelta(minutes=5)}
+        )
+        await asyncio.to_thread(plant_repository.add_task, overdue)
+        await asyncio.sleep(0.5)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert len(sender.batches) == 2
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from plantos_backend.models import CareSignal, CareTask, Plant, ReminderChannel
+from plantos_backend.services import reminders
+from plantos_backend.services.reminders import FakeSender, ReminderDispatcher, TokenBucket
+from plantos_backend.storage.memory import memory_store
+
+DUE = datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+
+
+def _tasks(owner_id: str, count: int, **plant_fields) -> list[CareTask]:
+    plant = memory_store.put_plant(Plant(name="Fern", owner_id=owner_id, **plant_fields))
+    tasks = [
+        CareTask(
+            plant_id=plant.id,
+            signal=CareSignal.watering,
+            cadence_days=7,
+            next_due_at=DUE + timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+    return memory_store.put_tasks(tasks)
+
+
+def _dispatcher(senders, **options) -> tuple[ReminderDispatcher, list[float]]:
+    sleeps: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    options.setdefault("channels", list(senders))
+    return ReminderDispatcher(senders, sleep=sleep, **options), sleeps
+
+
+def test_dispatch_batches_per_user_and_channel_and_records_delivery():
+    push, email = FakeSender(), FakeSender()
+    dispatcher, _ = _dispatcher(
+        {ReminderChannel.push: push, ReminderChannel.email: email}, batch_size=2
+    )
+    tasks = _tasks("ana", 3) + _tasks("ben", 1) + _tasks("cy", 1, reminders_enabled=False)
+
+    sent = asyncio.run(dispatcher.dispatch(dispatcher.build(tasks)))
+
+    assert len(sent) == 8
+    assert [(user, len(ids)) for user, ids in push.batches] == [("ana", 2), ("ana", 1), ("ben", 1)]
+    assert len(email.batches) == 3
+    stored = memory_store.reminders_for_task(tasks[0].id)
+    assert {reminder.channel for reminder in stored} == set(dispatcher.channels)
+    assert all(reminder.delivered_at is not None for reminder in stored)
+
+    # Delivered reminders are not built again for the same occurrence.
+    assert dispatcher.build(tasks) == []
+    moved = tasks[0].model_copy(update={"next_due_at": DUE + timedelta(days=7)})
+    assert len(dispatcher.build([moved])) == 2
+
+
+def test_dispatch_retries_with_backoff_then_records_failure():
+    flaky = FakeSender(failures=1)
+    dispatcher, sleeps = _dispatcher(
+        {ReminderChannel.push: flaky}, max_attempts=3, retry_seconds=0.5
+    )
+    [reminder] = asyncio.run(dispatcher.dispatch(dispatcher.build(_tasks("ana", 1))))
+    assert reminder.delivered_at is not None
+    assert reminder.attempts == 2
+    assert sleeps == [0.5]
+
+    broken = FakeSender(failures=10)
+    dispatcher, sleeps = _dispatcher(
+        {ReminderChannel.push: broken}, max_attempts=3, retry_seconds=0.5
+    )
+    [reminder] = asyncio.run(dispatcher.dispatch(dispatcher.build(_tasks("ben", 1))))
+    assert reminder.delivered_at is None
+    assert reminder.error == "fake sender failure"
+    assert broken.calls == 3
+    assert sleeps == [0.5, 1.0]
+    assert memory_store.get_reminder(reminder.id).error == "fake sender failure"
+
+
+def test_failed_reminders_back_off_between_dispatches_and_are_given_up():
+    now = [DUE]
+    broken = FakeSender(failures=100)
+    dispatcher, _ = _dispatcher(
+        {ReminderChannel.push: broken},
+        max_attempts=2,
+        redispatch_seconds=60,
+        give_up_attempts=4,
+        clock=lambda: now[0],
+    )
+    tasks = _tasks("ana", 1)
+
+    [reminder] = asyncio.run(dispatcher.dispatch(dispatcher.build(tasks)))
+    assert (reminder.attempts, reminder.error) == (2, "fake sender failure")
+    assert dispatcher.build(tasks) == []
+
+    now[0] += timedelta(seconds=61)
+    [reminder] = asyncio.run(dispatcher.dispatch(dispatcher.build(tasks)))
+    assert reminder.attempts == 4 and dispatcher.exhausted(reminder)
+
+    now[0] += timedelta(days=1)
+    assert dispatcher.build(tasks) == []
+    assert broken.calls == 4
+
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+    sleeps: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+
+    async def take(count: int) -> None:
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(4))
+    assert sleeps == [0.5, 0.5]
+    assert now[0] == 1.0
+
+
+def test_enqueue_reminders_uses_shared_dispatcher():
+    sender = FakeSender()
+    dispatcher, _ = _dispatcher({ReminderChannel.push: sender})
+    reminders.set_reminder_dispatcher(dispatcher)
+    try:
+        ids = asyncio.run(reminders.enqueue_reminders(_tasks("ana", 2)))
+    finally:
+        reminders.set_reminder_dispatcher(None)
+    assert ids == [reminder_id for _, batch in sender.batches for reminder_id in batch]
+    assert len(ids) == 2
+
+
+def test_build_reads_in_bulk_and_records_off_the_event_loop(monkeypatch):
+    sender = FakeSender()
+    dispatcher, _ = _dispatcher(
+        {ReminderChannel.push: sender, ReminderChannel.email: FakeSender()}
+    )
+    tasks = _tasks("ana", 3) + _tasks("ben", 2)
+    calls: list[str] = []
+    writers: list[int] = []
+    monkeypatch.setattr(memory_store, "get_plant", lambda *args: calls.append("get_plant"))
+    monkeypatch.setattr(memory_store, "get_reminder", lambda *args: calls.append("get_reminder"))
+    get_plants, get_reminders = memory_store.get_plants, memory_store.get_reminders
+    put_reminders = memory_store.put_reminders
+    monkeypatch.setattr(
+        memory_store, "get_plants", lambda ids: calls.append("get_plants") or get_plants(ids)
+    )
+    monkeypatch.setattr(
+        memory_store,
+        "get_reminders",
+        lambda ids: calls.append("get_reminders") or get_reminders(ids),
+    )
+    monkeypatch.setattr(
+        memory_store,
+        "put_reminders",
+        lambda batch: writers.append(threading.get_ident()) or put_reminders(batch),
+    )
+
+    async def run() -> int:
+        await dispatcher.dispatch(dispatcher.build(tasks))
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert calls == ["get_plants", "get_reminders"]
+    assert writers and loop_thread not in writers
+    assert len(sender.batches) == 2
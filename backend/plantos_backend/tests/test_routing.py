@@ -0,0 +1,165 @@
+import asyncio
+import time
+
+import pytest
+from fake_models import FakeChatModel
+
+from plantos_backend.ai import providers
+from plantos_backend.ai.routing import CircuitBreaker, ProviderHealth, RoutedChatModel
+from plantos_backend.settings import get_settings
+
+
+class FailingModel(FakeChatModel):
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages[-1].content)
+        raise ConnectionError("provider down")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages[-1].content)
+        raise ConnectionError("provider down")
+
+
+def _model(reply: str, delay: float = 0.0, cls=FakeChatModel) -> FakeChatModel:
+    return cls(responses=[reply], delay=delay, prompts=[])
+
+
+def _ask(model: RoutedChatModel) -> str:
+    return asyncio.run(model.ainvoke("How often should I water?")).content
+
+
+def test_calls_go_to_the_fastest_route():
+    slow, fast = _model("slow", delay=0.05), _model("fast")
+    health = ProviderHealth()
+    routed = RoutedChatModel(routes=[("slow", slow), ("fast", fast)], health=health)
+
+    answers = [_ask(routed) for _ in range(6)]
+
+    # Unmeasured routes are tried first, so each gets a sample before ranking.
+    assert sorted(answers[:2]) == ["fast", "slow"]
+    assert answers[2:] == ["fast"] * 4
+    assert health.metrics()["slow"]["p50"] >= 0.05
+
+
+def test_failed_route_fails_over_and_trips_breaker():
+    down, backup = _model("", cls=FailingModel), _model("backup")
+    # Tolerate any error rate so only the breaker keeps calls away from "down".
+    health = ProviderHealth(failure_threshold=2, cooldown_seconds=60, max_error_rate=1.0)
+    routed = RoutedChatModel(routes=[("down", down), ("backup", backup)], health=health)
+    health.record("backup", 1.0, ok=True)  # make "down" look faster
+
+    assert [_ask(routed) for _ in range(4)] == ["backup"] * 4
+
+    assert len(down.prompts) == 2
+    metrics = health.metrics()["down"]
+    assert (metrics["circuit"], metrics["error_rate"]) == ("open", 1.0)
+
+
+def test_sync_calls_respect_open_breakers():
+    down, backup = _model("", cls=FailingModel), _model("backup")
+    health = ProviderHealth(failure_threshold=2, cooldown_seconds=60, max_error_rate=1.0)
+    routed = RoutedChatModel(routes=[("down", down), ("backup", backup)], health=health)
+    health.record("backup", 1.0, ok=True)
+    # Keep "down" ranked first even once tripped, so only ``allow`` can skip it.
+    health.rank = lambda names: list(names)
+
+    assert [routed.invoke("Water?").content for _ in range(4)] == ["backup"] * 4
+
+    assert len(down.prompts) == 2
+    assert health.metrics()["down"]["circuit"] == "open"
+
+
+def test_routes_with_high_error_rate_are_deprioritised():
+    health = ProviderHealth(max_error_rate=0.2)
+    for ok in (True, False, False):
+        health.record("flaky", 0.01, ok=ok)
+    health.record("steady", 0.5, ok=True)
+
+    assert health.rank(["flaky", "steady"]) == ["steady", "flaky"]
+
+
+def test_all_routes_failing_raises_last_error():
+    routed = RoutedChatModel(
+        routes=[("a", _model("", cls=FailingModel)), ("b", _model("", cls=FailingModel))],
+        health=ProviderHealth(),
+    )
+
+    with pytest.raises(ConnectionError):
+        _ask(routed)
+
+
+def test_breaker_half_opens_for_one_trial_after_cooldown():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10, clock=lambda: now[0])
+
+    breaker.record(ok=False)
+    assert (breaker.state, breaker.allow()) == ("open", None)
+
+    now[0] = 10.0
+    trial = breaker.allow()
+    assert trial.trial is True
+    assert breaker.allow() is None
+    breaker.record(ok=True, permit=trial)
+    assert breaker.state == "closed"
+    assert breaker.allow().trial is False
+
+
+def test_only_the_trial_permit_releases_the_half_open_slot():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10, clock=lambda: now[0])
+    earlier = breaker.allow()
+    breaker.record(ok=False)
+    now[0] = 10.0
+    trial = breaker.allow()
+
+    # A call admitted before the breaker tripped is cancelled mid-trial.
+    breaker.release(earlier)
+    assert breaker.allow() is None
+
+    breaker.release(trial)
+    assert breaker.allow().trial is True
+
+
+def test_slow_calls_are_hedged_to_the_next_route():
+    laggard, runner_up = _model("late", delay=1.0), _model("hedged", delay=0.01)
+    health = ProviderHealth()
+    health.record("runner-up", 0.5, ok=True)
+    routed = RoutedChatModel(
+        routes=[("laggard", laggard), ("runner-up", runner_up)], health=health, hedge_after=0.05
+    )
+
+    started = time.perf_counter()
+    assert _ask(routed) == "hedged"
+    assert time.perf_counter() - started < 0.5
+    assert health.metrics()["laggard"]["hedges"] == 1
+
+
+def test_cancelled_half_open_trial_is_released():
+    now = [0.0]
+    health = ProviderHealth(
+        failure_threshold=1, cooldown_seconds=10, max_error_rate=1.0, clock=lambda: now[0]
+    )
+    health.record("recovering", 0.0, ok=False)
+    health.record("runner-up", 0.5, ok=True)
+    now[0] = 10.0
+    routed = RoutedChatModel(
+        routes=[("recovering", _model("late", delay=1.0)), ("runner-up", _model("hedged"))],
+        health=health,
+        hedge_after=0.05,
+    )
+
+    assert _ask(routed) == "hedged"
+    assert health.metrics()["recovering"]["circuit"] == "half_open"
+    assert health.allow("recovering").trial is True
+
+
+def test_router_provider_uses_configured_providers(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "gemini_api_key", None)
+    asyncio.run(providers.close_clients())
+    try:
+        model = providers.get_provider("router").get_chat_model()
+        assert [name for name, _ in model.routes] == ["openai:gpt-4o"]
+        assert providers.get_provider("router").get_chat_model() is model
+    finally:
+        asyncio.run(providers.close_clients())
@@ -1,5 +1,6 @@
+from datetime import date, datetime, timedelta, timezone
 
-from plantos_backend.models import CareSignal, Plant
+from plantos_backend.models import CareSignal, CareTask, Plant
 from plantos_backend.services import scheduler
 
 
@@ -18,3 +19,117 @@ def test_merge_tasks_groups_by_date():
     key, value = next(iter(grouped.items()))
     assert key == care_task.next_due_at.date().isoformat()
     assert value[0].signal == CareSignal.watering
+
+
+def test_forecast_tasks_includes_repeat_occurrences():
+    plant = Plant(name="Basil", watering_interval_days=2, feeding_interval_days=7)
+    tasks = scheduler.forecast_tasks([plant], horizon_days=7, repeat=True)
+    watering = [task for task in tasks if task.signal == CareSignal.watering]
+    feeding = [task for task in tasks if task.signal == CareSignal.feeding]
+    assert len(watering) == 3
+    assert len(feeding) == 1
+    gaps = {(later.next_due_at - earlier.next_due_at).days
+            for earlier, later in zip(watering, watering[1:], strict=False)}
+    assert gaps == {2}
+    assert len(scheduler.forecast_tasks([plant], horizon_days=7)) == 2
+
+
+def test_forecast_tasks_defaults_to_next_occurrence_including_zero_cadence():
+    plant = Plant(name="Pothos", watering_interval_days=2, feeding_interval_days=0)
+    before = datetime.now(timezone.utc)
+
+    tasks = scheduler.forecast_tasks([plant], horizon_days=7)
+
+    assert [(task.signal, task.cadence_days) for task in tasks] == [
+        (CareSignal.watering, 2),
+        (CareSignal.feeding, 0),
+    ]
+    assert tasks[1].next_due_at >= before
+    # Opting into repetition expands watering but a zero cadence still occurs once.
+    repeated = scheduler.forecast_tasks([plant], horizon_days=7, repeat=True)
+    assert [task.signal for task in repeated].count(CareSignal.watering) == 3
+    assert [task.signal for task in repeated].count(CareSignal.feeding) == 1
+
+
+def test_schedule_table_anchors_on_last_completion():
+    now = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    plant = Plant(name="Cactus", watering_interval_days=10, feeding_interval_days=0)
+    table = scheduler.ScheduleTable.from_plants(
+        [plant],
+        last_completed={(plant.id, CareSignal.watering): now - timedelta(days=12)},
+        now=now,
+    )
+    tasks = table.materialize(table.forecast(now + timedelta(days=10), repeat=True))
+    assert [(task.signal, task.next_due_at) for task in tasks] == [
+        (CareSignal.watering, now - timedelta(days=2)),
+        (CareSignal.watering, now + timedelta(days=8)),
+        (CareSignal.feeding, now),
+    ]
+
+
+def test_schedule_table_forecasts_large_nursery_in_bulk():
+    now = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    plants = [
+        Plant(name=f"Plant {index}", watering_interval_days=index % 14 + 1)
+        for index in range(20_000)
+    ]
+    table = scheduler.ScheduleTable.from_plants(plants, now=now)
+    forecast = table.forecast(now + timedelta(days=1))
+    assert len(forecast) == sum(1 for plant in plants if plant.watering_interval_days == 1)
+    assert (forecast.signal_index == 0).all()
+
+
+def _task(due_day: int, cadence_days: int = 8, minutes: int = 10) -> CareTask:
+    return CareTask(
+        plant_id=f"plant_{due_day}_{cadence_days}",
+        signal=CareSignal.watering,
+        cadence_days=cadence_days,
+        next_due_at=datetime(2024, 5, due_day, 9, tzinfo=timezone.utc),
+        duration_minutes=minutes,
+    )
+
+
+def test_optimize_tasks_groups_within_tolerance():
+    # Cadence 8 allows a 2-day shift, so all three meet on their median due date.
+    tasks = [_task(1), _task(2), _task(3)]
+    plan = scheduler.optimize_tasks(tasks, capacity_minutes=60, today=date(2024, 5, 1))
+    assert list(plan.days) == ["2024-05-02"]
+    assert plan.moved == 2
+    assert {task.next_due_at for task in plan.days["2024-05-02"]} == {
+        datetime(2024, 5, 2, 9, tzinfo=timezone.utc)
+    }
+
+
+def test_optimize_tasks_respects_capacity_and_pinned_tasks():
+    tasks = [_task(3, minutes=30) for _ in range(3)] + [_task(2, cadence_days=1)]
+    plan = scheduler.optimize_tasks(tasks, capacity_minutes=60, today=date(2024, 5, 1))
+    assert all(plan.load(day) <= 60 for day in plan.days)
+    assert plan.overloaded == 0
+    assert [task.cadence_days for task in plan.days["2024-05-02"]].count(1) == 1
+
+    crowded = [_task(3, cadence_days=1, minutes=40) for _ in range(2)]
+    plan = scheduler.optimize_tasks(crowded, capacity_minutes=60, today=date(2024, 5, 1))
+    assert plan.overloaded == 1
+    assert list(plan.days) == ["2024-05-03"]
+
+
+def test_optimize_tasks_does_not_pull_work_into_the_past():
+    tasks = [_task(1), _task(5)]
+    plan = scheduler.optimize_tasks(tasks, capacity_minutes=60, today=date(2024, 5, 4))
+    assert list(plan.days) == ["2024-05-01", "2024-05-05"]
+    assert plan.moved == 0
+
+
+def test_optimize_tasks_only_moves_what_capacity_forces_when_every_day_is_busy():
+    # Daily tasks pin every day open, so nothing can be consolidated away.
+    pinned = [_task(day, cadence_days=1, minutes=20) for day in (1, 2, 3)]
+    flexible = [_task(day) for day in (1, 3, 3, 3)]
+    plan = scheduler.optimize_tasks(pinned + flexible, capacity_minutes=80, today=date(2024, 5, 1))
+    assert list(plan.days) == ["2024-05-01", "2024-05-02", "2024-05-03"]
+    assert plan.moved == 0
+    assert max(plan.load(day) for day in plan.days) == 50
+
+    plan = scheduler.optimize_tasks(pinned + flexible, capacity_minutes=40, today=date(2024, 5, 1))
+    assert plan.moved == 1
+    assert plan.overloaded == 0
+    assert [plan.load(day) for day in plan.days] == [30, 30, 40]
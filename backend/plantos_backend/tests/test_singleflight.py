@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from plantos_backend.ai.singleflight import SingleFlight
+from plantos_backend.services import ai
+
+DIAGNOSIS = '{"diagnosis": "Thrips", "severity": "medium", "recommendations": ["Isolate"]}'
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", slow) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert flight.metrics() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.do("key", boom) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+        asyncio.run(flight.do("key", boom))
+    assert flight.executions == 2
+
+
+def test_identical_health_checks_coalesce(fake_llm):
+    model = fake_llm([DIAGNOSIS], delay=0.05)
+    before = ai.metrics()["single_flight"]["coalesced"]
+
+    async def run():
+        return await asyncio.gather(*(ai.run_health_check("silver streaks") for _ in range(10)))
+
+    results = asyncio.run(run())
+
+    assert len(model.prompts) == 1
+    assert all(result["diagnosis"] == "Thrips" for result in results)
+    assert results[0] is not results[1]
+    assert ai.metrics()["single_flight"]["coalesced"] - before == 9
@@ -0,0 +1,38 @@
+import asyncio
+
+from plantos_backend.ai.species import SpeciesProfileStore, canonical_species
+from plantos_backend.services import ai
+
+PROFILE = '{"light": "bright indirect", "watering_days": 7, "feeding_days": 30}'
+
+
+def test_canonical_species_variants():
+    expected = "monstera deliciosa"
+    assert canonical_species("Monstera deliciosa 'Thai Constellation'") == expected
+    assert canonical_species("  MONSTERA   Deliciosa. ") == expected
+    assert canonical_species("Monstera deliciosa var. borsigiana") == expected
+    assert canonical_species("Swiss cheese plant") == expected
+    assert canonical_species("Sansevieria trifasciata (Prain)") == "dracaena trifasciata"
+    assert canonical_species("Devil's Ivy") == "epipremnum aureum"
+
+
+def test_profiles_persist_to_sqlite(tmp_path):
+    path = str(tmp_path / "species.db")
+    SpeciesProfileStore(path).put("Ficus lyrata", {"light": "bright", "species": "Ficus lyrata"})
+
+    reopened = SpeciesProfileStore(path)
+    assert reopened.get("fiddle leaf fig") == {"light": "bright"}
+    assert reopened.metrics()["hits"] == 1
+
+
+def test_onboarding_skips_profile_call_for_known_species(fake_llm):
+    model = fake_llm(["Monstera deliciosa", PROFILE, "Monstera Deliciosa 'Albo'"])
+
+    first = asyncio.run(ai.run_onboarding(None, "split leaves"))
+    second = asyncio.run(ai.run_onboarding(None, "variegated split leaves"))
+
+    assert len(model.prompts) == 3
+    assert first["care_profile"]["watering_days"] == 7
+    albo = "Monstera Deliciosa 'Albo'"
+    assert second["care_profile"] == {**first["care_profile"], "species": albo}
+    assert ai.metrics()["species_profiles"]["hits"] == 1
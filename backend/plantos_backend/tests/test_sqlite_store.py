@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from plantos_backend.app import app
+from plantos_backend.models import (
+    CareSignal,
+    CareTask,
+    Listing,
+    ListingStatus,
+    Plant,
+    PropagationBatch,
+    Reminder,
+    TimelineEvent,
+)
+from plantos_backend.storage import set_store
+from plantos_backend.storage.sqlite import SqliteStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteStore(tmp_path / "plantos.db")
+    yield store
+    store.close()
+
+
+def test_uses_wal_and_survives_reopen(store, tmp_path):
+    mode = store._connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+    plant = store.put_plant(Plant(name="Fern"))
+    store.put_tasks(CareTask.from_plant(plant, signal) for signal in CareSignal)
+
+    reopened = SqliteStore(tmp_path / "plantos.db")
+    assert reopened.get_plant(plant.id) == plant
+    assert len(reopened.tasks_for_plant(plant.id)) == len(CareSignal)
+    reopened.close()
+
+
+def test_keyset_reads_and_filters(store):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for hours in (3, 1, 2):
+        store.put_task(
+            CareTask(
+                plant_id="plant_1",
+                signal=CareSignal.watering,
+                cadence_days=1,
+                next_due_at=start + timedelta(hours=hours),
+            )
+        )
+    first = store.tasks_due(until=start + timedelta(hours=2), limit=1)
+    assert [task.next_due_at.hour for task in first] == [1]
+    rest = store.tasks_due(after=(first[0].next_due_at, first[0].id))
+    assert [task.next_due_at.hour for task in rest] == [2, 3]
+
+    batch = store.put_batch(PropagationBatch(mother_plant_id="plant_1", clone_count=4))
+    assert store.list_batches("plant_1") == [batch]
+    assert store.list_batches("plant_2") == []
+
+    listing = store.put_listing(
+        Listing(batch_id=batch.id, title="Cutting", price=4, description="Rooted")
+    )
+    store.put_listing(listing.model_copy(update={"status": ListingStatus.published}))
+    assert store.list_listings(ListingStatus.draft) == []
+    assert [item.id for item in store.list_listings(ListingStatus.published)] == [listing.id]
+
+
+def test_get_plants_reads_many_ids(store, monkeypatch):
+    plants = [store.put_plant(Plant(name=f"Plant {index}")) for index in range(5)]
+    monkeypatch.setattr("plantos_backend.storage.sqlite.MAX_IN_PARAMS", 2)
+
+    found = store.get_plants([plant.id for plant in plants] + ["plant_missing", plants[0].id])
+
+    assert sorted(plant.id for plant in found) == sorted(plant.id for plant in plants)
+
+
+def test_remove_plant_cascades(store):
+    plant = store.put_plant(Plant(name="Monstera"))
+    store.put_tasks(CareTask.from_plant(plant, signal) for signal in CareSignal)
+    store.add_event(TimelineEvent(plant_id=plant.id, event_type="note", note="hello"))
+    task = store.tasks_for_plant(plant.id)[0]
+    store.put_reminders([Reminder(task_id=task.id, send_at=task.next_due_at)])
+
+    assert store.remove_plant(plant.id) == plant
+    assert store.tasks_for_plant(plant.id) == []
+    assert store.reminders_for_task(task.id) == []
+    assert store.list_events(plant.id) == []
+
+
+def test_api_runs_against_sqlite_store(store):
+    set_store(store)
+    try:
+        client = TestClient(app)
+        plant_id = client.post("/plants", json={"name": "Pilea"}).json()["id"]
+        client.post(f"/plants/{plant_id}/timeline", json={"event_type": "note", "note": "hi"})
+        assert [item["id"] for item in client.get("/plants").json()] == [plant_id]
+        assert len(client.get(f"/plants/{plant_id}/tasks").json()) == 2
+        assert client.get(f"/plants/{plant_id}/timeline").json()[0]["note"] == "hi"
+    finally:
+        set_store(None)
+
+
+def test_reminders_round_trip(store):
+    from plantos_backend.models import Reminder, ReminderChannel
+
+    due = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    later = Reminder(task_id="task_1", send_at=due + timedelta(hours=1))
+    sooner = Reminder(task_id="task_1", send_at=due, channel=ReminderChannel.email)
+    store.put_reminders([later, sooner, Reminder(task_id="task_2", send_at=due)])
+
+    assert store.reminders_for_task("task_1") == [sooner, later]
+    later.delivered_at = due
+    store.put_reminders([later])
+    assert store.get_reminder(later.id).delivered_at == due
@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+
+from plantos_backend.app import app
+from plantos_backend.services import storage
+from plantos_backend.services.storage import (
+    LocalStorageService,
+    UploadTooLargeError,
+    spool_upload,
+)
+from plantos_backend.settings import get_settings
+
+client = TestClient(app)
+
+PHOTO = bytes(range(256)) * 4096  # 1 MiB
+
+
+class RecordingFile(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads: list[int] = []
+
+    def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        return super().read(size)
+
+
+def test_spool_upload_streams_in_chunks(tmp_path):
+    source = RecordingFile(PHOTO)
+
+    path, sha256 = asyncio.run(
+        spool_upload(UploadFile(source, filename="leaf.png"), 64 * 1024, len(PHOTO), str(tmp_path))
+    )
+
+    assert sha256 == hashlib.sha256(PHOTO).hexdigest()
+    assert path.parent == tmp_path
+    assert path.read_bytes() == PHOTO
+    assert max(source.reads) == 64 * 1024
+
+
+def test_spool_upload_rejects_oversized_files_without_leftovers(tmp_path):
+    upload = UploadFile(io.BytesIO(PHOTO), filename="leaf.jpg")
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool_upload(upload, 64 * 1024, 100_000, str(tmp_path)))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_local_save_keeps_existing_objects(tmp_path):
+    service = LocalStorageService(str(tmp_path))
+
+    first = asyncio.run(service.save("photo.webp", b"first", "image/webp"))
+    second = asyncio.run(service.save("photo.webp", b"second", "image/webp"))
+
+    assert first == second
+    assert open(first, "rb").read() == b"first"
+    assert asyncio.run(service.find("photo.webp")) == first
+    assert asyncio.run(service.find("missing.webp")) is None
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_diagnose_rejects_oversized_photo(tmp_path, monkeypatch):
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setattr(get_settings(), "upload_max_bytes", 1024)
+    monkeypatch.setattr(get_settings(), "upload_spool_dir", str(spool_dir))
+    service = LocalStorageService(str(tmp_path / "uploads"))
+    app.dependency_overrides[storage.get_storage_service] = lambda: service
+    plant = client.post("/plants", json={"name": "Fern", "species": "Nephrolepis"}).json()
+
+    try:
+        resp = client.post(
+            f"/plants/{plant['id']}/diagnose", files={"file": ("leaf.jpg", PHOTO, "image/jpeg")}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 413
+    assert list(spool_dir.iterdir()) == []
+    assert list((tmp_path / "uploads").iterdir()) == []
+
+
+def test_storage_service_is_created_once_per_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "upload_dir", str(tmp_path))
+    created = []
+    original = storage.create_storage_service
+
+    def tracking_create(settings):
+        created.append(original(settings))
+        return created[-1]
+
+    monkeypatch.setattr(storage, "create_storage_service", tracking_create)
+
+    with TestClient(app):
+        assert storage.get_storage_service() is storage.get_storage_service()
+        assert storage.get_storage_service() is created[0]
+
+    assert len(created) == 1
@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from plantos_backend.ai.structured import (
+    CareProfile,
+    Diagnosis,
+    StructuredOutputError,
+    ainvoke_structured,
+    metrics,
+)
+from plantos_backend.services import ai
+from plantos_backend.settings import get_settings
+
+ASK = [HumanMessage(content="Diagnose")]
+DIAGNOSIS = '{"diagnosis": "Thrips", "severity": "Medium", "recommendations": ["Isolate"]}'
+
+
+def test_fenced_json_with_prose_is_parsed(fake_llm):
+    model = fake_llm([f"Sure! Here you go:\n```json\n{DIAGNOSIS}\n```"])
+
+    result = asyncio.run(ainvoke_structured(model, ASK, Diagnosis))
+
+    assert result == Diagnosis(diagnosis="Thrips", severity="medium", recommendations=["Isolate"])
+    assert metrics()["Diagnosis"]["parse_failures"] == 0
+
+
+def test_invalid_reply_is_repaired_once(fake_llm):
+    model = fake_llm(['{"light": "low"}', '{"light": "low", "watering_days": 10}'])
+
+    profile = asyncio.run(ainvoke_structured(model, ASK, CareProfile))
+
+    assert profile.watering_days == 10
+    assert "watering_days" in model.prompts[1]
+    stats = metrics()["CareProfile"]
+    assert (stats["calls"], stats["parse_failures"], stats["repairs"], stats["repaired"]) == (
+        1,
+        1,
+        1,
+        1,
+    )
+    assert stats["parse_failure_rate"] == 1.0
+
+
+def test_repairs_are_bounded(fake_llm, monkeypatch):
+    monkeypatch.setattr(get_settings(), "ai_structured_max_repairs", 2)
+    model = fake_llm(["not json"])
+
+    with pytest.raises(StructuredOutputError):
+        asyncio.run(ainvoke_structured(model, ASK, Diagnosis))
+
+    assert len(model.prompts) == 3
+    assert metrics()["Diagnosis"]["exhausted"] == 1
+
+
+def test_native_structured_output_is_preferred():
+    class NativeModel:
+        def with_structured_output(self, schema, include_raw=False):
+            parsed = schema(diagnosis="Scale", severity="low")
+            return RunnableLambda(lambda messages: {"raw": AIMessage(content=""), "parsed": parsed})
+
+        async def ainvoke(self, messages):
+            raise AssertionError("free-text path should not be used")
+
+    result = asyncio.run(ainvoke_structured(NativeModel(), ASK, Diagnosis))
+
+    assert result.diagnosis == "Scale"
+
+
+def test_repair_turn_shows_the_failed_tool_call():
+    from fake_models import ToolCallingChatModel
+
+    model = ToolCallingChatModel(
+        responses=[],
+        tool_args=[
+            {"diagnosis": "Scale", "severity": "dire"},
+            {"diagnosis": "Scale", "severity": "low"},
+        ],
+        structured_calls=[],
+    )
+
+    result = asyncio.run(ainvoke_structured(model, ASK, Diagnosis))
+
+    assert result.severity == "low"
+    repair = model.structured_calls[1]
+    assert isinstance(repair[1], AIMessage)
+    assert json.loads(repair[1].content) == {"diagnosis": "Scale", "severity": "dire"}
+    assert "severity" in repair[2].content
+
+
+def test_health_check_falls_back_after_failed_repair(fake_llm):
+    fake_llm(["I think it is overwatered."])
+
+    result = asyncio.run(ai.run_health_check("yellow leaves"))
+
+    assert result["diagnosis"] == "Error parsing diagnosis"
+    assert ai.metrics()["structured_output"]["Diagnosis"]["exhausted"] == 1